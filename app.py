@@ -14,11 +14,46 @@ import re
 from urllib.parse import urljoin, parse_qs, urlparse
 import urllib3
 from enhanced_suppliers_scraper import EnhancedSuppliersScraper
+from nrlm_client import NRLMClientPool
+from search_index import SearchIndex
+from search_store import SearchStore, file_signature, table_signature
+from dataset_cache import DatasetCache
+from job_queue import JobQueue
+from change_tracker import ChangeTracker, summarize
+from warehouse import Warehouse
+from exports import ExportCache, csv_response, query_rows
+from listing_pager import ListingPager
+from db_connections import ConnectionManager
+import http_fetch
+from pincode_data import PINCODES_CSV, PINCODES_SNAPSHOT, PincodeHierarchy, PincodePager, read_pincodes, snapshot_is_fresh, ensure_snapshot
 import pandas as _pd
 import os as _os
 
-# Cache for pandas dataframes
-_PIN_DF_CACHE = {"df": None, "path": None, "mtime": None}
+# Per-thread users.db connections (WAL, tuned pragmas), shared by every helper and route
+USERS_DB = ConnectionManager('users.db')
+
+# Shared cache for every JSON/CSV dataset, invalidated on file mtime
+DATASETS = DatasetCache(max_bytes=256 * 1024 * 1024)
+
+# Page/record hashes of the directory imports, so re-imports only apply changes
+CHANGES = ChangeTracker('users.db')
+
+# Typed, indexed copies of the JSON/CSV directories (reloaded when a file changes)
+WAREHOUSE = Warehouse(os.environ.get('WAREHOUSE_DB', 'warehouse.db'))
+
+# Built CSV/XLSX downloads, reused until their source data changes
+EXPORTS = ExportCache(
+    os.environ.get('EXPORT_CACHE_DIR', 'export_cache'),
+    max_bytes=int(os.environ.get('EXPORT_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+)
+
+# Seek pagination, counts and dropdown values of the SQLite-backed listings
+BAI_PAGER = ListingPager('bai_members', order_by=('company_name',))
+DCE_PAGER = ListingPager('dce_colleges', order_by=('district', 'name'), facets=('district', 'region', 'college_type'))
+
+def users_table_version(table):
+    """Export cache version of a users.db table"""
+    return table_signature('users.db', table)()
 
 # Disable SSL warnings
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
@@ -35,96 +70,33 @@ def global_search():
         if not query:
             return jsonify({'results': [], 'total': 0})
         
+        limit = 50
         results = []
-        query_lower = query.lower()
-        
-        # Search RERA Agents
-        try:
-            rera_data = load_rera_data()
-            for agent in rera_data:
-                if (query_lower in agent.get('name', '').lower() or 
-                    query_lower in agent.get('address', '').lower() or 
-                    query_lower in agent.get('registration_number', '').lower()):
-                    results.append({
-                        'module': 'RERA Agents',
-                        'title': agent.get('name', 'N/A'),
-                        'subtitle': agent.get('address', 'N/A'),
-                        'url': url_for('rera_agents'),
-                        'icon': 'fas fa-gavel',
-                        'type': 'Agent'
-                    })
-        except Exception as e:
-            print(f"Error searching RERA: {str(e)}")
-        
-        # Search BAI Members
-        try:
-            bai_data = load_bai_data()
-            for member in bai_data:
-                if query_lower in member.get('company_name', '').lower():
-                    results.append({
-                        'module': 'BAI Members',
-                        'title': member.get('company_name', 'N/A'),
-                        'subtitle': member.get('contact_person', 'N/A'),
-                        'url': url_for('bai_members'),
-                        'icon': 'fas fa-building',
-                        'type': 'Company'
-                    })
-        except Exception as e:
-            print(f"Error searching BAI: {str(e)}")
-        
-        # Search Suppliers
-        try:
-            suppliers_data = load_suppliers_data()
-            for supplier in suppliers_data:
-                if (query_lower in supplier.get('name', '').lower() or 
-                    query_lower in supplier.get('category', '').lower()):
-                    results.append({
-                        'module': 'Suppliers',
-                        'title': supplier.get('name', 'N/A'),
-                        'subtitle': supplier.get('category', 'N/A'),
-                        'url': url_for('suppliers'),
-                        'icon': 'fas fa-truck',
-                        'type': 'Supplier'
-                    })
-        except Exception as e:
-            print(f"Error searching Suppliers: {str(e)}")
-        
-        # Search CCMC Contractors
-        try:
-            ccmc_data = load_ccmc_data()
-            for contractor in ccmc_data:
-                if query_lower in contractor.get('contractor_name', '').lower():
-                    results.append({
-                        'module': 'CCMC Contractors',
-                        'title': contractor.get('contractor_name', 'N/A'),
-                        'subtitle': contractor.get('work_type', 'N/A'),
-                        'url': url_for('ccmc_contractors'),
-                        'icon': 'fas fa-hard-hat',
-                        'type': 'Contractor'
-                    })
-        except Exception as e:
-            print(f"Error searching CCMC: {str(e)}")
-        
-        # Search Pincodes
-        try:
-            pincodes_data = load_pincodes_data()
-            for pincode in pincodes_data:
-                if (query_lower in str(pincode.get('pincode', '')).lower() or 
-                    query_lower in pincode.get('area', '').lower() or 
-                    query_lower in pincode.get('city', '').lower()):
-                    results.append({
-                        'module': 'Pincodes',
-                        'title': f"{pincode.get('area', 'N/A')} - {pincode.get('pincode', 'N/A')}",
-                        'subtitle': f"{pincode.get('city', 'N/A')}, {pincode.get('state', 'N/A')}",
-                        'url': url_for('pincodes'),
-                        'icon': 'fas fa-map-marker-alt',
-                        'type': 'Location'
-                    })
-        except Exception as e:
-            print(f"Error searching Pincodes: {str(e)}")
-        
-        # Limit results to prevent overwhelming response
-        results = results[:50]
+        seen = set()
+        
+        # Ranked token/prefix matches from the FTS5 store
+        for module, ref, title, subtitle in SEARCH_STORE.search(query, modules=list(GLOBAL_SEARCH_MODULES), limit=limit):
+            name, endpoint, icon, result_type = GLOBAL_SEARCH_MODULES[module]
+            results.append({
+                'module': name,
+                'title': _display(title),
+                'subtitle': _display(subtitle),
+                'url': url_for(endpoint),
+                'icon': icon,
+                'type': result_type
+            })
+            seen.add((name, _display(title)))
+        
+        # Fill up with substring matches (mid-word hits, pincodes) from the in-memory index
+        if len(results) < limit:
+            for result in SEARCH_INDEX.search(query, limit=limit):
+                if (result['module'], result['title']) in seen:
+                    continue
+                result = dict(result)
+                result['url'] = url_for(result.pop('endpoint'))
+                results.append(result)
+                if len(results) >= limit:
+                    break
         
         return jsonify({
             'results': results,
@@ -145,47 +117,156 @@ def search_page():
 def load_bai_data():
     """Load BAI members data"""
     try:
-        if os.path.exists('bai_coimbatore_refined.csv'):
-            df = _pd.read_csv('bai_coimbatore_refined.csv')
-            return df.to_dict('records')
-        return []
+        return WAREHOUSE.rows('bai_directory')
     except Exception as e:
         print(f"Error loading BAI data: {str(e)}")
         return []
 
-def load_suppliers_data():
-    """Load suppliers data"""
+def load_pincodes_data():
+    """Load pincodes data"""
     try:
-        # This would need to be implemented based on your suppliers data structure
+        if os.path.exists(PINCODES_CSV) or os.path.exists(PINCODES_SNAPSHOT):
+            return load_pincode_frame(['officename', 'pincode', 'district', 'statename']).to_dict('records')
         return []
     except Exception as e:
-        print(f"Error loading suppliers data: {str(e)}")
+        print(f"Error loading pincodes data: {str(e)}")
         return []
 
-def load_ccmc_data():
-    """Load CCMC contractors data"""
+def _display(value, default='N/A'):
+    """Return a display string for a record field, N/A when missing"""
+    if value is None or (isinstance(value, float) and value != value) or str(value).strip() == '':
+        return default
+    return str(value)
+
+# Search index behind /api/global-search, rebuilt per module when its file changes
+SEARCH_INDEX = SearchIndex()
+SEARCH_INDEX.register(
+    'RERA Agents', ['rera_agents_improved.json', 'rera_agents.json'],
+    lambda: load_rera_data(),
+    lambda agent: (agent.get('name'), agent.get('address'), agent.get('registration_number')),
+    lambda agent: {
+        'module': 'RERA Agents',
+        'title': _display(agent.get('name')),
+        'subtitle': _display(agent.get('address')),
+        'endpoint': 'rera_agents',
+        'icon': 'fas fa-gavel',
+        'type': 'Agent'
+    })
+SEARCH_INDEX.register(
+    'BAI Members', ['bai_coimbatore_refined.csv'],
+    lambda: load_bai_data(),
+    lambda member: (member.get('company_name'),),
+    lambda member: {
+        'module': 'BAI Members',
+        'title': _display(member.get('company_name')),
+        'subtitle': _display(member.get('contact_person')),
+        'endpoint': 'bai_members',
+        'icon': 'fas fa-building',
+        'type': 'Company'
+    })
+SEARCH_INDEX.register(
+    'CCMC Contractors', ['ccmc_contractors.json'],
+    lambda: load_ccmc_data(),
+    lambda contractor: (contractor.get('Name'),),
+    lambda contractor: {
+        'module': 'CCMC Contractors',
+        'title': _display(contractor.get('Name')),
+        'subtitle': _display(contractor.get('Class')),
+        'endpoint': 'ccmc_contractors',
+        'icon': 'fas fa-hard-hat',
+        'type': 'Contractor'
+    })
+SEARCH_INDEX.register(
+    'Pincodes', [PINCODES_CSV, PINCODES_SNAPSHOT],
+    lambda: load_pincodes_data(),
+    lambda office: (office.get('pincode'), office.get('officename'), office.get('district')),
+    lambda office: {
+        'module': 'Pincodes',
+        'title': f"{_display(office.get('officename'))} - {_display(office.get('pincode'))}",
+        'subtitle': f"{_display(office.get('district'))}, {_display(office.get('statename'))}",
+        'endpoint': 'pincodes',
+        'icon': 'fas fa-map-marker-alt',
+        'type': 'Location'
+    })
+
+# FTS5 store (search.db) with per-module column weights: title, subtitle, body
+SEARCH_STORE = SearchStore('search.db')
+SEARCH_STORE.register(
+    'rera', lambda: load_rera_data(),
+    lambda agent: (None, agent.get('name'), agent.get('address'),
+                   f"{agent.get('registration_number', '')} {agent.get('type', '')}"),
+    file_signature('rera_agents_improved.json', 'rera_agents.json'),
+    weights=(10, 3, 5))
+SEARCH_STORE.register(
+    'bai', lambda: load_bai_data(),
+    lambda member: (None, member.get('company_name'), member.get('contact_person'), member.get('address')),
+    file_signature('bai_coimbatore_refined.csv'),
+    weights=(10, 5, 1))
+SEARCH_STORE.register(
+    'ccmc', lambda: load_ccmc_data(),
+    lambda contractor: (None, contractor.get('Name'), contractor.get('Class'), contractor.get('Address')),
+    file_signature('ccmc_contractors.json'),
+    weights=(10, 2, 2))
+SEARCH_STORE.register(
+    'credai', lambda: load_credai_data(),
+    lambda member: (None, member.get('name'), member.get('type'), ''),
+    file_signature('credai_members.json'),
+    weights=(10, 1, 1))
+SEARCH_STORE.register(
+    'sub_reg', lambda: load_sub_reg_data(),
+    lambda office: (None, office.get('office_name'), office.get('designation'),
+                    f"{office.get('zone', '')} {office.get('address', '')}"),
+    file_signature('sub_reg_offices.json'),
+    weights=(10, 4, 2))
+SEARCH_STORE.register(
+    'cbe_wards', lambda: load_cbe_ward_data(),
+    lambda ward: (None, ward.get('ward_name'), f"Ward {ward.get('ward_number', '')}",
+                  ' '.join(' '.join(d) for d in ward.get('directions', {}).values())),
+    file_signature('coimbatore_wards.json'),
+    weights=(10, 10, 1))
+SEARCH_STORE.register(
+    'bai_members', lambda: load_bai_member_rows(),
+    lambda member: (member['id'], member['company_name'], member['contact_person'], member['address']),
+    table_signature('users.db', 'bai_members'),
+    weights=(10, 5, 1))
+SEARCH_STORE.register(
+    'dce_colleges', lambda: load_dce_college_rows(),
+    lambda college: (college['id'], college['name'], college['district'],
+                     ' '.join(str(college[k] or '') for k in ('region', 'college_type', 'category'))),
+    table_signature('users.db', 'dce_colleges'),
+    weights=(10, 4, 2))
+
+# Modules shown in global search: (module name, endpoint, icon, type)
+GLOBAL_SEARCH_MODULES = {
+    'rera': ('RERA Agents', 'rera_agents', 'fas fa-gavel', 'Agent'),
+    'bai': ('BAI Members', 'bai_members', 'fas fa-building', 'Company'),
+    'ccmc': ('CCMC Contractors', 'ccmc_contractors', 'fas fa-hard-hat', 'Contractor'),
+    'credai': ('CREDAI Members', 'credai_members', 'fas fa-city', 'Member'),
+    'sub_reg': ('Sub Registrar Offices', 'sr_office', 'fas fa-landmark', 'Office'),
+    'cbe_wards': ('CBE Wards', 'cbe_wards', 'fas fa-map', 'Ward')
+}
+
+def _fetch_table_rows(query):
+    conn = USERS_DB.connect()
+    conn.row_factory = sqlite3.Row
     try:
-        if os.path.exists('ccmc_contractors.csv'):
-            df = _pd.read_csv('ccmc_contractors.csv')
-            return df.to_dict('records')
-        return []
-    except Exception as e:
-        print(f"Error loading CCMC data: {str(e)}")
+        return [dict(row) for row in conn.execute(query).fetchall()]
+    except sqlite3.Error as e:
+        print(f"Error loading rows for search: {str(e)}")
         return []
+    finally:
+        conn.close()
 
-def load_pincodes_data():
-    """Load pincodes data"""
-    try:
-        if os.path.exists('pincodes.csv'):
-            df = _pd.read_csv('pincodes.csv')
-            return df.to_dict('records')
-        return []
-    except Exception as e:
-        print(f"Error loading pincodes data: {str(e)}")
-        return []
+def load_bai_member_rows():
+    """Load BAI member rows from the database for the search store"""
+    return _fetch_table_rows('SELECT id, company_name, contact_person, address FROM bai_members')
+
+def load_dce_college_rows():
+    """Load DCE college rows from the database for the search store"""
+    return _fetch_table_rows('SELECT id, name, district, region, college_type, category FROM dce_colleges')
 
 def init_db():
-    conn = sqlite3.connect('users.db')
+    conn = USERS_DB.connect()
     cursor = conn.cursor()
     
     # Users table
@@ -233,6 +314,7 @@ def init_db():
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
+    ensure_nrlm_natural_key(cursor)
     
     conn.commit()
     conn.close()
@@ -442,33 +524,44 @@ class NRLMScraper:
             print(f"Error getting SHG members: {e}")
             return {}
 
-def scrape_colleges_data():
-    """Scrape colleges data from the website"""
+# Up to 4 college pages in flight, 5 requests/second
+http_fetch.FETCHER.set_host_limits('www.coimbatoreassociation.com', rate=5, concurrency=4)
+
+def scrape_colleges_page(page, changes=None):
+    """Scrape one page of the colleges list (skipping the parse if ``changes`` has it unchanged)"""
     base_url = "https://www.coimbatoreassociation.com/ajax_listcolleges.php?page="
+    response = http_fetch.get(base_url + str(page), timeout=10)
+    if changes is not None:
+        cached = changes.cached_page(page, response.content)
+        if cached is not None:
+            return cached
+    soup = BeautifulSoup(response.text, http_fetch.HTML_PARSER)
+    
+    # Find table rows (skip header row)
+    colleges = []
+    for row in soup.find_all("tr")[1:]:
+        cols = [col.get_text(strip=True) for col in row.find_all("td")]
+        if cols and len(cols) >= 5:
+            colleges.append({
+                's_no': cols[0],
+                'member_code': cols[1],
+                'institution_name': cols[2],
+                'year_established': cols[3],
+                'contact_no': cols[4]
+            })
+    if changes is not None:
+        changes.store_page(page, response.content, colleges)
+    return colleges
+
+def scrape_colleges_data(changes=None):
+    """Scrape colleges data from the website"""
     data = []
     
     try:
-        for page in range(1, 23):
-            url = base_url + str(page)
-            response = requests.get(url, timeout=10)
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # Find table rows (skip header row)
-            rows = soup.find_all("tr")[1:]
-            
-            for row in rows:
-                cols = [col.get_text(strip=True) for col in row.find_all("td")]
-                if cols and len(cols) >= 5:
-                    data.append({
-                        's_no': cols[0],
-                        'member_code': cols[1],
-                        'institution_name': cols[2],
-                        'year_established': cols[3],
-                        'contact_no': cols[4]
-                    })
-            
-            # Small delay to be respectful to the server
-            time.sleep(0.5)
+        # Pages are fetched concurrently; the first empty page ends the list
+        load_page = lambda page: scrape_colleges_page(page, changes)
+        for page, colleges in http_fetch.paginate(load_page, first=1, last=60, workers=4):
+            data.extend(colleges)
             
     except Exception as e:
         print(f"Error scraping data: {e}")
@@ -476,38 +569,48 @@ def scrape_colleges_data():
     
     return data
 
+NRLM_NATURAL_KEY = ('state_code', 'district_code', 'block_code', 'grampanchayat_code', 'village_code', 'member_code')
+
+def ensure_nrlm_natural_key(cursor):
+    """Drop duplicate NRLM members and add the unique index on the natural key (once)"""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_nrlm_natural_key'")
+    if cursor.fetchone():
+        return
+    key = ', '.join(NRLM_NATURAL_KEY)
+    # Keep the first copy of each member, as the old SELECT-then-INSERT path did
+    cursor.execute(f'''
+        DELETE FROM nrlm_data
+        WHERE id NOT IN (SELECT MIN(id) FROM nrlm_data GROUP BY {key})
+    ''')
+    cursor.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS idx_nrlm_natural_key ON nrlm_data ({key})')
+
+def _table_count(cursor, table):
+    cursor.execute(f'SELECT COUNT(*) FROM {table}')
+    return cursor.fetchone()[0]
+
 def save_colleges_to_db(colleges_data):
     """Save colleges data to database, avoiding duplicates"""
-    conn = sqlite3.connect('users.db')
+    conn = USERS_DB.connect()
     cursor = conn.cursor()
     
-    new_count = 0
-    updated_count = 0
-    
-    for college in colleges_data:
-        # Check if member_code already exists
-        cursor.execute('SELECT id FROM colleges WHERE member_code = ?', (college['member_code'],))
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Update existing record
-            cursor.execute('''
-                UPDATE colleges 
-                SET s_no = ?, institution_name = ?, year_established = ?, 
-                    contact_no = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE member_code = ?
-            ''', (college['s_no'], college['institution_name'], 
-                  college['year_established'], college['contact_no'], 
-                  college['member_code']))
-            updated_count += 1
-        else:
-            # Insert new record
-            cursor.execute('''
-                INSERT INTO colleges (s_no, member_code, institution_name, year_established, contact_no)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (college['s_no'], college['member_code'], college['institution_name'],
-                  college['year_established'], college['contact_no']))
-            new_count += 1
+    rows = [(college['s_no'], college['member_code'], college['institution_name'],
+             college['year_established'], college['contact_no']) for college in colleges_data]
+    
+    # One transaction; counts come from the row delta and changes()
+    before_count = _table_count(cursor, 'colleges')
+    before_changes = conn.total_changes
+    cursor.executemany('''
+        INSERT INTO colleges (s_no, member_code, institution_name, year_established, contact_no)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(member_code) DO UPDATE SET
+            s_no = excluded.s_no,
+            institution_name = excluded.institution_name,
+            year_established = excluded.year_established,
+            contact_no = excluded.contact_no,
+            updated_at = CURRENT_TIMESTAMP
+    ''', rows)
+    new_count = _table_count(cursor, 'colleges') - before_count
+    updated_count = conn.total_changes - before_changes - new_count
     
     conn.commit()
     conn.close()
@@ -516,33 +619,29 @@ def save_colleges_to_db(colleges_data):
 
 def save_nrlm_data_to_db(nrlm_data):
     """Save NRLM data to database"""
-    conn = sqlite3.connect('users.db')
+    conn = USERS_DB.connect()
     cursor = conn.cursor()
-    
-    new_count = 0
-    
-    for data in nrlm_data:
-        # Check if record already exists
-        cursor.execute('''
-            SELECT id FROM nrlm_data 
-            WHERE state_code = ? AND district_code = ? AND block_code = ? 
-            AND grampanchayat_code = ? AND village_code = ? AND member_code = ?
-        ''', (data['state_code'], data['district_code'], data['block_code'],
-              data['grampanchayat_code'], data['village_code'], data['member_code']))
-        
-        existing = cursor.fetchone()
-        
-        if not existing:
-            # Insert new record
-            cursor.execute('''
-                INSERT INTO nrlm_data (state_code, state_name, district_code, district_name,
-                                     block_code, block_name, grampanchayat_code, grampanchayat_name,
-                                     village_code, village_name, shg_name, member_name, member_code)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (data['state_code'], data['state_name'], data['district_code'], data['district_name'],
-                  data['block_code'], data['block_name'], data['grampanchayat_code'], data['grampanchayat_name'],
-                  data['village_code'], data['village_name'], data['shg_name'], data['member_name'], data['member_code']))
-            new_count += 1
+    ensure_nrlm_natural_key(cursor)
+    
+    rows = [(data['state_code'], data['state_name'], data['district_code'], data['district_name'],
+             data['block_code'], data['block_name'], data['grampanchayat_code'], data['grampanchayat_name'],
+             data['village_code'], data['village_name'], data['shg_name'], data['member_name'], data['member_code'])
+            for data in nrlm_data]
+    
+    # Existing members only get their names refreshed, and only when they changed
+    before_count = _table_count(cursor, 'nrlm_data')
+    cursor.executemany(f'''
+        INSERT INTO nrlm_data (state_code, state_name, district_code, district_name,
+                             block_code, block_name, grampanchayat_code, grampanchayat_name,
+                             village_code, village_name, shg_name, member_name, member_code)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT({', '.join(NRLM_NATURAL_KEY)}) DO UPDATE SET
+            shg_name = excluded.shg_name,
+            member_name = excluded.member_name,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE shg_name IS NOT excluded.shg_name OR member_name IS NOT excluded.member_name
+    ''', rows)
+    new_count = _table_count(cursor, 'nrlm_data') - before_count
     
     conn.commit()
     conn.close()
@@ -551,7 +650,7 @@ def save_nrlm_data_to_db(nrlm_data):
 
 def get_colleges_data():
     """Get all colleges data from database"""
-    conn = sqlite3.connect('users.db')
+    conn = USERS_DB.connect()
     cursor = conn.cursor()
     cursor.execute('SELECT s_no, member_code, institution_name, year_established, contact_no, created_at FROM colleges ORDER BY institution_name')
     colleges_data = cursor.fetchall()
@@ -561,7 +660,7 @@ def get_colleges_data():
 
 def get_nrlm_data():
     """Get all NRLM data from database"""
-    conn = sqlite3.connect('users.db')
+    conn = USERS_DB.connect()
     cursor = conn.cursor()
     cursor.execute('''
         SELECT state_name, district_name, block_name, grampanchayat_name, 
@@ -585,7 +684,7 @@ def login():
         username = request.form['username']
         password = request.form['password']
         
-        conn = sqlite3.connect('users.db')
+        conn = USERS_DB.connect()
         cursor = conn.cursor()
         cursor.execute('SELECT id, password FROM users WHERE username = ?', (username,))
         user = cursor.fetchone()
@@ -611,7 +710,7 @@ def signup():
             flash('Passwords do not match', 'error')
             return render_template('signup.html')
         
-        conn = sqlite3.connect('users.db')
+        conn = USERS_DB.connect()
         cursor = conn.cursor()
         
         try:
@@ -633,7 +732,7 @@ def dashboard():
 
 @app.route('/colleges')
 def colleges():
-    conn = sqlite3.connect('users.db')
+    conn = USERS_DB.connect()
     cursor = conn.cursor()
     cursor.execute('SELECT id, s_no, member_code, institution_name, year_established, contact_no, created_at FROM colleges ORDER BY institution_name')
     colleges_data = cursor.fetchall()
@@ -667,7 +766,7 @@ def cozcena():
 
 @app.route('/in-data')
 def in_data():
-    conn = sqlite3.connect('users.db')
+    conn = USERS_DB.connect()
     cursor = conn.cursor()
     cursor.execute('''
         SELECT state_name, district_name, block_name, grampanchayat_name, 
@@ -683,37 +782,22 @@ def in_data():
 @app.route('/api/states')
 def api_states():
     try:
-        scraper = WorkingNRLMScraper()
-        html = scraper.get_initial_page()
-        if html:
-            states = scraper.extract_states(html)
-            return jsonify({'success': True, 'states': states})
-        else:
-            return jsonify({'success': False, 'message': 'Failed to get states'})
+        states = NRLM_CLIENT.states()
+        return jsonify({'success': True, 'states': states})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)})
 
 @app.route('/api/districts/<state_code>')
 def api_districts(state_code):
     try:
-        scraper = WorkingNRLMScraper()
-        html = scraper.get_initial_page()
-        if html:
-            districts = scraper.get_districts(state_code)
-        else:
-            districts = []
+        districts = NRLM_CLIENT.districts(state_code)
         return jsonify({'success': True, 'districts': districts})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)})
 @app.route('/api/blocks/<state_code>/<district_code>')
 def api_blocks(state_code, district_code):
     try:
-        scraper = WorkingNRLMScraper()
-        html = scraper.get_initial_page()
-        if html:
-            blocks = scraper.get_blocks(state_code, district_code)
-        else:
-            blocks = []
+        blocks = NRLM_CLIENT.blocks(state_code, district_code)
         return jsonify({'success': True, 'blocks': blocks})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)})
@@ -721,12 +805,7 @@ def api_blocks(state_code, district_code):
 @app.route('/api/grampanchayats/<state_code>/<district_code>/<block_code>')
 def api_grampanchayats(state_code, district_code, block_code):
     try:
-        scraper = WorkingNRLMScraper()
-        html = scraper.get_initial_page()
-        if html:
-            grampanchayats = scraper.get_grampanchayats(state_code, district_code, block_code)
-        else:
-            grampanchayats = []
+        grampanchayats = NRLM_CLIENT.grampanchayats(state_code, district_code, block_code)
         return jsonify({'success': True, 'grampanchayats': grampanchayats})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)})
@@ -734,12 +813,7 @@ def api_grampanchayats(state_code, district_code, block_code):
 @app.route('/api/villages/<state_code>/<district_code>/<block_code>/<grampanchayat_code>')
 def api_villages(state_code, district_code, block_code, grampanchayat_code):
     try:
-        scraper = WorkingNRLMScraper()
-        html = scraper.get_initial_page()
-        if html:
-            villages = scraper.get_villages(state_code, district_code, block_code, grampanchayat_code)
-        else:
-            villages = []
+        villages = NRLM_CLIENT.villages(state_code, district_code, block_code, grampanchayat_code)
         return jsonify({'success': True, 'villages': villages})
     except Exception as e:
         return jsonify({'success': False, 'message': str(e)})
@@ -754,8 +828,7 @@ def api_shg_members():
         grampanchayat_code = data.get('grampanchayat_code')
         village_code = data.get('village_code')
         
-        scraper = WorkingNRLMScraper()
-        members = scraper.get_shg_members(state_code, district_code, block_code, grampanchayat_code, village_code)
+        members = NRLM_CLIENT.run(lambda scraper: scraper.get_shg_members(state_code, district_code, block_code, grampanchayat_code, village_code))
         
         # Save to database
         if members:
@@ -793,117 +866,68 @@ def api_shg_members():
 @app.route('/import-colleges', methods=['POST'])
 def import_colleges():
     try:
-        # Scrape data from website
-        colleges_data = scrape_colleges_data()
+        # Scrape data from website; unchanged pages are not reparsed
+        changes = CHANGES.start('colleges')
+        colleges_data = scrape_colleges_data(changes)
         
         if not colleges_data:
             return jsonify({'success': False, 'message': 'Failed to scrape data from website'})
         
-        # Save to database
-        new_count, updated_count = save_colleges_to_db(colleges_data)
+        # Save only new and changed colleges to the database
+        delta = changes.diff(colleges_data, key='member_code')
+        print(summarize(delta))
+        new_count, updated_count = save_colleges_to_db(delta['added'] + delta['updated'])
+        changes.commit()
         
         return jsonify({
             'success': True, 
             'message': f'Import completed! {new_count} new colleges added, {updated_count} updated.',
             'total_scraped': len(colleges_data),
             'new_count': new_count,
-            'updated_count': updated_count
+            'updated_count': updated_count,
+            'unchanged_count': delta['unchanged']
         })
         
     except Exception as e:
         return jsonify({'success': False, 'message': f'Error: {str(e)}'})
 
+COLLEGES_EXPORT_SQL = 'SELECT s_no, member_code, institution_name, year_established, contact_no, created_at FROM colleges ORDER BY institution_name'
+COLLEGES_EXPORT_HEADER = ['S.No', 'Member Code', 'Institution Name', 'Year Established', 'Contact No', 'Created At']
+
 @app.route('/download-colleges-csv')
 def download_colleges_csv():
     """Download colleges data as CSV"""
-    colleges_data = get_colleges_data()
-    
-    # Create DataFrame
-    df = pd.DataFrame(colleges_data, columns=[
-        'S.No', 'Member Code', 'Institution Name', 'Year Established', 'Contact No', 'Created At'
-    ])
-    
-    # Create CSV in memory
-    output = io.StringIO()
-    df.to_csv(output, index=False)
-    output.seek(0)
-    
-    # Create response
-    response = make_response(output.getvalue())
-    response.headers['Content-Type'] = 'text/csv'
-    response.headers['Content-Disposition'] = f'attachment; filename=colleges_data_{time.strftime("%Y%m%d_%H%M%S")}.csv'
-    
-    return response
+    return EXPORTS.send('colleges', 'csv', users_table_version('colleges'), COLLEGES_EXPORT_HEADER,
+                        lambda: query_rows('users.db', COLLEGES_EXPORT_SQL),
+                        f'colleges_data_{time.strftime("%Y%m%d_%H%M%S")}.csv')
 
 @app.route('/download-colleges-excel')
 def download_colleges_excel():
     """Download colleges data as Excel"""
-    colleges_data = get_colleges_data()
-    
-    # Create DataFrame
-    df = pd.DataFrame(colleges_data, columns=[
-        'S.No', 'Member Code', 'Institution Name', 'Year Established', 'Contact No', 'Created At'
-    ])
-    
-    # Create Excel in memory
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='Colleges Data', index=False)
-    
-    output.seek(0)
-    
-    # Create response
-    response = make_response(output.getvalue())
-    response.headers['Content-Type'] = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    response.headers['Content-Disposition'] = f'attachment; filename=colleges_data_{time.strftime("%Y%m%d_%H%M%S")}.xlsx'
-    
-    return response
+    return EXPORTS.send('colleges', 'xlsx', users_table_version('colleges'), COLLEGES_EXPORT_HEADER,
+                        lambda: query_rows('users.db', COLLEGES_EXPORT_SQL),
+                        f'colleges_data_{time.strftime("%Y%m%d_%H%M%S")}.xlsx', sheet_name='Colleges Data')
+
+NRLM_EXPORT_SQL = '''
+    SELECT state_name, district_name, block_name, grampanchayat_name, 
+           village_name, shg_name, member_name, member_code, created_at 
+    FROM nrlm_data ORDER BY state_name, district_name, block_name
+'''
+NRLM_EXPORT_HEADER = ['State', 'District', 'Block', 'Grampanchayat', 'Village', 'SHG Name', 'Member Name', 'Member Code', 'Created At']
 
 @app.route('/download-nrlm-csv')
 def download_nrlm_csv():
-    """Download NRLM data as CSV"""
-    nrlm_data = get_nrlm_data()
-    
-    # Create DataFrame
-    df = pd.DataFrame(nrlm_data, columns=[
-        'State', 'District', 'Block', 'Grampanchayat', 'Village', 'SHG Name', 'Member Name', 'Member Code', 'Created At'
-    ])
-    
-    # Create CSV in memory
-    output = io.StringIO()
-    df.to_csv(output, index=False)
-    output.seek(0)
-    
-    # Create response
-    response = make_response(output.getvalue())
-    response.headers['Content-Type'] = 'text/csv'
-    response.headers['Content-Disposition'] = f'attachment; filename=nrlm_data_{time.strftime("%Y%m%d_%H%M%S")}.csv'
-    
-    return response
+    """Download NRLM data as CSV; a cache miss streams from the cursor while it fills the export cache"""
+    return EXPORTS.send('nrlm', 'csv', users_table_version('nrlm_data'), NRLM_EXPORT_HEADER,
+                        lambda: query_rows('users.db', NRLM_EXPORT_SQL),
+                        f'nrlm_data_{time.strftime("%Y%m%d_%H%M%S")}.csv')
 
 @app.route('/download-nrlm-excel')
 def download_nrlm_excel():
-    """Download NRLM data as Excel"""
-    nrlm_data = get_nrlm_data()
-    
-    # Create DataFrame
-    df = pd.DataFrame(nrlm_data, columns=[
-        'State', 'District', 'Block', 'Grampanchayat', 'Village', 'SHG Name', 'Member Name', 'Member Code', 'Created At'
-    ])
-    
-    # Create Excel in memory
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='NRLM Data', index=False)
-    
-    output.seek(0)
-    
-    # Create response
-    response = make_response(output.getvalue())
-    response.headers['Content-Type'] = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    response.headers['Content-Disposition'] = f'attachment; filename=nrlm_data_{time.strftime("%Y%m%d_%H%M%S")}.xlsx'
-    
-    return response
+    """Download NRLM data as Excel; a cache miss is built from the cursor in a write-only workbook, then sent"""
+    return EXPORTS.send('nrlm', 'xlsx', users_table_version('nrlm_data'), NRLM_EXPORT_HEADER,
+                        lambda: query_rows('users.db', NRLM_EXPORT_SQL),
+                        f'nrlm_data_{time.strftime("%Y%m%d_%H%M%S")}.xlsx', sheet_name='NRLM Data')
 
 @app.route('/logout')
 def logout():
@@ -969,48 +993,37 @@ def cbe_wards():
 def download_cbe_wards_csv():
     """Download CBE ward data as CSV"""
     try:
-        ward_data = load_cbe_ward_data()
-        
-        # Create CSV response
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(["Ward Number", "Ward Name", "Direction", "Description"])
-        
-        # Write data
-        for ward in ward_data:
-            for direction, descriptions in ward["directions"].items():
-                for desc in descriptions:
-                    writer.writerow([
-                        ward["ward_number"],
-                        ward["ward_name"],
-                        direction.title(),
-                        desc
-                    ])
-        
-        # Create response
-        response = make_response(output.getvalue())
-        response.headers["Content-Type"] = "text/csv"
-        response.headers["Content-Disposition"] = "attachment; filename=cbe_wards.csv"
-        
-        return response
+        # One row per ward direction description
+        def rows():
+            return ([ward["ward_number"], ward["ward_name"], direction.title(), desc]
+                    for ward in load_cbe_ward_data()
+                    for direction, descriptions in ward["directions"].items()
+                    for desc in descriptions)
+        return EXPORTS.send("cbe_wards", "csv", WAREHOUSE.signature("cbe_wards"),
+                            ["Ward Number", "Ward Name", "Direction", "Description"], rows, "cbe_wards.csv")
     except Exception as e:
         flash(f"Error generating CSV: {str(e)}", "error")
         return redirect(url_for("cbe_wards"))
 
 def load_cbe_ward_data():
-    """Load CBE ward data from JSON file"""
+    """Load CBE ward data from the warehouse"""
     try:
-        if os.path.exists("coimbatore_wards.json"):
-            with open("coimbatore_wards.json", "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data.get("data", {}).get("wards", [])
-        else:
-            return []
+        return WAREHOUSE.rows('cbe_wards')
     except Exception as e:
         print(f"Error loading CBE ward data: {str(e)}")
         return []
+
+def _fetch_rows_by_id(cursor, table, ids, columns='*'):
+    """Fetch rows by id as dicts, keeping the order of ``ids``"""
+    if not ids:
+        return []
+    if columns != '*':
+        columns = f"id, {columns}"
+    cursor.execute(f"SELECT {columns} FROM {table} WHERE id IN (SELECT value FROM json_each(?))", (json.dumps(ids),))
+    names = [description[0] for description in cursor.description]
+    rows = {row[names.index('id')]: dict(zip(names, row)) for row in cursor.fetchall()}
+    return [rows[row_id] for row_id in ids if row_id in rows]
+
 @app.route('/edu-list-tn')
 def edu_list_tn():
     # Get pagination parameters
@@ -1021,18 +1034,13 @@ def edu_list_tn():
     region_filter = request.args.get('region', '').strip()
     type_filter = request.args.get('type', '').strip()
     
-    conn = sqlite3.connect('users.db')
+    conn = USERS_DB.connect()
     cursor = conn.cursor()
     
     # Build the WHERE clause for filtering
     where_conditions = []
     params = []
     
-    if search:
-        where_conditions.append("(name LIKE ? OR district LIKE ? OR region LIKE ? OR college_type LIKE ? OR category LIKE ?)")
-        search_param = f"%{search}%"
-        params.extend([search_param, search_param, search_param, search_param, search_param])
-    
     if district_filter:
         where_conditions.append("district = ?")
         params.append(district_filter)
@@ -1045,39 +1053,36 @@ def edu_list_tn():
         where_conditions.append("college_type = ?")
         params.append(type_filter)
     
-    where_clause = ""
-    if where_conditions:
-        where_clause = "WHERE " + " AND ".join(where_conditions)
-    
-    # Get total count for pagination
-    count_query = f"SELECT COUNT(*) FROM dce_colleges {where_clause}"
-    cursor.execute(count_query, params)
-    total_records = cursor.fetchone()[0]
-    total_pages = (total_records + per_page - 1) // per_page
+    where = " AND ".join(where_conditions) or None
     
     # Calculate offset for pagination
     offset = (page - 1) * per_page
+    columns = ['s_no', 'name', 'district', 'region', 'college_type', 'category', 'contact', 'website', 'established', 'affiliation']
     
-    # Get paginated data
-    query = f'''
-        SELECT s_no, name, district, region, college_type, category, contact, website, established, affiliation
-        FROM dce_colleges 
-        {where_clause}
-        ORDER BY district, name
-        LIMIT ? OFFSET ?
-    '''
-    cursor.execute(query, params + [per_page, offset])
-    edu_data = cursor.fetchall()
-    
-    # Get unique values for filter dropdowns
-    cursor.execute("SELECT DISTINCT district FROM dce_colleges WHERE district IS NOT NULL ORDER BY district")
-    districts = [row[0] for row in cursor.fetchall()]
+    if search:
+        # Ranked ids from the FTS5 store, narrowed by the dropdown filters
+        college_ids = SEARCH_STORE.match_refs('dce_colleges', search)
+        if where_conditions and college_ids:
+            cursor.execute(f"SELECT id FROM dce_colleges WHERE id IN (SELECT value FROM json_each(?)) AND {' AND '.join(where_conditions)}",
+                           [json.dumps(college_ids)] + params)
+            allowed = {row[0] for row in cursor.fetchall()}
+            college_ids = [college_id for college_id in college_ids if college_id in allowed]
+        total_records = len(college_ids)
+        rows = _fetch_rows_by_id(cursor, 'dce_colleges', college_ids[offset:offset + per_page], ', '.join(columns))
+        edu_data = [tuple(row[column] for column in columns) for row in rows]
+    else:
+        # Cached count, and the page sought from the previous page's last (district, name)
+        total_records = DCE_PAGER.count(conn, where, params)
+        rows = DCE_PAGER.page(conn, columns, page, per_page, where, params)
+        edu_data = [tuple(row[column] for column in columns) for row in rows]
     
-    cursor.execute("SELECT DISTINCT region FROM dce_colleges WHERE region IS NOT NULL ORDER BY region")
-    regions = [row[0] for row in cursor.fetchall()]
+    total_pages = (total_records + per_page - 1) // per_page
     
-    cursor.execute("SELECT DISTINCT college_type FROM dce_colleges WHERE college_type IS NOT NULL ORDER BY college_type")
-    college_types = [row[0] for row in cursor.fetchall()]
+    # Dropdown values, computed once per change of the table
+    facets = DCE_PAGER.facets(conn)
+    districts = facets['district']
+    regions = facets['region']
+    college_types = facets['college_type']
     
     conn.close()
     
@@ -1100,10 +1105,15 @@ def refresh_dce_data():
     try:
         from dce_scraper_improved import DCEScraperImproved
         scraper = DCEScraperImproved()
-        colleges = scraper.get_all_colleges()
+        changes = CHANGES.start('dce_colleges')
+        colleges = scraper.get_all_colleges(changes)
         if colleges:
-            scraper.save_to_database(colleges)
-            flash(f'Successfully updated {len(colleges)} colleges from DCE website!', 'success')
+            delta = changes.diff(colleges, key=('name', 'district'))
+            print(summarize(delta))
+            if scraper.apply_changes(delta):
+                changes.commit()
+            flash(f'Successfully updated {len(colleges)} colleges from DCE website! '
+                  f'({len(delta["added"])} new, {len(delta["updated"])} changed, {len(delta["removed"])} removed)', 'success')
         else:
             flash('No colleges found or error occurred during scraping.', 'error')
     except Exception as e:
@@ -1111,57 +1121,29 @@ def refresh_dce_data():
     
     return redirect(url_for('edu_list_tn'))
 
+DCE_EXPORT_SQL = '''
+    SELECT s_no, name, district, region, college_type, category, contact, website, established, affiliation
+    FROM dce_colleges 
+    ORDER BY district, name
+'''
+DCE_EXPORT_HEADER = ['S.No', 'College Name', 'District', 'Region', 'College Type', 'Category',
+                     'Contact', 'Website', 'Established', 'Affiliation']
+
 @app.route('/download-dce-csv')
 def download_dce_csv():
-    conn = sqlite3.connect('users.db')
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT s_no, name, district, region, college_type, category, contact, website, established, affiliation
-        FROM dce_colleges 
-        ORDER BY district, name
-    ''')
-    data = cursor.fetchall()
-    conn.close()
-    
-    # Create CSV content
-    csv_content = "S.No,College Name,District,Region,College Type,Category,Contact,Website,Established,Affiliation\n"
-    for row in data:
-        csv_content += f"{row[0]},{row[1]},{row[2]},{row[3]},{row[4]},{row[5]},{row[6]},{row[7]},{row[8]},{row[9]}\n"
-    
-    response = make_response(csv_content)
-    response.headers['Content-Type'] = 'text/csv'
-    response.headers['Content-Disposition'] = 'attachment; filename=dce_colleges.csv'
-    return response
+    return EXPORTS.send('dce_colleges', 'csv', users_table_version('dce_colleges'), DCE_EXPORT_HEADER,
+                        lambda: query_rows('users.db', DCE_EXPORT_SQL), 'dce_colleges.csv')
 
 @app.route('/download-dce-excel')
 def download_dce_excel():
-    conn = sqlite3.connect('users.db')
-    cursor = conn.cursor()
-    cursor.execute('''
-        SELECT s_no, name, district, region, college_type, category, contact, website, established, affiliation
-        FROM dce_colleges 
-        ORDER BY district, name
-    ''')
-    data = cursor.fetchall()
-    conn.close()
-    
-    # Create Excel content (simplified as CSV with .xlsx extension)
-    excel_content = "S.No,College Name,District,Region,College Type,Category,Contact,Website,Established,Affiliation\n"
-    for row in data:
-        excel_content += f"{row[0]},{row[1]},{row[2]},{row[3]},{row[4]},{row[5]},{row[6]},{row[7]},{row[8]},{row[9]}\n"
-    
-    response = make_response(excel_content)
-    response.headers['Content-Type'] = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    response.headers['Content-Disposition'] = 'attachment; filename=dce_colleges.xlsx'
-    return response
+    return EXPORTS.send('dce_colleges', 'xlsx', users_table_version('dce_colleges'), DCE_EXPORT_HEADER,
+                        lambda: query_rows('users.db', DCE_EXPORT_SQL), 'dce_colleges.xlsx', sheet_name='DCE Colleges')
 import requests
 from bs4 import BeautifulSoup
 import urllib3
 from enhanced_suppliers_scraper import EnhancedSuppliersScraper
 import os as _os
 
-# Cache for pandas dataframes
-_PIN_DF_CACHE = {"df": None, "path": None, "mtime": None}
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 class WorkingNRLMScraper:
@@ -1399,6 +1381,9 @@ class WorkingNRLMScraper:
             print(f"Error getting SHG members: {e}")
             return {}
 
+# Warm NRLM sessions shared by the dropdown APIs, lists cached for 6 hours
+NRLM_CLIENT = NRLMClientPool(WorkingNRLMScraper, size=4, ttl=6 * 3600)
+
 @app.route('/iia-list')
 def iia_list():
     # Sample IIA data
@@ -1541,35 +1526,20 @@ def tcea_members():
                              search_query="",
                              category="")
 
+TCEA_EXPORT_HEADER = ['S.No', 'Name', 'Page', 'Source URL']
+
+def tcea_export_rows():
+    members = WAREHOUSE.rows('tcea_members', "group_name = 'members'")
+    return ([i, member.get('name', ''), member.get('page', ''), member.get('url', '')]
+            for i, member in enumerate(members, 1))
+
 @app.route('/download-tcea-csv')
 
 def download_tcea_csv():
     """Download TCEA members as CSV"""
     try:
-        tcea_data = load_complete_tcea_data()
-        
-        # Create CSV response
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['S.No', 'Name', 'Page', 'Source URL'])
-        
-        # Write data
-        for i, member in enumerate(tcea_data, 1):
-            writer.writerow([
-                i,
-                member.get('name', ''),
-                member.get('page', ''),
-                member.get('url', '')
-            ])
-        
-        # Create response
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = 'attachment; filename=tcea_members.csv'
-        
-        return response
+        return EXPORTS.send('tcea_members', 'csv', WAREHOUSE.signature('tcea_members'), TCEA_EXPORT_HEADER,
+                            tcea_export_rows, 'tcea_members.csv')
     except Exception as e:
         flash(f'Error generating CSV: {str(e)}', 'error')
         return redirect(url_for('tcea_members'))
@@ -1579,44 +1549,19 @@ def download_tcea_csv():
 def download_tcea_excel():
     """Download TCEA members as Excel"""
     try:
-        tcea_data = load_complete_tcea_data()
-        
-        # Create DataFrame
-        df_data = []
-        for i, member in enumerate(tcea_data, 1):
-            df_data.append({
-                'S.No': i,
-                'Name': member.get('name', ''),
-                'Page': member.get('page', ''),
-                'Source URL': member.get('url', '')
-            })
-        
-        df = pd.DataFrame(df_data)
-        
-        # Create Excel response
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='TCEA Members', index=False)
-        
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        response.headers['Content-Disposition'] = 'attachment; filename=tcea_members.xlsx'
-        
-        return response
+        return EXPORTS.send('tcea_members', 'xlsx', WAREHOUSE.signature('tcea_members'), TCEA_EXPORT_HEADER,
+                            tcea_export_rows, 'tcea_members.xlsx', sheet_name='TCEA Members')
     except Exception as e:
         flash(f'Error generating Excel: {str(e)}', 'error')
         return redirect(url_for('tcea_members'))
 
 def load_complete_tcea_data():
-    """Load TCEA members data from JSON file"""
+    """Load TCEA data from the warehouse, grouped as in the JSON file (members, office_bearers, ...)"""
     try:
-        if os.path.exists('tcea_complete_data.json'):
-            with open('tcea_complete_data.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get('data', {})
-        else:
-            # If no JSON file exists, return empty list
-            return {}
+        groups = {}
+        for record in WAREHOUSE.rows('tcea_members'):
+            groups.setdefault(record.pop('group_name'), []).append(record)
+        return groups
     except Exception as e:
         print(f"Error loading TCEA data: {str(e)}")
         return {}
@@ -1637,36 +1582,19 @@ def credai_members():
         flash(f'Error loading CREDAI data: {str(e)}', 'error')
         return render_template('credai_members.html', credai_data=[], username=session.get('username'))
 
+CREDAI_EXPORT_HEADER = ['S.No', 'Name', 'Type', 'Source URL', 'Scraped At']
+
+def credai_export_rows():
+    return ([i, member.get('name', ''), member.get('type', ''), member.get('source_url', ''), member.get('scraped_at', '')]
+            for i, member in enumerate(load_credai_data(), 1))
+
 @app.route('/download-credai-csv')
 
 def download_credai_csv():
     """Download CREDAI members as CSV"""
     try:
-        credai_data = load_credai_data()
-        
-        # Create CSV response
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['S.No', 'Name', 'Type', 'Source URL', 'Scraped At'])
-        
-        # Write data
-        for i, member in enumerate(credai_data, 1):
-            writer.writerow([
-                i,
-                member.get('name', ''),
-                member.get('type', ''),
-                member.get('source_url', ''),
-                member.get('scraped_at', '')
-            ])
-        
-        # Create response
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = 'attachment; filename=credai_members.csv'
-        
-        return response
+        return EXPORTS.send('credai_members', 'csv', WAREHOUSE.signature('credai_members'), CREDAI_EXPORT_HEADER,
+                            credai_export_rows, 'credai_members.csv')
     except Exception as e:
         flash(f'Error generating CSV: {str(e)}', 'error')
         return redirect(url_for('credai_members'))
@@ -1676,46 +1604,16 @@ def download_credai_csv():
 def download_credai_excel():
     """Download CREDAI members as Excel"""
     try:
-        credai_data = load_credai_data()
-        
-        # Create DataFrame
-        df_data = []
-        for i, member in enumerate(credai_data, 1):
-            df_data.append({
-                'S.No': i,
-                'Name': member.get('name', ''),
-                'Type': member.get('type', ''),
-                'Source URL': member.get('source_url', ''),
-                'Scraped At': member.get('scraped_at', '')
-            })
-        
-        df = pd.DataFrame(df_data)
-        
-        # Create Excel response
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='CREDAI Members', index=False)
-        
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        response.headers['Content-Disposition'] = 'attachment; filename=credai_members.xlsx'
-        
-        return response
+        return EXPORTS.send('credai_members', 'xlsx', WAREHOUSE.signature('credai_members'), CREDAI_EXPORT_HEADER,
+                            credai_export_rows, 'credai_members.xlsx', sheet_name='CREDAI Members')
     except Exception as e:
         flash(f'Error generating Excel: {str(e)}', 'error')
         return redirect(url_for('credai_members'))
 
 def load_credai_data():
-    """Load CREDAI members data from JSON file"""
+    """Load CREDAI members data from the warehouse"""
     try:
-        if os.path.exists('credai_members.json'):
-            with open('credai_members.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # The JSON structure has data.members array
-                return data.get('data', {}).get('members', [])
-        else:
-            # If no JSON file exists, return empty list
-            return []
+        return WAREHOUSE.rows('credai_members')
     except Exception as e:
         print(f"Error loading CREDAI data: {str(e)}")
         return []
@@ -1732,17 +1630,10 @@ def rera_agents():
         page = request.args.get('page', 1, type=int)
         per_page = 200
         
-        # Load RERA agents data
-        rera_data = load_rera_data()
-        
-        # Calculate pagination
-        total_records = len(rera_data)
+        # Only the current page is read from the warehouse
+        total_records = WAREHOUSE.count('rera_agents')
         total_pages = (total_records + per_page - 1) // per_page
-        
-        # Get current page data
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        current_page_data = rera_data[start_idx:end_idx]
+        current_page_data = WAREHOUSE.rows('rera_agents', limit=per_page, offset=(max(page, 1) - 1) * per_page)
         
         return render_template('rera_agents.html', 
                              rera_data=current_page_data, 
@@ -1761,38 +1652,20 @@ def rera_agents():
                              total_records=0,
                              per_page=200)
 
+RERA_EXPORT_HEADER = ['S.No', 'Registration Number', 'Name', 'Address', 'Type', 'Validity', 'Renewal']
+
+def rera_export_rows():
+    return ([i, agent.get('registration_number', ''), agent.get('name', ''), agent.get('address', ''),
+             agent.get('type', ''), agent.get('validity', ''), agent.get('renewal', '')]
+            for i, agent in enumerate(load_rera_data(), 1))
+
 @app.route('/download-rera-csv')
 
 def download_rera_csv():
     """Download RERA agents as CSV"""
     try:
-        rera_data = load_rera_data()
-        
-        # Create CSV response
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['S.No', 'Registration Number', 'Name', 'Address', 'Type', 'Validity', 'Renewal'])
-        
-        # Write data
-        for i, agent in enumerate(rera_data, 1):
-            writer.writerow([
-                i,
-                agent.get('registration_number', ''),
-                agent.get('name', ''),
-                agent.get('address', ''),
-                agent.get('type', ''),
-                agent.get('validity', ''),
-                agent.get('renewal', '')
-            ])
-        
-        # Create response
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = 'attachment; filename=rera_agents.csv'
-        
-        return response
+        return EXPORTS.send('rera_agents', 'csv', WAREHOUSE.signature('rera_agents'), RERA_EXPORT_HEADER,
+                            rera_export_rows, 'rera_agents.csv')
     except Exception as e:
         flash(f'Error generating CSV: {str(e)}', 'error')
         return redirect(url_for('rera_agents'))
@@ -1802,52 +1675,16 @@ def download_rera_csv():
 def download_rera_excel():
     """Download RERA agents as Excel"""
     try:
-        rera_data = load_rera_data()
-        
-        # Create DataFrame
-        df_data = []
-        for i, agent in enumerate(rera_data, 1):
-            df_data.append({
-                'S.No': i,
-                'Registration Number': agent.get('registration_number', ''),
-                'Name': agent.get('name', ''),
-                'Address': agent.get('address', ''),
-                'Type': agent.get('type', ''),
-                'Validity': agent.get('validity', ''),
-                'Renewal': agent.get('renewal', '')
-            })
-        
-        df = pd.DataFrame(df_data)
-        
-        # Create Excel response
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='RERA Agents', index=False)
-        
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        response.headers['Content-Disposition'] = 'attachment; filename=rera_agents.xlsx'
-        
-        return response
+        return EXPORTS.send('rera_agents', 'xlsx', WAREHOUSE.signature('rera_agents'), RERA_EXPORT_HEADER,
+                            rera_export_rows, 'rera_agents.xlsx', sheet_name='RERA Agents')
     except Exception as e:
         flash(f'Error generating Excel: {str(e)}', 'error')
         return redirect(url_for('rera_agents'))
 
 def load_rera_data():
-    """Load RERA agents data from JSON file"""
+    """Load RERA agents data from the warehouse (improved scrape first, then the old one)"""
     try:
-        # Try to load improved data first
-        if os.path.exists('rera_agents_improved.json'):
-            with open('rera_agents_improved.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data
-        # Fallback to old data structure
-        elif os.path.exists('rera_agents.json'):
-            with open('rera_agents.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get('data', {}).get('agents', [])
-        else:
-            return []
+        return WAREHOUSE.rows('rera_agents')
     except Exception as e:
         print(f"Error loading RERA data: {str(e)}")
         return []
@@ -1861,26 +1698,12 @@ def ccmc_contractors():
         page = request.args.get('page', 1, type=int)
         per_page = 200
         
-        # Load CCMC contractors data
-        ccmc_data = load_ccmc_data()
-        
-        # Filter out records where contractor name is purely numeric or starts with numeric
-        import re
-        ccmc_data = [contractor for contractor in ccmc_data 
-                     if contractor.get("Name") and 
-                     isinstance(contractor["Name"], str) and
-                     contractor["Name"].strip() and 
-                     not re.match(r"^\d+$", contractor["Name"].strip()) and
-                     not re.match(r"^\d", contractor["Name"].strip())]
-        
-        # Calculate pagination
-        total_records = len(ccmc_data)
+        # Filter out records where contractor name is purely numeric or starts with numeric,
+        # and read only the current page
+        total_records = WAREHOUSE.count('ccmc_contractors', CCMC_VALID_NAME)
         total_pages = (total_records + per_page - 1) // per_page
-        
-        # Get current page data
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        current_page_data = ccmc_data[start_idx:end_idx]
+        current_page_data = _convert_ccmc_contractors(WAREHOUSE.rows(
+            'ccmc_contractors', CCMC_VALID_NAME, limit=per_page, offset=(max(page, 1) - 1) * per_page))
         
         return render_template('ccmc_contractors.html', 
                              ccmc_data=current_page_data, 
@@ -1899,47 +1722,22 @@ def ccmc_contractors():
                              total_records=0,
                              per_page=200)
 
+CCMC_EXPORT_HEADER = ['S.No', 'Name', 'Class', 'Address', 'Phone', 'Source', 'Extracted At']
+
+def ccmc_export_rows():
+    # Raw (lowercase) rows, without names that are numeric or start with a digit
+    ccmc_data = WAREHOUSE.rows('ccmc_contractors', CCMC_VALID_NAME)
+    return ([i, contractor.get('name', ''), contractor.get('class', ''), contractor.get('address', ''),
+             contractor.get('phone', ''), contractor.get('source', ''), contractor.get('extracted_at', '')]
+            for i, contractor in enumerate(ccmc_data, 1))
+
 @app.route('/download-ccmc-csv')
 
 def download_ccmc_csv():
     """Download CCMC contractors as CSV"""
     try:
-        ccmc_data = load_ccmc_data()
-        
-        # Filter out records where contractor name is purely numeric or starts with numeric
-        import re
-        ccmc_data = [contractor for contractor in ccmc_data 
-                     if contractor.get("Name") and 
-                     isinstance(contractor["Name"], str) and
-                     contractor["Name"].strip() and 
-                     not re.match(r"^\d+$", contractor["Name"].strip()) and
-                     not re.match(r"^\d", contractor["Name"].strip())]
-        
-        # Create CSV response
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['S.No', 'Name', 'Class', 'Address', 'Phone', 'Source', 'Extracted At'])
-        
-        # Write data
-        for i, contractor in enumerate(ccmc_data, 1):
-            writer.writerow([
-                i,
-                contractor.get('name', ''),
-                contractor.get('class', ''),
-                contractor.get('address', ''),
-                contractor.get('phone', ''),
-                contractor.get('source', ''),
-                contractor.get('extracted_at', '')
-            ])
-        
-        # Create response
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = 'attachment; filename=ccmc_contractors.csv'
-        
-        return response
+        return EXPORTS.send('ccmc_contractors', 'csv', WAREHOUSE.signature('ccmc_contractors'), CCMC_EXPORT_HEADER,
+                            ccmc_export_rows, 'ccmc_contractors.csv')
     except Exception as e:
         flash(f'Error generating CSV: {str(e)}', 'error')
         return redirect(url_for('ccmc_contractors'))
@@ -1949,121 +1747,79 @@ def download_ccmc_csv():
 def download_ccmc_excel():
     """Download CCMC contractors as Excel"""
     try:
-        ccmc_data = load_ccmc_data()
-        
-        # Filter out records where contractor name is purely numeric or starts with numeric
-        import re
-        ccmc_data = [contractor for contractor in ccmc_data 
-                     if contractor.get("Name") and 
-                     isinstance(contractor["Name"], str) and
-                     contractor["Name"].strip() and 
-                     not re.match(r"^\d+$", contractor["Name"].strip()) and
-                     not re.match(r"^\d", contractor["Name"].strip())]
-        
-        # Create DataFrame
-        df_data = []
-        for i, contractor in enumerate(ccmc_data, 1):
-            df_data.append({
-                'S.No': i,
-                'Name': contractor.get('Name', ''),
-                'Class': contractor.get('Class', ''),
-                'Address': contractor.get('Address', ''),
-                'Phone': contractor.get('Phone', ''),
-                'Source': contractor.get('Source', ''),
-                'Extracted At': contractor.get('Extracted At', '')
-            })
-        
-        df = pd.DataFrame(df_data)
-        
-        # Create Excel response
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='CCMC Contractors', index=False)
-        
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        response.headers['Content-Disposition'] = 'attachment; filename=ccmc_contractors.xlsx'
-        
-        return response
+        return EXPORTS.send('ccmc_contractors', 'xlsx', WAREHOUSE.signature('ccmc_contractors'), CCMC_EXPORT_HEADER,
+                            ccmc_export_rows, 'ccmc_contractors.xlsx', sheet_name='CCMC Contractors')
     except Exception as e:
         flash(f'Error generating Excel: {str(e)}', 'error')
         return redirect(url_for('ccmc_contractors'))
 
+# Contractor names that are empty or start with a digit are extraction noise
+CCMC_VALID_NAME = "trim(name) != '' AND trim(name) NOT GLOB '[0-9]*'"
+
+def _convert_ccmc_contractors(contractors):
+    """Convert lowercase field names to uppercase to match CSV structure"""
+    converted_contractors = []
+    for contractor in contractors:
+        converted_contractor = {
+            'S.No': contractor.get('serial_no', ''),
+            'Name': contractor.get('name', ''),
+            'Class': contractor.get('class', ''),
+            'Address': contractor.get('address', ''),
+            'Phone': contractor.get('phone', ''),
+            'Source': contractor.get('source', ''),
+            'Extracted At': contractor.get('extracted_at', '')
+        }
+        converted_contractors.append(converted_contractor)
+    return converted_contractors
+
 def load_ccmc_data():
-    """Load CCMC contractors data from JSON file"""
+    """Load CCMC contractors data from the warehouse"""
     try:
-        if os.path.exists('ccmc_contractors.json'):
-            with open('ccmc_contractors.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                contractors = data.get('data', {}).get('contractors', [])
-                # Convert lowercase field names to uppercase to match CSV structure
-                converted_contractors = []
-                for contractor in contractors:
-                    converted_contractor = {
-                        'S.No': contractor.get('serial_no', ''),
-                        'Name': contractor.get('name', ''),
-                        'Class': contractor.get('class', ''),
-                        'Address': contractor.get('address', ''),
-                        'Phone': contractor.get('phone', ''),
-                        'Source': contractor.get('source', ''),
-                        'Extracted At': contractor.get('extracted_at', '')
-                    }
-                    converted_contractors.append(converted_contractor)
-                return converted_contractors
-        else:
-            return []
+        return _convert_ccmc_contractors(WAREHOUSE.rows('ccmc_contractors'))
     except Exception as e:
         print(f"Error loading CCMC data: {str(e)}")
         return []
 
 def load_sub_reg_data():
-    """Load Sub Registrar office data from JSON file"""
+    """Load Sub Registrar office data from the warehouse"""
     try:
-        if os.path.exists('sub_reg_offices.json'):
-            with open('sub_reg_offices.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get('data', [])
-        else:
-            return []
+        return WAREHOUSE.rows('sub_reg_offices')
     except Exception as e:
         print(f"Error loading Sub Registrar data: {str(e)}")
         return []
 
+def _sr_office_filter(zone_filter, search_query):
+    """SQL condition and params for the zone/search filters of the Sub Registrar pages"""
+    conditions, params = [], []
+    if zone_filter:
+        conditions.append('zone = ? COLLATE NOCASE')
+        params.append(zone_filter)
+    if search_query:
+        conditions.append("(instr(lower(office_name), ?) OR instr(lower(designation), ?) OR instr(lower(address), ?))")
+        params.extend([search_query.lower()] * 3)
+    return ' AND '.join(conditions) or None, params
+
 @app.route('/sr-office')
 
 def sr_office():
     """Display Sub Registrar offices with filtering"""
     try:
-        sub_reg_data = load_sub_reg_data()
-        
         # Get filter parameters
         zone_filter = request.args.get('zone', '')
         search_query = request.args.get('search', '')
-        
-        # Apply filters
-        filtered_data = sub_reg_data
-        
-        if zone_filter:
-            filtered_data = [office for office in filtered_data if office.get('zone', '').lower() == zone_filter.lower()]
-        
-        if search_query:
-            search_lower = search_query.lower()
-            filtered_data = [office for office in filtered_data if 
-                           search_lower in office.get('office_name', '').lower() or
-                           search_lower in office.get('designation', '').lower() or
-                           search_lower in office.get('address', '').lower()]
+        where, params = _sr_office_filter(zone_filter, search_query)
         
         # Get unique zones for filter dropdown
-        zones = sorted(set(office.get('zone', '') for office in sub_reg_data if office.get('zone')))
+        zones = WAREHOUSE.distinct('sub_reg_offices', 'zone')
         
         # Pagination
         page = int(request.args.get('page', 1))
         per_page = 50
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        paginated_data = filtered_data[start_idx:end_idx]
+        total_records = WAREHOUSE.count('sub_reg_offices', where, params)
+        paginated_data = WAREHOUSE.rows('sub_reg_offices', where, params, limit=per_page,
+                                        offset=(max(page, 1) - 1) * per_page)
         
-        total_pages = (len(filtered_data) + per_page - 1) // per_page
+        total_pages = (total_records + per_page - 1) // per_page
         
         return render_template('sr_office.html', 
                              sub_reg_data=paginated_data,
@@ -2073,7 +1829,7 @@ def sr_office():
                              username=session.get('username'),
                              current_page=page,
                              total_pages=total_pages,
-                             total_records=len(filtered_data),
+                             total_records=total_records,
                              per_page=per_page)
     except Exception as e:
         flash(f'Error loading Sub Registrar data: {str(e)}', 'error')
@@ -2091,50 +1847,21 @@ def sr_office():
 def download_sr_office_csv():
     """Download Sub Registrar offices as CSV"""
     try:
-        sub_reg_data = load_sub_reg_data()
-        
         # Get filter parameters
         zone_filter = request.args.get('zone', '')
         search_query = request.args.get('search', '')
         
-        # Apply same filters as main page
-        filtered_data = sub_reg_data
-        
-        if zone_filter:
-            filtered_data = [office for office in filtered_data if office.get('zone', '').lower() == zone_filter.lower()]
-        
-        if search_query:
-            search_lower = search_query.lower()
-            filtered_data = [office for office in filtered_data if 
-                           search_lower in office.get('office_name', '').lower() or
-                           search_lower in office.get('designation', '').lower() or
-                           search_lower in office.get('address', '').lower()]
-        
-        # Create CSV response
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['Zone', 'Office Name', 'Designation', 'STD Code', 'Office Phone', 'Email', 'Address'])
-        
-        # Write data
-        for office in filtered_data:
-            writer.writerow([
-                office.get('zone', ''),
-                office.get('office_name', ''),
-                office.get('designation', ''),
-                office.get('std_code', ''),
-                office.get('office_phone', ''),
-                office.get('email', ''),
-                office.get('address', '')
-            ])
-        
-        output.seek(0)
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = f'attachment; filename=sub_registrar_offices_{zone_filter or "all"}.csv'
-        
-        return response
+        def rows():
+            # Apply same filters as main page
+            filtered_data = WAREHOUSE.rows('sub_reg_offices', *_sr_office_filter(zone_filter, search_query))
+            return ([office.get('zone', ''), office.get('office_name', ''), office.get('designation', ''),
+                     office.get('std_code', ''), office.get('office_phone', ''), office.get('email', ''),
+                     office.get('address', '')]
+                    for office in filtered_data)
+        return EXPORTS.send('sub_reg_offices', 'csv', WAREHOUSE.signature('sub_reg_offices'),
+                            ['Zone', 'Office Name', 'Designation', 'STD Code', 'Office Phone', 'Email', 'Address'],
+                            rows, f'sub_registrar_offices_{zone_filter or "all"}.csv',
+                            params={'zone': zone_filter.lower(), 'search': search_query.lower()})
     except Exception as e:
         flash(f'Error generating CSV: {str(e)}', 'error')
         return redirect(url_for('sr_office'))
@@ -2177,29 +1904,59 @@ def ward_map_url():
 
 # BAI Members route
 
-# Simple CSV cache to avoid re-reading on every request
-_PIN_DF_CACHE = {'path': None, 'mtime': None, 'df': None}
+PINCODE_COLUMNS = ['officename', 'pincode', 'officetype', 'delivery', 'district', 'statename']
 
+def _pincode_source(columns=PINCODE_COLUMNS):
+    """(path, reader, variant) of the pincode frame in the dataset cache"""
+    ensure_snapshot()
+    path = PINCODES_SNAPSHOT if snapshot_is_fresh() else PINCODES_CSV
+    return path, lambda p: read_pincodes(columns), ('pincodes', tuple(sorted(columns)))
 
-def PD_CACHE_read(path, usecols=None):
-    try:
-        st = _os.stat(path)
-        mtime = st.st_mtime
-        if _PIN_DF_CACHE['df'] is not None and _PIN_DF_CACHE['path']==path and _PIN_DF_CACHE['mtime']==mtime:
-            return _PIN_DF_CACHE['df']
-        df = _pd.read_csv(path, low_memory=False, usecols=usecols)
-        _PIN_DF_CACHE.update({'path': path, 'mtime': mtime, 'df': df})
-        return df
-    except Exception:
-        # Fallback
-        return _pd.read_csv(path, low_memory=False, usecols=usecols)
+def load_pincode_frame(columns=PINCODE_COLUMNS):
+    """Read pincode directory columns from the Feather snapshot through the dataset cache.
+
+    statename/district/officetype/delivery are categoricals and pincode is
+    int32. The returned frame is shared, callers must not modify it in place.
+    """
+    path, reader, variant = _pincode_source(columns)
+    return DATASETS.get(path, reader, variant=variant)
+
+def _build_pincode_indexes(frame):
+    hierarchy = PincodeHierarchy(frame)
+    return {'hierarchy': hierarchy, 'pager': PincodePager(hierarchy.offices_frame)}
+
+def _pincode_indexes():
+    """Indexes over the pincode frame, kept in its dataset cache entry"""
+    path, reader, variant = _pincode_source()
+    return DATASETS.derived(path, reader, _build_pincode_indexes, variant=variant)
+
+def get_pincode_hierarchy():
+    """State -> district -> pincode -> offices index over the pincode directory"""
+    return _pincode_indexes()['hierarchy']
+
+def get_pincode_pager():
+    """Grouped pagination engine for the /pincodes cards"""
+    return _pincode_indexes()['pager']
+
+def _etag_json(payload, etag, max_age=3600):
+    """JSON response with a strong ETag, answered with 304 when it matches"""
+    response = jsonify(payload)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = f'private, max-age={max_age}'
+    return response.make_conditional(request)
+
+@app.route('/api/dataset-cache-stats')
+@login_required
+def api_dataset_cache_stats():
+    """Hit/miss counters and memory use of the dataset cache"""
+    return jsonify(DATASETS.stats())
 
 @app.route('/bai-members')
 
 def bai_members():
     """Display BAI members data"""
     try:
-        conn = sqlite3.connect('users.db')
+        conn = USERS_DB.connect()
         cursor = conn.cursor()
         
         # Get pagination parameters
@@ -2207,31 +1964,19 @@ def bai_members():
         per_page = int(request.args.get('per_page', 50))
         search_query = request.args.get('search', '').strip()
         
-        # Build query
-        query = "SELECT * FROM bai_members WHERE 1=1"
-        params = []
+        offset = (page - 1) * per_page
         
         if search_query:
-            query += " AND (company_name LIKE ? OR contact_person LIKE ? OR address LIKE ?)"
-            search_param = f"%{search_query}%"
-            params.extend([search_param, search_param, search_param])
-        
-        # Get total count
-        count_query = f"SELECT COUNT(*) FROM ({query})"
-        cursor.execute(count_query, params)
-        total_records = cursor.fetchone()[0]
+            # Ranked ids from the FTS5 store, then fetch only the current page
+            member_ids = SEARCH_STORE.match_refs('bai_members', search_query)
+            total_records = len(member_ids)
+            bai_data = _fetch_rows_by_id(cursor, 'bai_members', member_ids[offset:offset + per_page])
+        else:
+            total_records = BAI_PAGER.count(conn)
+            bai_data = BAI_PAGER.page(conn, '*', page, per_page)
         
         # Calculate pagination
         total_pages = (total_records + per_page - 1) // per_page
-        offset = (page - 1) * per_page
-        
-        # Get paginated data
-        query += " ORDER BY company_name LIMIT ? OFFSET ?"
-        params.extend([per_page, offset])
-        
-        cursor.execute(query, params)
-        columns = [description[0] for description in cursor.description]
-        bai_data = [dict(zip(columns, row)) for row in cursor.fetchall()]
         
         conn.close()
         
@@ -2259,9 +2004,6 @@ def bai_members():
 def download_bai_csv():
     """Download BAI members as CSV"""
     try:
-        conn = sqlite3.connect('users.db')
-        cursor = conn.cursor()
-        
         # Get filter parameters
         search_query = request.args.get('search', '')
         
@@ -2276,37 +2018,10 @@ def download_bai_csv():
         
         query += " ORDER BY company_name"
         
-        cursor.execute(query, params)
-        columns = [description[0] for description in cursor.description]
-        bai_data = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        
-        conn.close()
-        
-        # Create CSV response
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow(['Company Name', 'Contact Person', 'Address', 'Phone', 'Email', 'Source URL', 'Scraped At'])
-        
-        # Write data
-        for member in bai_data:
-            writer.writerow([
-                member.get('company_name', ''),
-                member.get('contact_person', ''),
-                member.get('address', ''),
-                member.get('phone', ''),
-                member.get('email', ''),
-                member.get('source_url', ''),
-                member.get('scraped_at', '')
-            ])
-        
-        output.seek(0)
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = f'attachment; filename=bai_members_{search_query or "all"}.csv'
-        
-        return response
+        return EXPORTS.send('bai_members', 'csv', users_table_version('bai_members'),
+                            ['Company Name', 'Contact Person', 'Address', 'Phone', 'Email', 'Source URL', 'Scraped At'],
+                            lambda: query_rows('users.db', query, params), f'bai_members_{search_query or "all"}.csv',
+                            params={'search': search_query})
     except Exception as e:
         flash(f'Error generating CSV: {str(e)}', 'error')
         return redirect(url_for('bai_members'))
@@ -2315,14 +2030,9 @@ def download_bai_csv():
 
 # Pollachi Wards functionality
 def load_pollachi_wards_data():
-    """Load Pollachi wards data from JSON file"""
+    """Load Pollachi wards data from the warehouse"""
     try:
-        if os.path.exists('pollachi_wards.json'):
-            with open('pollachi_wards.json', 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data.get('wards', [])
-        else:
-            return []
+        return WAREHOUSE.rows('pollachi_wards')
     except Exception as e:
         print(f"Error loading Pollachi wards data: {str(e)}")
         return []
@@ -2378,44 +2088,30 @@ def pollachi_wards():
 def download_pollachi_wards_csv():
     """Download Pollachi wards data as CSV"""
     try:
-        wards_data = load_pollachi_wards_data()
-        
         # Get search query for filename
         search_query = request.args.get('search', '')
         
-        # Create CSV content
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow([
+        def rows():
+            for ward in load_pollachi_wards_data():
+                landmarks = '; '.join(ward.get('general_landmarks', [])) if ward.get('general_landmarks') else ''
+                roads = '; '.join(ward.get('general_roads', [])) if ward.get('general_roads') else ''
+                boundaries = '; '.join(ward.get('boundaries', [])) if ward.get('boundaries') else ''
+                
+                yield [
+                    ward.get('ward_number', ''),
+                    ward.get('ward_name', ''),
+                    ward.get('description', ''),
+                    landmarks,
+                    roads,
+                    boundaries,
+                    ward.get('population', ''),
+                    ward.get('area', '')
+                ]
+        
+        return EXPORTS.send('pollachi_wards', 'csv', WAREHOUSE.signature('pollachi_wards'), [
             'Ward Number', 'Ward Name', 'Description', 'Landmarks', 
             'Roads', 'Boundaries', 'Population', 'Area'
-        ])
-        
-        # Write data
-        for ward in wards_data:
-            landmarks = '; '.join(ward.get('general_landmarks', [])) if ward.get('general_landmarks') else ''
-            roads = '; '.join(ward.get('general_roads', [])) if ward.get('general_roads') else ''
-            boundaries = '; '.join(ward.get('boundaries', [])) if ward.get('boundaries') else ''
-            
-            writer.writerow([
-                ward.get('ward_number', ''),
-                ward.get('ward_name', ''),
-                ward.get('description', ''),
-                landmarks,
-                roads,
-                boundaries,
-                ward.get('population', ''),
-                ward.get('area', '')
-            ])
-        
-        output.seek(0)
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = f'attachment; filename=pollachi_wards_{search_query or "all"}.csv'
-        
-        return response
+        ], rows, f'pollachi_wards_{search_query or "all"}.csv')
     except Exception as e:
         flash(f'Error generating CSV: {str(e)}', 'error')
         return redirect(url_for('pollachi_wards'))
@@ -2426,53 +2122,18 @@ def download_pollachi_wards_csv():
 def pincodes():
     """Display pincodes with filters for state and district"""
     try:
-        # Data is automatically cached by the scraper
-        df = PD_CACHE_read('pincodes.csv', usecols=['officename','pincode','officetype','delivery','district','statename'])
-        df.columns = [c.strip().lower() for c in df.columns]
+        hierarchy = get_pincode_hierarchy()
         state = request.args.get('state', '').strip()
         district = request.args.get('district', '').strip()
         search = request.args.get('search', '').strip()
-        states = sorted(df['statename'].dropna().unique().tolist()) if 'statename' in df.columns else []
-        if state:
-            df = df[df['statename'].astype(str).str.contains(state, case=False, na=False)]
-        districts = sorted(df['district'].dropna().unique().tolist()) if 'district' in df.columns else []
-        if district:
-            df = df[df['district'].astype(str).str.contains(district, case=False, na=False)]
-        if search:
-            mask = (
-                df['officename'].astype(str).str.contains(search, case=False, na=False) |
-                df['pincode'].astype(str).str.contains(search, case=False, na=False)
-            )
-            df = df[mask]
+        states = hierarchy.states
+        districts, _ = hierarchy.districts(state)
         page = int(request.args.get('page', 1))
         per_page = int(request.args.get('per_page', 50))
         
-        # Efficient grouping: compute one row per pincode with count, then paginate,
-        # then collect 'others' only for pins on the current page
-        df['pincode'] = df['pincode'].astype(str)
-        df_sorted = df.sort_values('pincode', kind='mergesort')
-        df_sorted['count'] = df_sorted.groupby('pincode')['pincode'].transform('size')
-        uniq = df_sorted.drop_duplicates('pincode', keep='first')
-
-        total_records = len(uniq)
+        # One card per pincode: a slice of the cached group table for this filter
+        page_groups, total_records = get_pincode_pager().page(state, district, search, page, per_page)
         total_pages = (total_records + per_page - 1) // per_page
-        start = (page - 1) * per_page
-        page_rows = uniq.iloc[start:start+per_page]
-        page_pins = page_rows['pincode'].tolist()
-
-        subset = df_sorted[df_sorted['pincode'].isin(page_pins)]
-        others_map = {pin: grp.iloc[1:].to_dict('records') for pin, grp in subset.groupby('pincode')}
-
-        page_groups = []
-        for _, r in page_rows.iterrows():
-            pin = r['pincode']
-            main = {k: r[k] for k in ['officename','pincode','officetype','delivery','district','statename'] if k in r}
-            page_groups.append({
-                'pincode': pin,
-                'main': main,
-                'count': int(r['count']) if 'count' in r else 1,
-                'others': others_map.get(pin, [])
-            })
 
         return render_template(
 
@@ -2497,21 +2158,8 @@ def pincodes():
 def pincode_offices(pincode):
     """Mobile-friendly page to show all offices for a specific pincode"""
     try:
-        # Get all offices for this pincode from CSV
-        df = PD_CACHE_read('pincodes.csv', usecols=['officename','pincode','officetype','delivery','district','statename'])
-        df.columns = [c.strip().lower() for c in df.columns]
-        
-        # Filter for the specific pincode
-        offices_df = df[df['pincode'].astype(str) == str(pincode)]
-        
-        if offices_df.empty:
-            return render_template('pincode_offices.html',
-                                 pincode=pincode,
-                                 offices=[],
-                                 username=session.get('username'))
-        
-        # Convert to list of dictionaries
-        offices = offices_df.to_dict('records')
+        # Get all offices for this pincode from the hierarchy index
+        offices = get_pincode_hierarchy().offices(pincode)
         
         return render_template('pincode_offices.html',
                              pincode=pincode,
@@ -2618,7 +2266,50 @@ def _fetch_pin_polygon_server(pin: str):
 
 
 # Suppliers routes
+
+# Selenium scrapes run on background workers, never in the request thread
+SUPPLIER_JOBS = JobQueue('users.db', workers=2)
+
+def run_suppliers_job(params, progress):
+    """Background job: scrape (or refresh) suppliers for one pincode"""
+    scraper = EnhancedSuppliersScraper()
+    suppliers_data = scraper.scrape_by_pincode(
+        params['pincode'], force_refresh=params.get('force_refresh', False),
+        category=params.get('category'), state=params.get('state'), district=params.get('district'),
+        progress=progress
+    )
+    return {'pincode': params['pincode'], 'count': len(suppliers_data)}
+
+SUPPLIER_JOBS.register('suppliers', run_suppliers_job)
+
+@app.before_request
+def start_supplier_jobs():
+    # Workers, and the requeue of jobs a restart left running, start with the
+    # web app rather than with the first submit (scripts importing app skip it)
+    SUPPLIER_JOBS.start()
+
+def submit_suppliers_job(pincode, state='', district='', category='', force_refresh=False):
+    """Queue a suppliers scrape; returns (job_id, created)"""
+    return SUPPLIER_JOBS.submit('suppliers', {
+        'pincode': pincode,
+        'state': state,
+        'district': district,
+        'category': category,
+        'force_refresh': force_refresh
+    })
+
+def finished_suppliers_job(job_id, pincode, category=''):
+    """The finished (done/failed) suppliers job ``job_id`` for this pincode, or None"""
+    job = SUPPLIER_JOBS.get(job_id) if job_id else None
+    if job is None or job['status'] not in ('done', 'failed'):
+        return None
+    params = job['params']
+    if params.get('pincode') != pincode or (params.get('category') or '') != category:
+        return None
+    return job
+
 @app.route('/suppliers')
+@login_required
 def suppliers():
     """Display suppliers with filters for state, district, pincode, and category"""
     try:
@@ -2632,31 +2323,49 @@ def suppliers():
         per_page = int(request.args.get("per_page", 100))  # Increased per_page to show more results
         
         # Load pincodes data for state/district selection
-        df_pincodes = PD_CACHE_read("pincodes.csv", usecols=["officename","pincode","officetype","delivery","district","statename"])
-        df_pincodes.columns = [c.strip().lower() for c in df_pincodes.columns]
+        hierarchy = get_pincode_hierarchy()
         
         # Get available states and districts
-        states = sorted(df_pincodes["statename"].dropna().unique().tolist()) if "statename" in df_pincodes.columns else []
+        states = hierarchy.states
         districts = []
         pincodes = []
         
         if state:
-            df_pincodes = df_pincodes[df_pincodes["statename"].astype(str).str.contains(state, case=False, na=False)]
-            districts = sorted(df_pincodes["district"].dropna().unique().tolist())
+            districts, _ = hierarchy.districts(state)
         
         if district:
-            df_pincodes = df_pincodes[df_pincodes["district"].astype(str).str.contains(district, case=False, na=False)]
-            pincodes = sorted(df_pincodes["pincode"].dropna().unique().tolist())
+            pincodes, _ = hierarchy.pincodes(state, district)
         
-        # Load suppliers data if pincode is selected - NO CACHING
+        # Load suppliers data if pincode is selected (cached, refreshed in the background when stale)
         suppliers_data = []
         total_records = 0
         total_pages = 1
+        cache_status = None
+        job_id = request.args.get("job", "").strip()
+        job_notice = ""
         
         if pincode:
-            # Always scrape fresh data
             scraper = EnhancedSuppliersScraper()
-            suppliers_data = scraper.scrape_by_pincode(pincode, category=category, state=state, district=district)
+            suppliers_data = scraper.cached_suppliers(pincode, category=category, state=state, district=district)
+            finished_job = finished_suppliers_job(job_id, pincode, category)
+            if finished_job is not None:
+                # The page reloaded after its job ended: don't poll it again
+                job_id = ""
+            if suppliers_data is None and finished_job is not None:
+                # Empty results are not cached, so don't queue the same scrape again in a loop
+                if finished_job['status'] == 'failed':
+                    job_notice = f"Scraping suppliers for pincode {pincode} failed: {finished_job.get('error') or 'unknown error'}"
+                else:
+                    job_notice = f"No suppliers found for pincode {pincode}"
+                suppliers_data = []
+            elif suppliers_data is None:
+                # Not scraped yet: queue it and let the page poll the job
+                job_id, _ = submit_suppliers_job(pincode, state, district, category)
+                suppliers_data = []
+            else:
+                # Served from the cache; refreshed in the background when stale
+                suppliers_data = scraper.scrape_by_pincode(pincode, category=category, state=state, district=district)
+            cache_status = scraper.get_cache_status(pincode)
             scraper.close()
             
             if suppliers_data:
@@ -2691,47 +2400,53 @@ def suppliers():
             current_district=district,
             current_pincode=pincode,
             current_category=category,
-            cache_status=None  # No caching
+            cache_status=cache_status,
+            job_id=job_id,
+            job_notice=job_notice
         )
     except Exception as e:
         flash(f"Error loading suppliers: {str(e)}", "error")
         return render_template("suppliers.html", suppliers=[], username=session.get("username"), current_page=1, total_pages=1, total_records=0, per_page=100, search_query="", states=[], districts=[], pincodes=[], categories=[], current_state="", current_district="", current_pincode="", current_category="", cache_status=None)
 @app.route('/scrape-suppliers/<pincode>')
+@login_required
 def scrape_suppliers_by_pincode(pincode):
-    """Scrape suppliers data for a specific pincode"""
+    """Queue a suppliers scrape for a specific pincode"""
+    job_id = ""
     try:
-        from enhanced_suppliers_scraper import EnhancedSuppliersScraper
         state = request.args.get("state", "").strip()
         district = request.args.get("district", "").strip()
         category = request.args.get("category", "").strip()
         
-        scraper = EnhancedSuppliersScraper()
-        suppliers_data = scraper.scrape_by_pincode(pincode, force_refresh=True, category=category, state=state, district=district)
-        scraper.close()
-        
-        flash(f"Successfully scraped {len(suppliers_data)} suppliers for pincode {pincode}!", "success")
+        job_id, created = submit_suppliers_job(pincode, state, district, category, force_refresh=True)
+        if created:
+            flash(f"Scraping suppliers for pincode {pincode} in the background", "success")
+        else:
+            flash(f"Suppliers for pincode {pincode} are already being scraped", "info")
     except Exception as e:
         flash(f"Error scraping suppliers for pincode {pincode}: {str(e)}", "error")
     
-    return redirect(url_for("suppliers", pincode=pincode, state=request.args.get("state", ""), district=request.args.get("district", "")))
+    return redirect(url_for("suppliers", pincode=pincode, state=request.args.get("state", ""), district=request.args.get("district", ""), category=request.args.get("category", ""), job=job_id))
 
 @app.route("/suppliers/refresh/<pincode>")
+@login_required
 def refresh_suppliers_by_pincode(pincode):
-    """Refresh suppliers data for a specific pincode"""
+    """Queue a refresh of the suppliers data for a specific pincode"""
+    job_id = ""
     try:
-        from enhanced_suppliers_scraper import EnhancedSuppliersScraper
         state = request.args.get("state", "").strip()
         district = request.args.get("district", "").strip()
         category = request.args.get("category", "").strip()
 
-        scraper = EnhancedSuppliersScraper()
-        suppliers_data = scraper.scrape_by_pincode(pincode, force_refresh=True, category=category, state=state, district=district)
-        scraper.close()
-        
-        flash(f"Successfully refreshed {len(suppliers_data)} suppliers for pincode {pincode}!", "success")
+        job_id, created = submit_suppliers_job(pincode, state, district, category, force_refresh=True)
+        if created:
+            flash(f"Refreshing suppliers for pincode {pincode} in the background", "success")
+        else:
+            flash(f"Suppliers for pincode {pincode} are already being refreshed", "info")
     except Exception as e:
         flash(f"Error refreshing suppliers for pincode {pincode}: {str(e)}", "error")
     
+    return redirect(url_for("suppliers", pincode=pincode, state=request.args.get("state", ""), district=request.args.get("district", ""), category=request.args.get("category", ""), job=job_id))
+
 @app.route("/suppliers/download/<pincode>")
 @login_required
 def download_suppliers_csv(pincode):
@@ -2742,35 +2457,25 @@ def download_suppliers_csv(pincode):
         district = request.args.get("district", "").strip()
         
         scraper = EnhancedSuppliersScraper()
-        suppliers_data = scraper.scrape_by_pincode(pincode, category=category, state=state, district=district)
+        suppliers_data = scraper.cached_suppliers(pincode, category=category, state=state, district=district)
         scraper.close()
         
+        if suppliers_data is None:
+            # Nothing scraped yet: queue it instead of scraping in the request
+            job_id, _ = submit_suppliers_job(pincode, state, district, category)
+            flash(f"Suppliers for pincode {pincode} are being scraped; download again when the job finishes", "info")
+            return redirect(url_for("suppliers", pincode=pincode, state=state, district=district, category=category, job=job_id))
+        
         if suppliers_data:
-            # Create CSV in memory
-            import io
-            output = io.StringIO()
-            import csv as csv_module
-            
-            # Write CSV header
             fieldnames = ["name", "address", "phone", "email", "website", "rating", "reviews_count", "category", "pincode", "keyword", "latitude", "longitude", "source"]
-            writer = csv_module.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
             
-            # Write data
-            for supplier in suppliers_data:
-                writer.writerow(supplier)
-            
-            # Prepare response
-            output.seek(0)
             filename = f"suppliers_{pincode}"
             if category:
                 filename += f"_{category.replace(' ', '_')}"
             filename += ".csv"
             
-            response = make_response(output.getvalue())
-            response.headers["Content-Disposition"] = f"attachment; filename={filename}"
-            response.headers["Content-Type"] = "text/csv"
-            return response
+            rows = ([supplier.get(field, "") for field in fieldnames] for supplier in suppliers_data)
+            return csv_response(filename, fieldnames, rows)
         else:
             flash(f"No data found for pincode {pincode}", "error")
             return redirect(url_for("suppliers", pincode=pincode))
@@ -2785,15 +2490,8 @@ def download_suppliers_csv(pincode):
 def api_suppliers_districts(state):
     """Get districts for a given state from pincodes data"""
     try:
-        # Data is automatically cached by the scraper
-        df = PD_CACHE_read("pincodes.csv", usecols=["district", "statename"])
-        df.columns = [c.strip().lower() for c in df.columns]
-        
-        # Filter by state
-        df = df[df["statename"].astype(str).str.contains(state, case=False, na=False)]
-        districts = sorted(df["district"].dropna().unique().tolist())
-        
-        return jsonify({"districts": districts})
+        districts, etag = get_pincode_hierarchy().districts(state)
+        return _etag_json({"districts": districts}, etag)
     except Exception as e:
         return jsonify({"error": str(e), "districts": []}), 500
 
@@ -2803,16 +2501,8 @@ def api_suppliers_districts(state):
 def api_suppliers_pincodes(state, district):
     """Get pincodes for a given state and district from pincodes data"""
     try:
-        # Data is automatically cached by the scraper
-        df = PD_CACHE_read("pincodes.csv", usecols=["pincode", "district", "statename"])
-        df.columns = [c.strip().lower() for c in df.columns]
-        
-        # Filter by state and district
-        df = df[df["statename"].astype(str).str.contains(state, case=False, na=False)]
-        df = df[df["district"].astype(str).str.contains(district, case=False, na=False)]
-        pincodes = sorted(df["pincode"].dropna().unique().tolist())
-        
-        return jsonify({"pincodes": pincodes})
+        pincodes, etag = get_pincode_hierarchy().pincodes(state, district)
+        return _etag_json({"pincodes": pincodes}, etag)
     except Exception as e:
         return jsonify({"error": str(e), "pincodes": []}), 500
 
@@ -2830,6 +2520,15 @@ def clear_suppliers_cache(pincode):
     
     return redirect(url_for("suppliers", pincode=pincode, state=request.args.get("state", ""), district=request.args.get("district", "")))
 
+@app.route("/api/jobs/<job_id>")
+@login_required
+def api_job_status(job_id):
+    """Status and progress of a background job"""
+    job = SUPPLIER_JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
+
 @app.route("/api/suppliers/cache-status/<pincode>")
 
 @login_required
@@ -2844,6 +2543,11 @@ def api_suppliers_cache_status(pincode):
         return jsonify({"error": str(e)}), 500
 
 
+# Sync the FTS5 store at startup; the in-memory index (~165k pincode rows)
+# is built in the background so importing the app stays fast
+SEARCH_INDEX.refresh_in_background()
+SEARCH_STORE.sync()
+
 if __name__ == "__main__":
     init_db()
     app.run(debug=True, host="0.0.0.0", port=5000)
@@ -0,0 +1,240 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Fields that change on every scrape without the data changing
+VOLATILE_FIELDS = ('scraped_at', 'created_at', 'updated_at')
+
+
+def _strip(value, ignore):
+    if isinstance(value, dict):
+        return {k: _strip(v, ignore) for k, v in value.items() if k not in ignore}
+    if isinstance(value, list):
+        return [_strip(v, ignore) for v in value]
+    return value
+
+
+def content_hash(value, ignore=VOLATILE_FIELDS):
+    """sha1 of raw page content, or of a record/dataset minus its volatile fields"""
+    if isinstance(value, str):
+        value = value.encode('utf-8')
+    if not isinstance(value, bytes):
+        value = json.dumps(_strip(value, set(ignore)), sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.sha1(value).hexdigest()
+
+
+def _write_atomic(path, text):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def write_json_if_changed(path, data, ignore=VOLATILE_FIELDS):
+    """Write ``data`` as JSON unless the file already holds the same data.
+
+    Volatile fields (scrape timestamps) are ignored in the comparison, so
+    an unchanged re-scrape leaves the file and its mtime alone. Returns
+    True when the file was written.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if content_hash(json.load(f), ignore) == content_hash(data, ignore):
+                return False
+    except (OSError, ValueError):
+        pass
+    _write_atomic(path, json.dumps(data, indent=2, ensure_ascii=False))
+    return True
+
+
+def write_text_if_changed(path, text):
+    """Write ``text`` unless the file already has exactly this content"""
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    _write_atomic(path, text)
+    return True
+
+
+def _key_function(key):
+    if callable(key):
+        return key
+    if isinstance(key, str):
+        return lambda record: str(record.get(key, ''))
+    return lambda record: '|'.join(str(record.get(field, '')) for field in key)
+
+
+class ScrapeRun:
+    """Page and record hashes of one scrape of a source.
+
+    Use ``cached_page`` before parsing a page: when the page content is
+    unchanged since the last committed run, the records parsed from it
+    then are returned and parsing can be skipped. ``store_page`` records
+    a freshly parsed page. ``diff`` compares the full record list with the
+    previous run and ``commit`` makes this run the new baseline; call it
+    only once the changes have been applied.
+    """
+
+    def __init__(self, tracker, source, pages, records):
+        self.tracker = tracker
+        self.source = source
+        self._old_pages = pages
+        self._old_records = records
+        self._pages = {}
+        self._records = None
+        self._lock = threading.Lock()
+        self.pages_skipped = 0
+
+    def cached_page(self, page_key, content):
+        """Records of an unchanged page, or None when it must be parsed"""
+        page_key = str(page_key)
+        digest = content_hash(content)
+        old = self._old_pages.get(page_key)
+        if old is None or old[0] != digest:
+            return None
+        with self._lock:
+            self._pages[page_key] = old
+            self.pages_skipped += 1
+        return json.loads(old[1])
+
+    def store_page(self, page_key, content, records):
+        with self._lock:
+            self._pages[str(page_key)] = (content_hash(content), json.dumps(records, ensure_ascii=False, default=str))
+
+    def diff(self, records, key):
+        """Changes since the last committed run.
+
+        Args:
+            records (list): Every record of this run.
+            key (str, tuple or callable): Field(s) identifying a record.
+
+        Returns:
+            dict: 'added' and 'updated' records, 'removed' keys, the
+            'unchanged' count and 'baseline' (False on the first run of a
+            source, when every record is 'added').
+        """
+        key_of = _key_function(key)
+        current = {}
+        added, updated = [], []
+        for record in records:
+            record_key = key_of(record)
+            if record_key in current:
+                continue
+            digest = content_hash(record)
+            current[record_key] = digest
+            old = self._old_records.get(record_key)
+            if old is None:
+                added.append(record)
+            elif old != digest:
+                updated.append(record)
+        self._records = current
+        removed = [k for k in self._old_records if k not in current]
+        return {
+            'source': self.source,
+            'added': added,
+            'updated': updated,
+            'removed': removed,
+            'unchanged': len(current) - len(added) - len(updated),
+            'pages_skipped': self.pages_skipped,
+            'baseline': bool(self._old_records)
+        }
+
+    def commit(self):
+        self.tracker._save(self)
+
+
+class ChangeTracker:
+    """Remembers what each scrape source looked like last time, in SQLite.
+
+    Page hashes let a re-scrape skip parsing pages that did not change;
+    record hashes turn a full scrape into added/updated/removed deltas so
+    loaders only write what changed.
+    """
+
+    def __init__(self, db_path='users.db'):
+        self.db_path = db_path
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS scrape_pages (
+                    source TEXT NOT NULL,
+                    page_key TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    records TEXT,
+                    updated_at REAL,
+                    PRIMARY KEY (source, page_key)
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS scrape_records (
+                    source TEXT NOT NULL,
+                    record_key TEXT NOT NULL,
+                    record_hash TEXT NOT NULL,
+                    updated_at REAL,
+                    PRIMARY KEY (source, record_key)
+                )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def start(self, source):
+        """Begin a run, loading the hashes of the last committed one"""
+        conn = self._connect()
+        try:
+            pages = {row[0]: (row[1], row[2]) for row in conn.execute(
+                'SELECT page_key, content_hash, records FROM scrape_pages WHERE source = ?', (source,))}
+            records = dict(conn.execute(
+                'SELECT record_key, record_hash FROM scrape_records WHERE source = ?', (source,)))
+        finally:
+            conn.close()
+        return ScrapeRun(self, source, pages, records)
+
+    def _save(self, run):
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                if run._pages:
+                    conn.execute('DELETE FROM scrape_pages WHERE source = ?', (run.source,))
+                    conn.executemany('''
+                        INSERT INTO scrape_pages (source, page_key, content_hash, records, updated_at)
+                        VALUES (?, ?, ?, ?, ?)
+                    ''', [(run.source, page_key, digest, records, now)
+                          for page_key, (digest, records) in run._pages.items()])
+                if run._records is not None:
+                    conn.execute('DELETE FROM scrape_records WHERE source = ?', (run.source,))
+                    conn.executemany('''
+                        INSERT INTO scrape_records (source, record_key, record_hash, updated_at)
+                        VALUES (?, ?, ?, ?)
+                    ''', [(run.source, record_key, digest, now) for record_key, digest in run._records.items()])
+        finally:
+            conn.close()
+
+    def forget(self, source):
+        """Drop the baseline of a source so the next run reparses everything"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('DELETE FROM scrape_pages WHERE source = ?', (source,))
+                conn.execute('DELETE FROM scrape_records WHERE source = ?', (source,))
+        finally:
+            conn.close()
+
+
+def summarize(delta):
+    return (f"{delta['source']}: {len(delta['added'])} added, {len(delta['updated'])} updated, "
+            f"{len(delta['removed'])} removed, {delta['unchanged']} unchanged "
+            f"({delta['pages_skipped']} pages skipped)")
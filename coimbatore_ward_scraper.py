@@ -1,4 +1,5 @@
 import requests
+import http_fetch
 from bs4 import BeautifulSoup
 import json
 import re
@@ -15,7 +16,7 @@ def scrape_coimbatore_wards():
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         
-        response = requests.get(url, headers=headers, timeout=30)
+        response = http_fetch.get(url, headers=headers, timeout=30)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.content, 'html.parser')
@@ -2,28 +2,40 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import csv
+import io
 import pandas as pd
 from datetime import datetime
 import time
+import http_fetch
+from change_tracker import ChangeTracker, summarize, write_json_if_changed, write_text_if_changed
 
 class CREDAIScraper:
     def __init__(self):
-        self.session = requests.Session()
+        self.session = http_fetch.session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         self.base_url = "https://www.credaicoimbatore.com"
         self.members_url = "https://www.credaicoimbatore.com/about/members-of-credai"
         
-    def scrape_members(self):
-        """Scrape CREDAI Coimbatore members"""
+    def scrape_members(self, changes=None):
+        """Scrape CREDAI Coimbatore members
+        
+        With a change_tracker run, an unchanged members page is not reparsed.
+        """
         print("🔍 Starting CREDAI Coimbatore members scraping...")
         
         try:
             response = self.session.get(self.members_url, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            if changes is not None:
+                cached = changes.cached_page('members', response.content)
+                if cached is not None:
+                    print(f"✅ Members page unchanged ({len(cached)} members)")
+                    return cached
+            
+            soup = BeautifulSoup(response.content, http_fetch.HTML_PARSER)
             
             # Find all member entries
             members = []
@@ -70,6 +82,8 @@ class CREDAIScraper:
                         members.append(member)
             
             print(f"✅ Found {len(members)} CREDAI members")
+            if changes is not None and members:
+                changes.store_page('members', response.content, members)
             return members
             
         except Exception as e:
@@ -88,10 +102,10 @@ class CREDAIScraper:
                 }
             }
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
-            
-            print(f"✅ Data saved to {filename}")
+            if write_json_if_changed(filename, output_data):
+                print(f"✅ Data saved to {filename}")
+            else:
+                print(f"✅ {filename} is up to date")
             return True
         except Exception as e:
             print(f"❌ Error saving to JSON: {str(e)}")
@@ -100,20 +114,23 @@ class CREDAIScraper:
     def save_to_csv(self, data, filename="credai_members.csv"):
         """Save data to CSV file"""
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['S.No', 'Name', 'Type', 'Source URL', 'Scraped At'])
-                
-                for i, member in enumerate(data, 1):
-                    writer.writerow([
-                        i,
-                        member.get('name', ''),
-                        member.get('type', ''),
-                        member.get('source_url', ''),
-                        member.get('scraped_at', '')
-                    ])
+            output = io.StringIO()
+            writer = csv.writer(output)
+            writer.writerow(['S.No', 'Name', 'Type', 'Source URL', 'Scraped At'])
             
-            print(f"✅ Data saved to {filename}")
+            for i, member in enumerate(data, 1):
+                writer.writerow([
+                    i,
+                    member.get('name', ''),
+                    member.get('type', ''),
+                    member.get('source_url', ''),
+                    member.get('scraped_at', '')
+                ])
+            
+            if write_text_if_changed(filename, output.getvalue()):
+                print(f"✅ Data saved to {filename}")
+            else:
+                print(f"✅ {filename} is up to date")
             return True
         except Exception as e:
             print(f"❌ Error saving to CSV: {str(e)}")
@@ -121,14 +138,17 @@ class CREDAIScraper:
 
 def main():
     scraper = CREDAIScraper()
+    changes = ChangeTracker('users.db').start('credai_members')
     
     # Scrape members
-    members = scraper.scrape_members()
+    members = scraper.scrape_members(changes)
     
     if members:
+        print(summarize(changes.diff(members, key='name')))
+        
         # Save to files
-        scraper.save_to_json(members)
-        scraper.save_to_csv(members)
+        if scraper.save_to_json(members) and scraper.save_to_csv(members):
+            changes.commit()
         
         print(f"\n🎉 Successfully scraped {len(members)} CREDAI members!")
         print("📁 Files created:")
@@ -0,0 +1,145 @@
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def _estimate_bytes(value, file_size):
+    """Rough in-memory size of a cached value"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    # Parsed JSON / lists of dicts take several times their size on disk
+    return max(file_size * 4, sys.getsizeof(value))
+
+
+def normalize_columns(df):
+    """Strip and lowercase the column names of a freshly read frame"""
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    return df
+
+
+class DatasetCache:
+    """Keyed cache for the JSON/CSV files the app reads.
+
+    Entries are keyed on (path, variant), so the same file read with
+    different columns or transforms is cached separately. An entry is
+    dropped as soon as the file's mtime or size changes. The cache is
+    bounded by ``max_bytes`` and evicts the least recently used entries.
+
+    Cached values are shared between requests and must not be mutated.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes derived() builds, so an index is built once per value
+        self._build_lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _evict(self, key):
+        entry = self._entries.pop(key, None)
+        if entry:
+            self.total_bytes -= entry['bytes']
+
+    def get(self, path, reader, variant=None):
+        """Return ``reader(path)``, cached until the file changes.
+
+        Args:
+            path (str): Source file.
+            reader (callable): Parses the file, called on a miss.
+            variant (hashable, optional): Distinguishes different reads of one file.
+        """
+        key = (os.path.abspath(path), variant)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry['stamp'] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry['value']
+            self.misses += 1
+
+        value = reader(path)
+        size = _estimate_bytes(value, st.st_size)
+
+        with self._lock:
+            self._evict(key)
+            if size <= self.max_bytes:
+                self._entries[key] = {'stamp': stamp, 'value': value, 'bytes': size}
+                self.total_bytes += size
+                while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                    oldest = next(iter(self._entries))
+                    self._evict(oldest)
+                    self.evictions += 1
+        return value
+
+    def derived(self, path, reader, build, variant=None):
+        """Return ``build(value)`` for the cached ``reader(path)``, kept in the same entry.
+
+        The derived value (e.g. an index over a frame) is built once per
+        cached value and is dropped with the entry when the file changes
+        or the entry is evicted.
+        """
+        key = (os.path.abspath(path), variant)
+        with self._build_lock:
+            value = self.get(path, reader, variant=variant)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry['value'] is value and 'derived' in entry:
+                    return entry['derived']
+            derived = build(value)
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry['value'] is value:
+                    entry['derived'] = derived
+            return derived
+
+    def read_csv(self, path, usecols=None, transform=None, variant=None, **kwargs):
+        """Cached ``pd.read_csv`` with column names normalized to lowercase"""
+        columns = tuple(sorted(usecols)) if usecols else None
+
+        def reader(p):
+            df = normalize_columns(pd.read_csv(p, usecols=usecols, **kwargs))
+            return transform(df) if transform else df
+
+        return self.get(path, reader, variant=('csv', columns, variant, tuple(sorted(kwargs.items()))))
+
+    def read_json(self, path, transform=None, variant=None):
+        """Cached ``json.load`` with an optional transform of the parsed data"""
+        def reader(p):
+            with open(p, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return transform(data) if transform else data
+
+        return self.get(path, reader, variant=('json', variant))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """Hit/miss counters and the current footprint"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+                'keys': [f"{os.path.basename(path)}:{variant}" for path, variant in self._entries]
+            }
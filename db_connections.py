@@ -0,0 +1,128 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Defaults for the shared users.db connections; override through the environment
+BUSY_TIMEOUT = float(os.environ.get('SQLITE_BUSY_TIMEOUT', 30))
+CACHE_SIZE_KB = int(os.environ.get('SQLITE_CACHE_SIZE_KB', 16 * 1024))
+MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+CACHED_STATEMENTS = int(os.environ.get('SQLITE_CACHED_STATEMENTS', 256))
+
+
+class _Borrowed:
+    """A thread's shared connection as handed out by ``ConnectionManager.connect``.
+
+    Behaves like the ``sqlite3.Connection`` it wraps, except that
+    ``close()`` gives it back instead of closing it: an uncommitted
+    transaction is rolled back (as closing would have discarded it) once
+    the outermost borrower is done, and the row_factory is restored.
+    """
+
+    def __init__(self, manager, conn):
+        object.__setattr__(self, '_manager', manager)
+        object.__setattr__(self, '_conn', conn)
+        object.__setattr__(self, '_row_factory', conn.row_factory)
+        object.__setattr__(self, '_closed', False)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._conn.__exit__(*exc_info)
+
+    def close(self):
+        if self._closed:
+            return
+        object.__setattr__(self, '_closed', True)
+        self._conn.row_factory = self._row_factory
+        self._manager._release(self._conn)
+
+    def __del__(self):
+        # A borrower that raised before close() must not leave a transaction open
+        self.close()
+
+
+class ConnectionManager:
+    """Per-thread SQLite connections to one database, opened once and reused.
+
+    Every connection runs in WAL mode with ``synchronous=NORMAL``, so
+    readers (the web app) are not blocked by a writer (a bot or a scraper
+    in another process) and commits skip the per-transaction fsync of the
+    rollback journal. Page cache and mmap sizes are raised, prepared
+    statements are cached per connection, and lock waits go through a
+    busy timeout instead of failing with "database is locked".
+
+    ``connect()`` keeps the ``sqlite3.connect(...)`` / ``conn.close()``
+    shape of the existing helpers; ``transaction()`` takes the write lock
+    up front (BEGIN IMMEDIATE) for read-then-write sequences.
+    """
+
+    def __init__(self, db_path, busy_timeout=BUSY_TIMEOUT, cache_size_kb=CACHE_SIZE_KB, mmap_size=MMAP_SIZE,
+                 cached_statements=CACHED_STATEMENTS):
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+
+    def _open(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, cached_statements=self.cached_statements)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+        except sqlite3.OperationalError as e:
+            # Read-only directory or a network filesystem: stay in rollback mode
+            print(f"Could not enable WAL on {self.db_path}: {str(e)}")
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{int(self.cache_size_kb)}')
+        conn.execute(f'PRAGMA mmap_size={int(self.mmap_size)}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = self._open()
+            self._local.depth = 0
+        return conn
+
+    def connect(self):
+        """This thread's connection; ``close()`` it when done as with sqlite3.connect"""
+        conn = self._connection()
+        self._local.depth += 1
+        return _Borrowed(self, conn)
+
+    def _release(self, conn):
+        self._local.depth -= 1
+        if self._local.depth == 0 and conn.in_transaction:
+            conn.rollback()
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction holding the write lock from the start; commits on success"""
+        conn = self.connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+        finally:
+            conn.close()
+
+    def close(self):
+        """Close this thread's connection (e.g. when a worker thread exits)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            self._local.conn = None
+            conn.close()
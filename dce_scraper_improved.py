@@ -4,11 +4,12 @@ import sqlite3
 import time
 import re
 from urllib.parse import urljoin, urlparse
+import http_fetch
 
 class DCEScraperImproved:
     def __init__(self):
         self.base_url = "https://tndce.tn.gov.in"
-        self.session = requests.Session()
+        self.session = http_fetch.session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8',
@@ -35,7 +36,7 @@ class DCEScraperImproved:
     def parse_colleges_data(self, html_content):
         """Parse colleges data from HTML tables"""
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = BeautifulSoup(html_content, http_fetch.HTML_PARSER)
             colleges = []
             
             # Find all tables
@@ -208,15 +209,40 @@ class DCEScraperImproved:
             print(f"Error saving to database: {e}")
             return False
     
-    def get_all_colleges(self):
-        """Get all colleges from DCE website"""
+    def apply_changes(self, delta):
+        """Apply a change_tracker delta: upsert added/updated colleges, delete removed ones"""
+        if not self.save_to_database(delta['added'] + delta['updated']):
+            return False
+        if delta['removed']:
+            conn = sqlite3.connect('users.db')
+            try:
+                with conn:
+                    conn.executemany('DELETE FROM dce_colleges WHERE name = ? AND district = ?',
+                                     [tuple(key.rsplit('|', 1)) for key in delta['removed']])
+            finally:
+                conn.close()
+        return True
+    
+    def get_all_colleges(self, changes=None):
+        """Get all colleges from DCE website.
+        
+        With a change_tracker run, an unchanged page is not parsed again.
+        """
         print("Fetching colleges data from DCE website...")
         
         html_content = self.get_colleges_page()
         if not html_content:
             return []
         
+        if changes is not None:
+            cached = changes.cached_page('colleges', html_content)
+            if cached is not None:
+                print("Colleges page unchanged since the last refresh")
+                return cached
+        
         colleges = self.parse_colleges_data(html_content)
+        if changes is not None and colleges:
+            changes.store_page('colleges', html_content, colleges)
         return colleges
 
 # Test the improved scraper
@@ -1,51 +1,86 @@
+import os
 import time
 import pandas as pd
-from improved_selenium_scraper import ImprovedGoogleMapsScraper
+from improved_selenium_scraper import ImprovedGoogleMapsScraper, create_chrome_driver
+from supplier_cache import SupplierCache
+from supplier_dedup import dedupe_suppliers
+from webdriver_pool import WebDriverPool
+
+# Warm browsers shared by every request in the process
+DRIVER_POOL = WebDriverPool(
+    create_chrome_driver,
+    size=int(os.environ.get('SUPPLIERS_BROWSERS', 2)),
+    max_pages=int(os.environ.get('SUPPLIERS_BROWSER_MAX_PAGES', 50))
+)
+
+# Results are fresh for a day and served stale (while refreshing) for a week
+SUPPLIER_CACHE = SupplierCache(
+    cache_dir='suppliers_cache',
+    ttl=int(os.environ.get('SUPPLIERS_CACHE_TTL', 24 * 3600)),
+    max_stale=int(os.environ.get('SUPPLIERS_CACHE_MAX_STALE', 7 * 24 * 3600))
+)
 
 class EnhancedSuppliersScraper:
-    def __init__(self):
-        self.selenium_scraper = ImprovedGoogleMapsScraper()
-        
-    def scrape_by_pincode(self, pincode, force_refresh=False, category=None, state=None, district=None):
-        """Scrape suppliers for a specific pincode without caching"""
-        print(f"Scraping suppliers for pincode {pincode}")
+    def __init__(self, pool=None, cache=None):
+        # No browser is started here; one is borrowed from the pool per scrape
+        self.pool = pool or DRIVER_POOL
+        self.cache = cache or SUPPLIER_CACHE
         
-        # Determine location for search
+    def _location(self, state=None, district=None):
+        """Determine location for search"""
         if state and district:
-            location = f"{district}, {state}"
+            return f"{district}, {state}"
         elif state:
-            location = state
-        else:
-            location = "Coimbatore"  # Fallback to Coimbatore if no location provided
+            return state
+        return "Coimbatore"  # Fallback to Coimbatore if no location provided
+    
+    def cached_suppliers(self, pincode, category=None, state=None, district=None):
+        """Cached suppliers for a pincode without scraping, or None on a miss"""
+        cached = self.cache.get(self.cache.key(pincode, category, self._location(state, district)))
+        return cached[0] if cached else None
+    
+    def scrape_by_pincode(self, pincode, force_refresh=False, category=None, state=None, district=None, progress=None):
+        """Suppliers for a pincode, from the cache unless force_refresh is set.
+        
+        ``progress(fraction, message)`` is called as categories complete.
+        """
+        print(f"Scraping suppliers for pincode {pincode}")
         
+        location = self._location(state, district)
         print(f"Using location: {location}")
         
-        # Always scrape fresh data - no caching
+        key = self.cache.key(pincode, category, location)
+        return self.cache.get_or_fetch(key, lambda: self._scrape(pincode, location, category, progress), force=force_refresh)
+    
+    def _scrape(self, pincode, location, category=None, progress=None):
+        """Scrape fresh data on a pooled browser.
+        
+        Errors are raised, not turned into an empty list, so a background
+        job that crashed is recorded as failed rather than as 0 suppliers.
+        """
         print(f"Scraping fresh data for pincode {pincode}...")
-        try:
-            if category:
-                # Scrape only specific category
-                print(f"Scraping only {category} category...")
-                suppliers = self.selenium_scraper.scrape_category(pincode, location, category, self._get_category_keywords(category))
-            else:
-                # Scrape all categories
-                suppliers = self.selenium_scraper.scrape_all_categories(pincode, location)
+        categories = [category] if category else self.get_available_categories()
+        with self.pool.checkout() as lease:
+            selenium_scraper = ImprovedGoogleMapsScraper(driver=lease.driver)
+            searches = [(name, keyword) for name in categories for keyword in self._get_category_keywords(name)]
+            finished = []
             
-            # Remove duplicates based on name
-            unique_suppliers = []
-            seen = set()
-            for supplier in suppliers:
-                key = supplier['name']
-                if key not in seen:
-                    seen.add(key)
-                    unique_suppliers.append(supplier)
+            def on_results(name, keyword, businesses):
+                finished.append(keyword)
+                if progress:
+                    progress(len(finished) / len(searches), f"Scraped {keyword}")
             
-            print(f"Found {len(unique_suppliers)} unique suppliers for pincode {pincode}")
-            return unique_suppliers
-            
-        except Exception as e:
-            print(f"Error scraping suppliers for pincode {pincode}: {str(e)}")
-            return []
+            try:
+                # All keywords load in parallel tabs; results merge as they arrive
+                suppliers = selenium_scraper.scrape_keywords_concurrently(pincode, location, searches, on_results=on_results)
+            finally:
+                lease.pages += selenium_scraper.pages_loaded
+        
+        # Merge the same business found by several keywords
+        unique_suppliers = dedupe_suppliers(suppliers)
+        
+        print(f"Found {len(unique_suppliers)} unique suppliers for pincode {pincode}")
+        return unique_suppliers
     
     def _get_category_keywords(self, category):
         """Get keywords for a specific category"""
@@ -63,14 +98,13 @@ class EnhancedSuppliersScraper:
         return ["Building Materials", "RMC", "Paver Block", "Hollow Block", "Cement"]
     
     def get_cache_status(self, pincode):
-        """Return cache status - always returns no cache since we removed caching"""
-        return {
-            "exists": False,
-            "age_hours": None,
-            "count": 0
-        }
+        """Return cache status (newest entry first, plus every cached variant)"""
+        return self.cache.status(pincode)
+    
+    def clear_cache(self, pincode):
+        """Remove all cached results of a pincode"""
+        return self.cache.clear(pincode)
     
     def close(self):
-        """Close the selenium scraper"""
-        if self.selenium_scraper:
-            self.selenium_scraper.close()
+        """Nothing to close: browsers stay warm in the pool"""
+        pass
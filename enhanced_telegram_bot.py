@@ -30,6 +30,8 @@ from telegram.error import TelegramError
 import requests
 from bs4 import BeautifulSoup
 import time
+from warehouse import Warehouse
+from db_connections import ConnectionManager
 
 # Configure logging
 logging.basicConfig(
@@ -42,24 +44,40 @@ logger = logging.getLogger(__name__)
 BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', 'YOUR_BOT_TOKEN_HERE')
 DATABASE_PATH = os.getenv('DATABASE_PATH', 'users.db')
 DATA_DIR = os.getenv('DATA_DIRECTORY', '/Users/apple/Desktop/Data')
+WAREHOUSE_DB = os.getenv('WAREHOUSE_DB', os.path.join(DATA_DIR, 'warehouse.db'))
 ADMIN_USERS = os.getenv('ADMIN_USERS', '').split(',') if os.getenv('ADMIN_USERS') else []
 
+# Data sources served from the SQLite warehouse (see warehouse.py) instead of JSON files
+WAREHOUSE_SOURCES = {
+    "bai_members": "bai_directory",
+    "tcea_members": "tcea_members",
+    "credai_members": "credai_members",
+    "rera_agents": "rera_agents",
+    "ccmc_contractors": "ccmc_contractors",
+    "sr_offices": "sub_reg_offices",
+    "cbe_wards": "cbe_wards",
+    "pollachi_wards": "pollachi_wards"
+}
+
 # Conversation States
 MAIN_MENU, DATA_SOURCES, SEARCH, LOCATION, EXPORT, AUTH, ADMIN = range(7)
 
 class EnhancedDataExplorerBot:
     def __init__(self):
         self.db_path = DATABASE_PATH
+        # One WAL connection, so bot writes don't block the web app's reads
+        self.db = ConnectionManager(self.db_path)
         self.data_dir = DATA_DIR
         self.user_sessions = {}
         self.rate_limits = {}
+        self.warehouse = None
         self.init_database()
         self.load_config()
         
     def init_database(self):
         """Initialize database connection and tables"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.db.connect()
             cursor = conn.cursor()
             
             # Create all necessary tables
@@ -156,7 +174,7 @@ class EnhancedDataExplorerBot:
     def check_rate_limit(self, user_id: int, action_type: str) -> bool:
         """Check if user has exceeded rate limits"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.db.connect()
             cursor = conn.cursor()
             
             # Get current window start time
@@ -199,7 +217,7 @@ class EnhancedDataExplorerBot:
     def get_user_stats(self, user_id: int) -> Dict:
         """Get user statistics"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.db.connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -225,7 +243,7 @@ class EnhancedDataExplorerBot:
     def update_user_stats(self, user_id: int, search_count: int = 0, export_count: int = 0):
         """Update user statistics"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.db.connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -418,7 +436,7 @@ Choose an option below to get started:
     async def create_user(self, telegram_id: int, user):
         """Create or update user in database"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.db.connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -930,7 +948,7 @@ Need more help? Contact the administrator.
     async def record_export(self, user_id: int, data_source: str, export_format: str, record_count: int):
         """Record export in history"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.db.connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -1041,12 +1059,23 @@ Need more help? Contact the administrator.
                 parse_mode=ParseMode.MARKDOWN
             )
     
+    def get_warehouse(self) -> Warehouse:
+        """Warehouse over the data directory, opened on first use"""
+        if self.warehouse is None:
+            self.warehouse = Warehouse(WAREHOUSE_DB, data_dir=self.data_dir)
+        return self.warehouse
+    
     async def load_data_source(self, data_source: str) -> Optional[List[Dict]]:
-        """Load data from JSON files with error handling"""
+        """Load data from the warehouse, or from JSON files for the other sources"""
         try:
             if data_source not in self.config["data_sources"]:
                 return None
             
+            if data_source in WAREHOUSE_SOURCES:
+                records = self.get_warehouse().rows(WAREHOUSE_SOURCES[data_source])
+                if records:
+                    return records
+            
             source_info = self.config["data_sources"][data_source]
             filename = source_info["file"]
             filepath = os.path.join(self.data_dir, filename)
@@ -1087,7 +1116,7 @@ Need more help? Contact the administrator.
     async def show_admin_panel(self, query):
         """Show admin panel for admin users"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.db.connect()
             cursor = conn.cursor()
             
             # Get system statistics
@@ -1257,7 +1286,7 @@ Need more help? Contact the administrator.
     async def record_search(self, user_id: int, query: str, results_count: int):
         """Record search in history"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.db.connect()
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -1273,7 +1302,7 @@ Need more help? Contact the administrator.
     def update_user_activity(self, user_id: int):
         """Update user's last active timestamp"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.db.connect()
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE users SET last_active = CURRENT_TIMESTAMP 
@@ -0,0 +1,313 @@
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+
+from flask import Response, request, send_file, stream_with_context
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+MIMETYPES = {'csv': 'text/csv', 'csv.gz': 'text/csv', 'xlsx': XLSX_MIMETYPE}
+
+
+class _Line:
+    """File-like target that hands back what csv.writer writes"""
+
+    def write(self, value):
+        return value
+
+
+def query_rows(db_path, sql, params=(), batch_size=1000):
+    """Run a query now and return an iterator over its rows.
+
+    The query executes before returning, so a bad query raises in the
+    caller; rows are then fetched ``batch_size`` at a time while the
+    response streams, and the connection is closed at the end.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.execute(sql, params)
+    except Exception:
+        conn.close()
+        raise
+    return _fetch_batches(conn, cursor, batch_size)
+
+
+def _fetch_batches(conn, cursor, batch_size):
+    try:
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            yield from batch
+    finally:
+        conn.close()
+
+
+def iter_csv(header, rows, batch_rows=500):
+    """Yield CSV text in chunks of ``batch_rows`` rows, header first"""
+    writer = csv.writer(_Line())
+    yield writer.writerow(header)
+    chunk = []
+    for row in rows:
+        chunk.append(writer.writerow(row))
+        if len(chunk) >= batch_rows:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+def gzip_chunks(chunks, level=6):
+    """gzip a stream of text chunks on the fly"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def csv_chunks(header, rows, compress=False):
+    """Yield the CSV body as bytes, gzip-encoded with ``compress``"""
+    chunks = iter_csv(header, rows)
+    if compress:
+        return gzip_chunks(chunks)
+    return (chunk.encode('utf-8') for chunk in chunks)
+
+
+def write_csv(fileobj, header, rows, compress=False):
+    for data in csv_chunks(header, rows, compress):
+        fileobj.write(data)
+
+
+def client_accepts_gzip():
+    return request.accept_encodings['gzip'] > 0
+
+
+def _xlsx_value(value):
+    # Control characters are not allowed in worksheet XML
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub('', value)
+    return value
+
+
+def write_xlsx(fileobj, header, rows, sheet_name='Sheet1'):
+    """Write ``rows`` to ``fileobj`` as a workbook in openpyxl's write-only mode.
+
+    Write-only worksheets stream rows to disk as they are appended, so
+    memory stays flat however many rows there are.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=sheet_name[:31])
+    sheet.append(header)
+    for row in rows:
+        sheet.append([_xlsx_value(value) for value in row])
+    workbook.save(fileobj)
+
+
+def xlsx_response(filename, header, rows, sheet_name='Sheet1'):
+    """Send ``rows`` as an .xlsx download, built in a temp file rather than in memory"""
+    spool = tempfile.TemporaryFile(suffix='.xlsx')
+    try:
+        write_xlsx(spool, header, rows, sheet_name)
+        spool.seek(0)
+    except Exception:
+        spool.close()
+        raise
+    return send_file(spool, mimetype=XLSX_MIMETYPE, as_attachment=True, download_name=filename)
+
+
+def csv_response(filename, header, rows, compress=None):
+    """Stream ``rows`` (any iterable, e.g. ``query_rows``) as a CSV download.
+
+    The first bytes go out before the rows are read, and only one chunk
+    is held in memory. With ``compress`` (default: when the client accepts
+    gzip) the body is sent gzip-encoded.
+    """
+    if compress is None:
+        compress = client_accepts_gzip()
+    response = Response(stream_with_context(csv_chunks(header, rows, compress)), mimetype='text/csv')
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    response.headers['Vary'] = 'Accept-Encoding'
+    if compress:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+
+class ExportCache:
+    """Generated CSV/XLSX exports kept on disk until their source changes.
+
+    An entry is keyed by (module, filter params, format, source version),
+    so a new scrape or import changes the key and the old file simply
+    stops being used. The ETag of an entry is the sha256 of its bytes,
+    and responses are conditional: a client that already has the file
+    gets a 304. Files are evicted least recently used first once the
+    cache grows past ``max_bytes``.
+
+    A CSV miss streams to the client as the rows are read and the same
+    bytes fill the cache entry, which is kept only if the stream finishes.
+    An XLSX workbook is a zip that openpyxl writes out on save, so it is
+    built before it is sent.
+    """
+
+    def __init__(self, cache_dir='export_cache', max_bytes=512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    @staticmethod
+    def key(module, params, fmt, version):
+        raw = json.dumps([module, sorted((params or {}).items()), fmt, version], default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _paths(self, key):
+        return os.path.join(self.cache_dir, f"{key}.export"), os.path.join(self.cache_dir, f"{key}.json")
+
+    def _lookup(self, key):
+        data_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if os.path.getsize(data_path) != meta['size']:
+                return None
+            # The meta file's mtime is the entry's last use
+            os.utime(meta_path)
+            return meta
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _tmp_path(self, key):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data_path, _ = self._paths(key)
+        return f"{data_path}.{threading.get_ident()}.tmp"
+
+    def _commit(self, key, fmt, tmp_path, etag):
+        """Move a finished temp file into place and write its meta"""
+        data_path, meta_path = self._paths(key)
+        meta = {'etag': etag, 'format': fmt, 'size': os.path.getsize(tmp_path), 'built_at': time.time()}
+        os.replace(tmp_path, data_path)
+        with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(f"{meta_path}.tmp", meta_path)
+        self._trim(keep=meta_path)
+        return meta
+
+    def _build(self, key, fmt, header, rows, sheet_name):
+        tmp_path = self._tmp_path(key)
+        try:
+            with open(tmp_path, 'wb') as f:
+                if fmt == 'xlsx':
+                    write_xlsx(f, header, rows(), sheet_name)
+                else:
+                    write_csv(f, header, rows(), compress=(fmt == 'csv.gz'))
+            digest = hashlib.sha256()
+            with open(tmp_path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 16), b''):
+                    digest.update(block)
+            return self._commit(key, fmt, tmp_path, digest.hexdigest())
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _tee(self, key, fmt, chunks):
+        """Yield ``chunks`` (bytes) while writing them to a new cache entry"""
+        tmp_path = self._tmp_path(key)
+        digest = hashlib.sha256()
+        try:
+            with open(tmp_path, 'wb') as f:
+                for data in chunks:
+                    f.write(data)
+                    digest.update(data)
+                    yield data
+            self._commit(key, fmt, tmp_path, digest.hexdigest())
+        finally:
+            # Left behind when the client went away or a row failed
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _stream(self, key, fmt, header, rows, filename):
+        chunks = csv_chunks(header, rows(), compress=(fmt == 'csv.gz'))
+        response = Response(stream_with_context(self._tee(key, fmt, chunks)), mimetype=MIMETYPES[fmt])
+        response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.cache_control.no_cache = True
+        if fmt == 'csv.gz':
+            response.headers['Content-Encoding'] = 'gzip'
+        return response
+
+    def _trim(self, keep=None):
+        """Evict least recently used entries until the cache fits ``max_bytes``"""
+        with self._lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.json'):
+                    continue
+                data_path, meta_path = self._paths(name[:-5])
+                try:
+                    entries.append((os.path.getmtime(meta_path), os.path.getsize(data_path), data_path, meta_path))
+                except OSError:
+                    continue
+            total = sum(entry[1] for entry in entries)
+            for _, size, data_path, meta_path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if meta_path == keep:
+                    continue
+                for path in (meta_path, data_path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+                self.stats['evictions'] += 1
+
+    def _send(self, key, meta, filename):
+        data_path, _ = self._paths(key)
+        response = send_file(data_path, mimetype=MIMETYPES[meta['format']], as_attachment=True,
+                             download_name=filename, etag=meta['etag'], last_modified=meta['built_at'],
+                             conditional=True)
+        response.cache_control.no_cache = True
+        if meta['format'] != 'xlsx':
+            response.headers['Vary'] = 'Accept-Encoding'
+        if meta['format'] == 'csv.gz':
+            response.headers['Content-Encoding'] = 'gzip'
+        return response
+
+    def send(self, module, fmt, version, header, rows, filename, params=None, sheet_name='Sheet1'):
+        """Send an export from the cache, or stream (CSV) or build (XLSX) it on a miss.
+
+        Args:
+            module (str): Name of the exported listing.
+            fmt (str): 'csv' or 'xlsx'. CSV is stored and sent gzip-encoded
+                to clients that accept gzip.
+            version (str): Changes whenever the source data changes.
+            header (list): Column titles.
+            rows (callable): Returns the row iterable; only called on a miss.
+            filename (str): Download name.
+            params (dict, optional): Filters that select the rows.
+        """
+        if fmt == 'csv' and client_accepts_gzip():
+            fmt = 'csv.gz'
+        key = self.key(module, params, fmt, version)
+        meta = self._lookup(key)
+        if meta is not None:
+            try:
+                response = self._send(key, meta, filename)
+            except FileNotFoundError:
+                pass  # Evicted between lookup and send
+            else:
+                self.stats['hits'] += 1
+                return response
+        self.stats['misses'] += 1
+        if fmt != 'xlsx':
+            return self._stream(key, fmt, header, rows, filename)
+        meta = self._build(key, fmt, header, rows, sheet_name)
+        return self._send(key, meta, filename)
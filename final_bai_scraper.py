@@ -3,15 +3,33 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import csv
+import io
 import time
 import re
 from urllib.parse import urljoin, urlparse, parse_qs
 import sqlite3
+import http_fetch
+from change_tracker import ChangeTracker, summarize, write_json_if_changed, write_text_if_changed
 from datetime import datetime
 
+def bai_member_key(member):
+    # JSON, not a joined string: names may contain any separator and
+    # contact_person may be missing (NULL in bai_members)
+    return json.dumps([member.get('company_name'), member.get('contact_person')], ensure_ascii=False)
+
+def bai_key_values(key):
+    """(company_name, contact_person) of a bai_member_key, or None for an unreadable key"""
+    try:
+        values = json.loads(key)
+    except ValueError:
+        return None
+    if not isinstance(values, list) or len(values) != 2:
+        return None
+    return tuple(values)
+
 class FinalBAIScraper:
     def __init__(self):
-        self.session = requests.Session()
+        self.session = http_fetch.session()
         self.base_url = "https://baionline.in"
         self.members_url = "https://baionline.in/committee_member/coimbatore"
         self.session.headers.update({
@@ -28,6 +46,19 @@ class FinalBAIScraper:
         })
         self.members_data = []
         self.total_pages = 0
+        # Pages that could not be fetched in the last scrape_all_pages()
+        self.failed_pages = []
+        # Optional change_tracker run: unchanged pages are not reparsed
+        self.changes = None
+
+    def _cached_page(self, page_num, html_content):
+        if self.changes is None:
+            return None
+        return self.changes.cached_page(page_num, html_content)
+
+    def _store_page(self, page_num, html_content, members):
+        if self.changes is not None:
+            self.changes.store_page(page_num, html_content, members)
 
     def get_page_content(self, url, params=None):
         """Get page content with error handling"""
@@ -112,8 +143,13 @@ class FinalBAIScraper:
         return member_data
 
     def scrape_page(self, page_num=1):
-        """Scrape a specific page"""
+        """Scrape a specific page and return its members (without storing them).
+        
+        Raises RuntimeError when no variant of the page could be fetched, so
+        a failed page is not mistaken for the end of the list.
+        """
         print(f"\n--- Scraping Page {page_num} ---")
+        fetched = False
         
         # Try different pagination approaches
         pagination_params = [
@@ -127,10 +163,15 @@ class FinalBAIScraper:
         for params in pagination_params:
             html_content = self.get_page_content(self.members_url, params)
             if html_content:
-                soup = BeautifulSoup(html_content, 'html.parser')
-                members_found = self.parse_page_content(soup, page_num)
-                if members_found > 0:
-                    return members_found
+                fetched = True
+                cached = self._cached_page(page_num, html_content)
+                if cached:
+                    return cached
+                soup = BeautifulSoup(html_content, http_fetch.HTML_PARSER)
+                members = []
+                if self.parse_page_content(soup, page_num, members) > 0:
+                    self._store_page(page_num, html_content, members)
+                    return members
         
         # If pagination params don't work, try direct URL approach
         page_urls = [
@@ -143,15 +184,24 @@ class FinalBAIScraper:
         for url in page_urls:
             html_content = self.get_page_content(url)
             if html_content:
-                soup = BeautifulSoup(html_content, 'html.parser')
-                members_found = self.parse_page_content(soup, page_num)
-                if members_found > 0:
-                    return members_found
-        
-        return 0
+                fetched = True
+                cached = self._cached_page(page_num, html_content)
+                if cached:
+                    return cached
+                soup = BeautifulSoup(html_content, http_fetch.HTML_PARSER)
+                members = []
+                if self.parse_page_content(soup, page_num, members) > 0:
+                    self._store_page(page_num, html_content, members)
+                    return members
+        
+        if not fetched:
+            raise RuntimeError(f"could not fetch page {page_num}")
+        return []
 
-    def parse_page_content(self, soup, page_num):
-        """Parse content from a page"""
+    def parse_page_content(self, soup, page_num, members=None):
+        """Parse content from a page into ``members`` (default: self.members_data)"""
+        if members is None:
+            members = self.members_data
         members_found = 0
         members_found_set = set()  # To avoid duplicates
         
@@ -176,7 +226,7 @@ class FinalBAIScraper:
                         unique_key = f"{member_data['company_name']}_{member_data['contact_person']}"
                         if unique_key not in members_found_set:
                             members_found_set.add(unique_key)
-                            self.members_data.append(member_data)
+                            members.append(member_data)
                             members_found += 1
                             print(f"  ✓ {member_data['company_name']} | {member_data['contact_person']}")
         
@@ -193,7 +243,7 @@ class FinalBAIScraper:
                         unique_key = f"{member_data['company_name']}_{member_data['contact_person']}"
                         if unique_key not in members_found_set:
                             members_found_set.add(unique_key)
-                            self.members_data.append(member_data)
+                            members.append(member_data)
                             members_found += 1
                             print(f"  ✓ {member_data['company_name']} | {member_data['contact_person']}")
         
@@ -227,6 +277,7 @@ class FinalBAIScraper:
     def scrape_all_pages(self):
         """Scrape all pages with pagination"""
         print("Starting comprehensive BAI Coimbatore members scraping...")
+        self.failed_pages = []
         
         # First, get the first page to understand the structure
         html_content = self.get_page_content(self.members_url)
@@ -234,7 +285,7 @@ class FinalBAIScraper:
             print("Failed to fetch the main page")
             return []
         
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, http_fetch.HTML_PARSER)
         
         # Look for total records count
         total_records_text = soup.find_all(text=re.compile(r'(\d+)\s*records'))
@@ -255,31 +306,33 @@ class FinalBAIScraper:
         print(f"Attempting to scrape {self.total_pages} pages...")
         
         # Scrape first page
-        members_found = self.parse_page_content(soup, 1)
-        print(f"Page 1: Found {members_found} members")
-        
-        # Scrape remaining pages
-        consecutive_empty_pages = 0
-        for page_num in range(2, self.total_pages + 1):
-            members_found = self.scrape_page(page_num)
-            print(f"Page {page_num}: Found {members_found} members")
-            
-            if members_found == 0:
-                consecutive_empty_pages += 1
-                if consecutive_empty_pages >= 3:  # Stop if 3 consecutive pages are empty
-                    print(f"Stopping at page {page_num} - no more data found")
-                    break
-            else:
-                consecutive_empty_pages = 0
-            
-            # Be respectful with requests
-            time.sleep(1)
+        cached = self._cached_page(1, html_content)
+        if cached is not None:
+            self.members_data.extend(cached)
+            print(f"Page 1: unchanged, {len(cached)} members")
+        else:
+            members = []
+            members_found = self.parse_page_content(soup, 1, members)
+            self._store_page(1, html_content, members)
+            self.members_data.extend(members)
+            print(f"Page 1: Found {members_found} members")
+        
+        # Scrape remaining pages a few at a time; request pacing is handled by
+        # the shared fetcher's per-host rate limit. Stop after 3 empty pages.
+        pages = http_fetch.paginate(self.scrape_page, first=2, last=self.total_pages,
+                                    workers=4, stop_after_empty=3)
+        for page_num, members in pages:
+            print(f"Page {page_num}: Found {len(members)} members")
+            self.members_data.extend(members)
+        self.failed_pages = pages.failed
+        if self.failed_pages:
+            print(f"⚠️ Partial scrape: pages {self.failed_pages} could not be fetched")
         
         print(f"\n✅ Successfully scraped {len(self.members_data)} unique BAI members")
         return self.members_data
 
     def save_to_json(self, filename='bai_members_complete.json'):
-        """Save scraped data to JSON file"""
+        """Save scraped data to JSON file (left untouched if the members didn't change)"""
         data = {
             'source': 'Builders Association of India (BAI) - Coimbatore',
             'source_url': self.members_url,
@@ -288,10 +341,10 @@ class FinalBAIScraper:
             'members': self.members_data
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        print(f"Data saved to {filename}")
+        if write_json_if_changed(filename, data):
+            print(f"Data saved to {filename}")
+        else:
+            print(f"{filename} is up to date")
 
     def save_to_csv(self, filename='bai_members_complete.csv'):
         """Save scraped data to CSV file"""
@@ -299,17 +352,27 @@ class FinalBAIScraper:
             print("No data to save")
             return
         
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=[
-                'company_name', 'contact_person', 'address', 'phone', 'email', 'source_url', 'scraped_at'
-            ])
-            writer.writeheader()
-            writer.writerows(self.members_data)
-        
-        print(f"Data saved to {filename}")
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=[
+            'company_name', 'contact_person', 'address', 'phone', 'email', 'source_url', 'scraped_at'
+        ])
+        writer.writeheader()
+        writer.writerows(self.members_data)
+        
+        if write_text_if_changed(filename, output.getvalue()):
+            print(f"Data saved to {filename}")
+        else:
+            print(f"{filename} is up to date")
 
-    def save_to_database(self):
-        """Save scraped data to SQLite database"""
+    def save_to_database(self, delta=None):
+        """Save scraped data to SQLite database.
+        
+        With a change_tracker delta only the added, updated and removed
+        members are written; otherwise the table is replaced. The table is
+        also replaced on a complete first tracked run (no baseline yet, so
+        the delta can't tell which stored rows are gone). After a partial
+        scrape (``failed_pages``) members are only added or updated.
+        """
         try:
             conn = sqlite3.connect('users.db')
             cursor = conn.cursor()
@@ -330,11 +393,29 @@ class FinalBAIScraper:
                 )
             ''')
             
-            # Clear existing data
-            cursor.execute('DELETE FROM bai_members')
+            replace = delta is None
+            if delta is not None:
+                members = delta['added'] + delta['updated']
+                removed = [bai_key_values(key) for key in delta['removed']]
+                # A complete first run, or a baseline with keys in an older
+                # format, can't say which stored rows are gone: replace them all
+                replace = not self.failed_pages and (not delta['baseline'] or None in removed)
+            
+            if replace:
+                # Clear existing data
+                cursor.execute('DELETE FROM bai_members')
+                members = self.members_data
+            else:
+                # Drop the stored copies of the new and changed members and,
+                # unless pages failed to load, the removed ones
+                stale_keys = [(m['company_name'], m['contact_person']) for m in members]
+                if not self.failed_pages:
+                    stale_keys += removed
+                cursor.executemany('DELETE FROM bai_members WHERE company_name = ? AND contact_person IS ?',
+                                   stale_keys)
             
             # Insert new data
-            for member in self.members_data:
+            for member in members:
                 cursor.execute('''
                     INSERT INTO bai_members 
                     (company_name, contact_person, address, phone, email, source_url, scraped_at)
@@ -351,22 +432,30 @@ class FinalBAIScraper:
             
             conn.commit()
             conn.close()
-            print(f"Data saved to database: {len(self.members_data)} records")
+            print(f"Data saved to database: {len(members)} records")
+            return True
             
         except Exception as e:
             print(f"Error saving to database: {e}")
+            return False
 
 def main():
     scraper = FinalBAIScraper()
+    scraper.changes = ChangeTracker('users.db').start('bai_members')
     
     # Scrape all pages
     members = scraper.scrape_all_pages()
     
     if members:
+        delta = scraper.changes.diff(members, key=bai_member_key)
+        print(summarize(delta))
+        
         # Save in multiple formats
         scraper.save_to_json()
         scraper.save_to_csv()
-        scraper.save_to_database()
+        # A partial scrape must not become the baseline of the next run
+        if scraper.save_to_database(delta) and not scraper.failed_pages:
+            scraper.changes.commit()
         
         print(f"\n✅ Successfully scraped {len(members)} BAI members!")
         print("Files created:")
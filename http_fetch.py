@@ -0,0 +1,368 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.cookies import RequestsCookieJar, merge_cookies
+from requests.structures import CaseInsensitiveDict
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+
+class RateLimiter:
+    """Token bucket shared by all workers talking to one host"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+
+class _Host:
+    def __init__(self, rate, concurrency):
+        self.limiter = RateLimiter(rate)
+        self.slots = threading.BoundedSemaphore(concurrency)
+
+
+class Fetcher:
+    """Polite HTTP client shared by the directory scrapers.
+
+    One pooled ``requests.Session`` serves every host. It keeps no
+    cookies: each ``FetchSession`` has its own jar, so scrapers of the
+    same site don't share (ASP.NET) sessions. Each host gets a
+    concurrency cap and a request rate; 429/5xx responses and connection
+    errors are retried with exponential backoff (honouring Retry-After).
+    Successful GET/POST responses are stored on disk keyed by method, URL
+    and body, and revalidated with If-None-Match / If-Modified-Since, so an
+    unchanged page costs a 304 instead of a full download. Entries not
+    used for ``cache_max_age`` seconds are dropped, and the least recently
+    used ones go once the cache grows past ``cache_max_bytes``.
+    """
+
+    # Check the cache size after this many stores
+    TRIM_EVERY = 100
+
+    def __init__(self, cache_dir='http_cache', rate=1.0, concurrency=2, retries=3, backoff=1.0, cache_ttl=0,
+                 cache_max_bytes=256 * 1024 * 1024, cache_max_age=30 * 24 * 3600):
+        self.cache_dir = cache_dir
+        self.rate = rate
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.cache_ttl = cache_ttl
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_max_age = cache_max_age
+        self._stores = 0
+        self.session = requests.Session()
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._hosts = {}
+        self._host_limits = {}
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'not_modified': 0, 'cache_hits': 0, 'retries': 0, 'evictions': 0}
+
+    def set_host_limits(self, host, rate=None, concurrency=None):
+        """Override the rate/concurrency of one host"""
+        with self._lock:
+            self._host_limits[host] = (rate or self.rate, concurrency or self.concurrency)
+            self._hosts.pop(host, None)
+
+    def _host(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = _Host(*self._host_limits.get(host, (self.rate, self.concurrency)))
+            return self._hosts[host]
+
+    # Disk cache
+
+    def _cache_key(self, method, url, params, data):
+        if params:
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(sorted(params.items()) if isinstance(params, dict) else params)}"
+        if isinstance(data, dict):
+            data = urlencode(sorted(data.items()))
+        body = data if isinstance(data, bytes) else str(data or '').encode('utf-8')
+        return hashlib.sha256(method.encode('utf-8') + b' ' + url.encode('utf-8') + b'\n' + body).hexdigest()
+
+    def _cache_paths(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json"), os.path.join(self.cache_dir, f"{key}.body")
+
+    def _load(self, key):
+        meta_path, body_path = self._cache_paths(key)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def _store(self, key, response):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        meta_path, body_path = self._cache_paths(key)
+        meta = {
+            'url': response.url,
+            'status_code': response.status_code,
+            'headers': {name: value for name, value in response.headers.items()
+                        if name.lower() in ('etag', 'last-modified', 'content-type')},
+            'encoding': response.encoding,
+            'fetched_at': time.time()
+        }
+        with open(f"{body_path}.tmp", 'wb') as f:
+            f.write(response.content)
+        os.replace(f"{body_path}.tmp", body_path)
+        with open(f"{meta_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(f"{meta_path}.tmp", meta_path)
+        with self._lock:
+            self._stores += 1
+            trim = self._stores % self.TRIM_EVERY == 1
+        if trim:
+            self.trim_cache()
+
+    def trim_cache(self):
+        """Drop entries unused for ``cache_max_age``, then the least recently used over ``cache_max_bytes``"""
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            meta_path, body_path = self._cache_paths(name[:-5])
+            try:
+                entries.append((os.path.getmtime(meta_path), os.path.getsize(body_path), meta_path, body_path))
+            except OSError:
+                continue
+        cutoff = time.time() - self.cache_max_age if self.cache_max_age else None
+        total = sum(entry[1] for entry in entries)
+        for used_at, size, meta_path, body_path in sorted(entries):
+            if (cutoff is None or used_at >= cutoff) and (not self.cache_max_bytes or total <= self.cache_max_bytes):
+                break
+            for path in (meta_path, body_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            self.stats['evictions'] += 1
+
+    def _touch(self, key, meta):
+        meta['fetched_at'] = time.time()
+        meta_path, _ = self._cache_paths(key)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+    @staticmethod
+    def _cached_response(meta, body, url):
+        response = requests.models.Response()
+        response.status_code = meta.get('status_code', 200)
+        response.headers = CaseInsensitiveDict(meta.get('headers') or {})
+        response.encoding = meta.get('encoding')
+        response.url = meta.get('url') or url
+        response._content = body
+        response.from_cache = True
+        return response
+
+    # Requests
+
+    def _send(self, method, url, **kwargs):
+        """Send with per-host limits and retry/backoff"""
+        host = self._host(url)
+        attempt = 0
+        while True:
+            host.limiter.wait()
+            try:
+                with host.slots:
+                    self.stats['requests'] += 1
+                    response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.retries:
+                    raise
+                delay = self.backoff * (2 ** attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= self.retries:
+                    return response
+                retry_after = response.headers.get('Retry-After', '')
+                delay = float(retry_after) if retry_after.isdigit() else self.backoff * (2 ** attempt)
+            attempt += 1
+            self.stats['retries'] += 1
+            time.sleep(delay)
+
+    def request(self, method, url, params=None, data=None, headers=None, use_cache=True, **kwargs):
+        """Like ``requests.Session.request``; the result may come from the disk cache.
+
+        Cached responses have ``from_cache = True``.
+        """
+        method = method.upper()
+        kwargs.setdefault('timeout', 30)
+        headers = dict(headers or {})
+        key = meta = body = None
+
+        if use_cache and method in ('GET', 'POST'):
+            key = self._cache_key(method, url, params, data)
+            meta, body = self._load(key)
+            if meta is not None:
+                if self.cache_ttl and time.time() - meta.get('fetched_at', 0) < self.cache_ttl:
+                    self.stats['cache_hits'] += 1
+                    return self._cached_response(meta, body, url)
+                validators = CaseInsensitiveDict(meta.get('headers') or {})
+                if validators.get('etag'):
+                    headers['If-None-Match'] = validators['etag']
+                if validators.get('last-modified'):
+                    headers['If-Modified-Since'] = validators['last-modified']
+
+        response = self._send(method, url, params=params, data=data, headers=headers, **kwargs)
+
+        if response.status_code == 304 and meta is not None:
+            self.stats['not_modified'] += 1
+            self._touch(key, meta)
+            cached = self._cached_response(meta, body, url)
+            cached.cookies = response.cookies
+            return cached
+        if key is not None and response.status_code == 200:
+            try:
+                self._store(key, response)
+            except OSError as e:
+                print(f"Could not cache {url}: {str(e)}")
+        response.from_cache = False
+        return response
+
+    def get(self, url, params=None, **kwargs):
+        return self.request('GET', url, params=params, **kwargs)
+
+    def post(self, url, data=None, **kwargs):
+        return self.request('POST', url, data=data, **kwargs)
+
+
+class FetchSession:
+    """Drop-in for a scraper's ``requests.Session``: own headers and cookies, shared fetcher"""
+
+    def __init__(self, fetcher=None):
+        self.fetcher = fetcher or FETCHER
+        self.headers = {}
+        self.cookies = RequestsCookieJar()
+        self.verify = True
+
+    def request(self, method, url, headers=None, cookies=None, **kwargs):
+        kwargs.setdefault('verify', self.verify)
+        if cookies:
+            cookies = merge_cookies(self.cookies.copy(), cookies)
+        response = self.fetcher.request(method, url, headers={**self.headers, **(headers or {})},
+                                        cookies=cookies or self.cookies, **kwargs)
+        # Cookies set on the way, redirects included, stay with this session
+        for hop in response.history + [response]:
+            self.cookies.update(hop.cookies)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, data=None, **kwargs):
+        return self.request('POST', url, data=data, **kwargs)
+
+    def close(self):
+        pass
+
+
+FETCHER = Fetcher(
+    cache_dir=os.environ.get('HTTP_CACHE_DIR', 'http_cache'),
+    rate=float(os.environ.get('HTTP_HOST_RATE', 1.0)),
+    concurrency=int(os.environ.get('HTTP_HOST_CONCURRENCY', 2)),
+    cache_max_bytes=int(os.environ.get('HTTP_CACHE_MAX_MB', 256)) * 1024 * 1024,
+    cache_max_age=float(os.environ.get('HTTP_CACHE_MAX_DAYS', 30)) * 24 * 3600
+)
+
+
+class Pages(list):
+    """``paginate`` result: [(page, rows)] plus the pages that failed to load"""
+
+    def __init__(self):
+        super().__init__()
+        self.failed = []
+
+
+def paginate(load_page, first=1, last=None, workers=4, stop_after_empty=1):
+    """Load numbered pages with up to ``workers`` in flight, in page order.
+
+    ``load_page(page)`` fetches and parses one page and returns its rows,
+    raising if the page could not be loaded; request pacing comes from the
+    fetcher's per-host limits. Loading stops after ``stop_after_empty``
+    consecutive empty (or failed) pages, or after ``last``. Returns
+    [(page, rows)] for the non-empty pages; the numbers of the failed
+    pages are in its ``failed`` list, and a caller must treat the crawl as
+    partial when that is not empty.
+    """
+    pages = Pages()
+    inflight = {}
+    next_page = expected = first
+    empty_run = 0
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            while len(inflight) < workers and (last is None or next_page <= last):
+                inflight[next_page] = executor.submit(load_page, next_page)
+                next_page += 1
+            if expected not in inflight:
+                break
+            try:
+                rows = inflight.pop(expected).result()
+            except Exception as e:
+                print(f"Error loading page {expected}: {str(e)}")
+                pages.failed.append(expected)
+                rows = None
+            if rows:
+                pages.append((expected, rows))
+                empty_run = 0
+            else:
+                empty_run += 1
+                if empty_run >= stop_after_empty:
+                    break
+            expected += 1
+    finally:
+        for future in inflight.values():
+            future.cancel()
+        executor.shutdown(wait=True)
+    return pages
+
+
+def session():
+    """A FetchSession on the shared fetcher"""
+    return FetchSession(FETCHER)
+
+
+def get(url, **kwargs):
+    return FETCHER.get(url, **kwargs)
+
+
+def post(url, data=None, **kwargs):
+    return FETCHER.post(url, data=data, **kwargs)
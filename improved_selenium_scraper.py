@@ -7,56 +7,226 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import os
 import random
 import re
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+RESULTS_SELECTOR = "[data-value='Directions']"
+
+SUPPLIER_CATEGORIES = {
+    "Building Materials": ["building materials suppliers", "construction materials"],
+    'RMC': ['rmc companies', 'ready mix concrete', 'concrete suppliers'],
+    'Paver Block': ['paver block suppliers', 'interlocking pavers'],
+    'Hollow Block': ['hollow block suppliers', 'cement block suppliers'],
+    'Cement': ['cement suppliers', 'building materials']
+}
+
+# Reads every result card in one round trip; mirrors the selectors of the
+# per-element extraction and adds phone and coordinates when present
+EXTRACT_RESULTS_JS = r"""
+const selector = arguments[0], limit = arguments[1];
+const addressSelectors = ["[data-item-id='address']", ".fontBodyMedium", ".fontBodySmall", ".Io6YTe", "[jsaction*='pane.rating']"];
+const ratingSelectors = ["[jsaction*='pane.rating']", ".fontBodySmall", ".ceNzKf", ".fontDisplayLarge"];
+const results = [];
+for (const element of Array.from(document.querySelectorAll(selector)).slice(0, limit)) {
+    const label = element.getAttribute('aria-label') || '';
+    const name = label.includes('Get directions to') ? label.replace('Get directions to ', '').trim() : 'N/A';
+    const parent = element.parentElement || element;
+
+    let address = null;
+    for (const sel of addressSelectors) {
+        const node = parent.querySelector(sel);
+        const text = node ? (node.innerText || '').trim() : '';
+        if (text.length > 10 && !/^\d+$/.test(text)) { address = text; break; }
+    }
+
+    let rating = null, reviews = null;
+    for (const sel of ratingSelectors) {
+        const node = parent.querySelector(sel);
+        const text = node ? (node.innerText || '').trim() : '';
+        if (text.includes('stars') || text.includes('.')) {
+            const m = text.match(/(\d+\.?\d*)/);
+            if (m) rating = m[1];
+        }
+        const r = text.match(/(\d+)\s+reviews?/);
+        if (r) reviews = r[1];
+        if (rating || reviews) break;
+    }
+
+    // The card is the nearest ancestor holding the place link
+    let card = parent, link = null;
+    for (let depth = 0; card && depth < 6 && !link; depth++) {
+        link = card.querySelector("a[href*='/maps/place/']");
+        if (!link) card = card.parentElement;
+    }
+    const cardText = card ? (card.innerText || '') : '';
+    const phone = cardText.match(/(?:\+91[\s-]?)?0?\d{2,5}[\s-]?\d{3,4}[\s-]?\d{3,4}/);
+    const coords = link ? link.href.match(/!3d(-?\d+\.\d+)!4d(-?\d+\.\d+)/) : null;
+
+    results.push({
+        name: name,
+        address: address,
+        rating: rating,
+        reviews_count: reviews,
+        phone: phone ? phone[0].trim() : null,
+        latitude: coords ? parseFloat(coords[1]) : null,
+        longitude: coords ? parseFloat(coords[2]) : null
+    });
+}
+return results;
+"""
+
+# Lean profile: only the DOM is needed to read result lists
+BROWSER_PROFILE = os.environ.get('SUPPLIERS_BROWSER_PROFILE', 'lean')
+BROWSER_CACHE_DIR = os.environ.get('SUPPLIERS_BROWSER_CACHE_DIR', 'chrome_cache')
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.mp3',
+    '*/maps/vt*', '*/kh/v*', '*streetviewpixels*'
+]
+
+def _claim_cache_dir(root, slots=8):
+    """Lock a disk cache directory that no other running browser is using.
+    
+    Returns (path, lock_file); the lock is held until the driver quits so
+    the same directory (and its cached scripts) is reused by the next one.
+    """
+    if fcntl is None:
+        return None, None
+    os.makedirs(root, exist_ok=True)
+    for slot in range(slots):
+        path = os.path.join(root, f"slot-{slot}")
+        lock_file = open(f"{path}.lock", 'w')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            continue
+        os.makedirs(path, exist_ok=True)
+        return path, lock_file
+    return None, None
+
+def block_resources(driver):
+    """Block BLOCKED_URL_PATTERNS in the driver's current tab (CDP settings are per tab)"""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        return True
+    except Exception as e:
+        print(f"Could not block browser resources: {str(e)}")
+        return False
+
+def create_chrome_driver(profile=None):
+    """Start a Chrome driver with anti-detection measures.
+    
+    The 'lean' profile (default) runs headless with a small viewport,
+    blocks images, fonts, media and map tiles, and reuses a disk cache
+    across sessions; 'full' is the original windowed 1920x1080 browser.
+    """
+    profile = profile or BROWSER_PROFILE
+    lean = profile == 'lean'
+    chrome_options = Options()
+    
+    # Anti-detection measures
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    
+    # Randomize user agent
+    user_agents = [
+        'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+        'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+    ]
+    chrome_options.add_argument(f"--user-agent={random.choice(user_agents)}")
+    
+    cache_dir, cache_lock = None, None
+    if lean:
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--window-size=1024,768")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        # Preferences apply to every tab, including the ones opened by window.open
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+            "profile.default_content_setting_values.geolocation": 2,
+            "profile.default_content_setting_values.media_stream": 2
+        })
+        cache_dir, cache_lock = _claim_cache_dir(BROWSER_CACHE_DIR)
+        if cache_dir:
+            chrome_options.add_argument(f"--disk-cache-dir={os.path.abspath(cache_dir)}")
+            chrome_options.add_argument("--disk-cache-size=104857600")
+    else:
+        # Window size
+        chrome_options.add_argument("--window-size=1920,1080")
+    
+    try:
+        driver = webdriver.Chrome(options=chrome_options)
+    except Exception:
+        if cache_lock:
+            cache_lock.close()
+        raise
+    
+    if cache_lock:
+        # Release the cache directory when the browser goes away
+        quit_driver = driver.quit
+        def quit():
+            try:
+                quit_driver()
+            finally:
+                cache_lock.close()
+        driver.quit = quit
+    
+    # Fonts, media and map tiles have no preference switch; block them at the
+    # network layer. New tabs must be blocked too (see _open_tab)
+    driver.blocks_resources = lean and block_resources(driver)
+    
+    # Execute script to remove webdriver property
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    return driver
+
 class ImprovedGoogleMapsScraper:
-    def __init__(self):
-        self.driver = None
+    def __init__(self, driver=None):
+        """Use the given (pooled) driver, or start and own a new one"""
+        self.driver = driver
+        self.owns_driver = driver is None
+        self.pages_loaded = 0
         self.current_category = 'RMC'
         self.current_keyword = 'ready mix concrete'
-        self.setup_driver()
+        if self.owns_driver:
+            self.setup_driver()
 
     def setup_driver(self):
         """Setup Chrome driver with anti-detection measures"""
-        chrome_options = Options()
-        
-        # Anti-detection measures
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        # Randomize user agent
-        user_agents = [
-            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        ]
-        chrome_options.add_argument(f"--user-agent={random.choice(user_agents)}")
-        
-        # Window size
-        chrome_options.add_argument("--window-size=1920,1080")
-        
-        self.driver = webdriver.Chrome(options=chrome_options)
-        
-        # Execute script to remove webdriver property
-        self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self.driver = create_chrome_driver()
+
+    def search_url(self, query, location):
+        """Google Maps search URL for a query"""
+        return f"https://www.google.com/maps/search/{query.replace(' ', '+')}+{location.replace(' ', '+')}"
 
     def search_google_maps(self, pincode, query, location):
         """Search Google Maps for businesses"""
         try:
-            # Construct search URL
-            search_url = f"https://www.google.com/maps/search/{query.replace(' ', '+')}+{location.replace(' ', '+')}"
+            search_url = self.search_url(query, location)
             print(f"Searching: {search_url}")
             
             self.driver.get(search_url)
-            time.sleep(5)  # Wait longer for page to load
+            self.pages_loaded += 1
             
             # Wait for results to load
             WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "[data-value='Directions']"))
+                EC.presence_of_element_located((By.CSS_SELECTOR, RESULTS_SELECTOR))
             )
             
             return True
@@ -65,18 +235,102 @@ class ImprovedGoogleMapsScraper:
             print(f"Error searching Google Maps: {str(e)}")
             return False
 
+    def _build_business(self, name, address, rating, reviews_count, phone=None, latitude=None, longitude=None):
+        """Supplier record for one result, filling the fields the list doesn't show"""
+        if name == "N/A" or len(name) <= 3:
+            return None
+        # Fields made up below; supplier_dedup never matches on them
+        generated = ['email', 'website']
+        
+        # Generate realistic phone number based on Coimbatore area
+        if not phone:
+            phone = f"+91-422-{random.randint(1000000, 9999999)}"
+            generated.append('phone')
+        
+        # Generate email and website based on business name
+        clean_name = name.lower().replace(' ', '').replace('.', '').replace(',', '').replace('&', 'and')
+        email = f"info@{clean_name}.com"
+        website = f"https://www.{clean_name}.com"
+        
+        # Generate realistic address if not found - use actual Coimbatore areas
+        if address == "N/A":
+            coimbatore_areas = [
+                f"Gandhipuram, {self.current_pincode}, Coimbatore, Tamil Nadu",
+                f"RS Puram, {self.current_pincode}, Coimbatore, Tamil Nadu",
+                f"Peelamedu, {self.current_pincode}, Coimbatore, Tamil Nadu",
+                f"Industrial Estate, {self.current_pincode}, Coimbatore, Tamil Nadu",
+                f"Saibaba Colony, {self.current_pincode}, Coimbatore, Tamil Nadu",
+                f"Race Course, {self.current_pincode}, Coimbatore, Tamil Nadu",
+                f"Tirupur Road, {self.current_pincode}, Coimbatore, Tamil Nadu",
+                f"Avinashi Road, {self.current_pincode}, Coimbatore, Tamil Nadu"
+            ]
+            address = random.choice(coimbatore_areas)
+            generated.append('address')
+        if latitude is None or longitude is None:
+            generated += ['latitude', 'longitude']
+        
+        return {
+            'name': name,
+            'address': address,
+            'phone': phone,
+            'email': email,
+            'website': website,
+            'rating': rating,
+            'reviews_count': reviews_count,
+            'category': self.current_category,
+            'pincode': self.current_pincode,
+            'keyword': self.current_keyword,
+            'latitude': latitude if latitude is not None else 11.0125 + random.uniform(-0.01, 0.01),
+            'longitude': longitude if longitude is not None else 77.0129 + random.uniform(-0.01, 0.01),
+            'source': 'Google Maps Enhanced',
+            'generated': generated
+        }
+
     def extract_business_data_from_list(self):
+        """Extract business data from the search results list.
+
+        All cards are read with a single execute_script round trip; the
+        per-element extraction is used if the script finds nothing.
+        """
+        try:
+            WebDriverWait(self.driver, 15).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, RESULTS_SELECTOR))
+            )
+            cards = self.driver.execute_script(EXTRACT_RESULTS_JS, RESULTS_SELECTOR, 10)
+        except TimeoutException:
+            print("Timeout waiting for results")
+            return []
+        except Exception as e:
+            print(f"Script extraction failed, falling back to per-element: {str(e)}")
+            cards = None
+
+        if not cards:
+            return self.extract_business_data_per_element()
+
+        businesses = []
+        for card in cards:
+            business = self._build_business(
+                card.get('name') or "N/A", card.get('address') or "N/A",
+                card.get('rating') or "N/A", card.get('reviews_count') or "0",
+                phone=card.get('phone'), latitude=card.get('latitude'), longitude=card.get('longitude')
+            )
+            if business:
+                businesses.append(business)
+        print(f"Extracted {len(businesses)} businesses in one script call")
+        return businesses
+
+    def extract_business_data_per_element(self):
         """Extract business data from the search results list with better selectors"""
         businesses = []
         
         try:
             # Wait for results to load
             WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "[data-value='Directions']"))
+                EC.presence_of_element_located((By.CSS_SELECTOR, RESULTS_SELECTOR))
             )
             
             # Find all business result elements
-            result_elements = self.driver.find_elements(By.CSS_SELECTOR, "[data-value='Directions']")
+            result_elements = self.driver.find_elements(By.CSS_SELECTOR, RESULTS_SELECTOR)
             print(f"Found {len(result_elements)} business results")
             
             for i, element in enumerate(result_elements[:10]):  # Limit to 10 results
@@ -151,54 +405,10 @@ class ImprovedGoogleMapsScraper:
                     except:
                         pass
                     
-                    # Generate realistic phone number based on Coimbatore area
-                    phone = f"+91-422-{random.randint(1000000, 9999999)}"
-                    
-                    # Generate email based on business name
-                    if name != "N/A":
-                        clean_name = name.lower().replace(' ', '').replace('.', '').replace(',', '').replace('&', 'and')
-                        email = f"info@{clean_name}.com"
-                    else:
-                        email = "N/A"
-                    
-                    # Generate website
-                    if name != "N/A":
-                        clean_name = name.lower().replace(' ', '').replace('.', '').replace(',', '').replace('&', 'and')
-                        website = f"https://www.{clean_name}.com"
-                    else:
-                        website = "N/A"
-                    
-                    # Generate realistic address if not found - use actual Coimbatore areas
-                    if address == "N/A" and name != "N/A":
-                        coimbatore_areas = [
-                            f"Gandhipuram, {self.current_pincode}, Coimbatore, Tamil Nadu",
-                            f"RS Puram, {self.current_pincode}, Coimbatore, Tamil Nadu",
-                            f"Peelamedu, {self.current_pincode}, Coimbatore, Tamil Nadu",
-                            f"Industrial Estate, {self.current_pincode}, Coimbatore, Tamil Nadu",
-                            f"Saibaba Colony, {self.current_pincode}, Coimbatore, Tamil Nadu",
-                            f"Race Course, {self.current_pincode}, Coimbatore, Tamil Nadu",
-                            f"Tirupur Road, {self.current_pincode}, Coimbatore, Tamil Nadu",
-                            f"Avinashi Road, {self.current_pincode}, Coimbatore, Tamil Nadu"
-                        ]
-                        address = random.choice(coimbatore_areas)
-                    
-                    if name != "N/A" and len(name) > 3:
-                        businesses.append({
-                            'name': name,
-                            'address': address,
-                            'phone': phone,
-                            'email': email,
-                            'website': website,
-                            'rating': rating,
-                            'reviews_count': reviews_count,
-                            'category': self.current_category,
-                            'pincode': self.current_pincode,
-                            'keyword': self.current_keyword,
-                            'latitude': 11.0125 + random.uniform(-0.01, 0.01),
-                            'longitude': 77.0129 + random.uniform(-0.01, 0.01),
-                            'source': 'Google Maps Enhanced'
-                        })
-                        print(f"Extracted: {name} - {address[:50]}...")
+                    business = self._build_business(name, address, rating, reviews_count)
+                    if business:
+                        businesses.append(business)
+                        print(f"Extracted: {name} - {business['address'][:50]}...")
                     
                 except Exception as e:
                     print(f"Error processing result {i+1}: {str(e)}")
@@ -230,23 +440,102 @@ class ImprovedGoogleMapsScraper:
             print(f"Error scraping {category}: {str(e)}")
         return suppliers
 
-    def scrape_all_categories(self, pincode, location):
-        categories = {
-            "Building Materials": ["building materials suppliers", "construction materials"],
-            'RMC': ['rmc companies', 'ready mix concrete', 'concrete suppliers'],
-            'Paver Block': ['paver block suppliers', 'interlocking pavers'],
-            'Hollow Block': ['hollow block suppliers', 'cement block suppliers'],
-            'Cement': ['cement suppliers', 'building materials']
-        }
+    def scrape_keywords_concurrently(self, pincode, location, searches, max_tabs=6, timeout=20, on_results=None):
+        """Run several searches at once, one browser tab each.
+
+        Tabs are opened without blocking (window.open), so their page loads
+        overlap; each tab is polled until its result list is present, then
+        extracted and closed. Results are merged as tabs finish.
+
+        Args:
+            searches (list): (category, keyword) pairs.
+            max_tabs (int): Tabs open at the same time.
+            timeout (int): Seconds to wait for one tab's results.
+            on_results (callable, optional): Called with (category, keyword, businesses) per finished search.
+        """
+        self.current_pincode = pincode
+        main_handle = self.driver.current_window_handle
+        pending = list(searches)
+        all_results = []
+
+        try:
+            self._scrape_tabs(location, pending, max_tabs, timeout, on_results, all_results, main_handle)
+        finally:
+            # Never hand back a driver with stray tabs open
+            for handle in self.driver.window_handles:
+                if handle != main_handle:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+            self.driver.switch_to.window(main_handle)
+        return all_results
+
+    def _scrape_tabs(self, location, pending, max_tabs, timeout, on_results, all_results, main_handle):
+        pending = list(pending)
+        tabs = {}
+        while pending or tabs:
+            # Sliding window: open a tab as soon as one frees up
+            while pending and len(tabs) < max_tabs:
+                category, keyword = pending.pop(0)
+                query = f"{keyword} near {location}"
+                print(f"Opening tab for: {query}")
+                handle = self._open_tab(self.search_url(query, location), main_handle)
+                if handle:
+                    tabs[handle] = (category, keyword, time.time() + timeout)
+                    self.pages_loaded += 1
+
+            # Explicit wait across tabs: extract each one as soon as its list is ready
+            finished = False
+            for handle, (category, keyword, deadline) in list(tabs.items()):
+                self.driver.switch_to.window(handle)
+                ready = bool(self.driver.find_elements(By.CSS_SELECTOR, RESULTS_SELECTOR))
+                if not ready and time.time() < deadline:
+                    continue
+                businesses = []
+                if ready:
+                    self.current_category = category
+                    self.current_keyword = keyword
+                    businesses = self.extract_business_data_from_list()
+                else:
+                    print(f"Timed out waiting for results: {keyword}")
+                all_results.extend(businesses)
+                if on_results:
+                    on_results(category, keyword, businesses)
+                self.driver.close()
+                self.driver.switch_to.window(main_handle)
+                del tabs[handle]
+                finished = True
+            if tabs and not finished:
+                time.sleep(0.25)
+
+    def _open_tab(self, url, main_handle):
+        """Open ``url`` in a new tab and return its handle (None if no tab opened)"""
+        # window.open needs a live window: never run it from a closed tab
+        self.driver.switch_to.window(main_handle)
+        blocking = getattr(self.driver, 'blocks_resources', False)
+        known = set(self.driver.window_handles)
+        # A blocking browser opens a blank tab first: the block list is per
+        # tab and has to be in place before the search starts loading
+        self.driver.execute_script("window.open(arguments[0], '_blank');", 'about:blank' if blocking else url)
+        handle = next(iter(set(self.driver.window_handles) - known), None)
+        if handle and blocking:
+            self.driver.switch_to.window(handle)
+            block_resources(self.driver)
+            self.driver.execute_script("window.location.href = arguments[0];", url)
+        return handle
+
+    def scrape_all_categories(self, pincode, location, concurrent=True, max_tabs=6):
+        searches = [(category, keyword) for category, keywords in SUPPLIER_CATEGORIES.items() for keyword in keywords]
+        if concurrent:
+            return self.scrape_keywords_concurrently(pincode, location, searches, max_tabs=max_tabs)
         all_results = []
-        for category, keywords in categories.items():
+        for category, keywords in SUPPLIER_CATEGORIES.items():
             results = self.scrape_category(pincode, location, category, keywords)
             all_results.extend(results)
         return all_results
 
     def close(self):
-        """Close the driver"""
-        if self.driver:
+        """Close the driver (pooled drivers are returned by their pool)"""
+        if self.driver and self.owns_driver:
             self.driver.quit()
 
     def run_scraping(self, pincode="641015", location="Coimbatore"):
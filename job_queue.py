@@ -0,0 +1,282 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+
+def _process_alive(owner):
+    """False when ``owner`` (host:pid:token) names a process of this host that has exited"""
+    host, pid, _ = (owner.split(':') + ['', '', ''])[:3]
+    if os.name != 'posix' or host != socket.gethostname() or not pid.isdigit():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class JobQueue:
+    """Background jobs persisted in SQLite and run by local worker threads.
+
+    Handlers are registered per job kind and called as
+    ``handler(params, progress)``, where ``progress(fraction, message)``
+    records how far the job got. Submitting a job identical (same kind and
+    params) to one that is still queued or running returns the existing job.
+    Workers start with ``start()`` or the first submit; jobs left queued by
+    a previous process are picked up then as well.
+
+    A running job records its owner (host:pid:token) and a heartbeat the
+    owning process refreshes every ``heartbeat_interval`` seconds. When
+    workers start, and then on every heartbeat, each running job that is
+    not ours goes back to the queue if its process is gone or its
+    heartbeat is older than ``stale_after``.
+    """
+
+    ACTIVE = ('queued', 'running')
+
+    def __init__(self, db_path='users.db', workers=2, poll_interval=2, heartbeat_interval=30, stale_after=120):
+        self.db_path = db_path
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._handlers = {}
+        self._threads = []
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS background_jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    params TEXT,
+                    dedupe_key TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'queued',
+                    progress REAL DEFAULT 0,
+                    message TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL,
+                    started_at REAL,
+                    finished_at REAL,
+                    owner TEXT,
+                    heartbeat_at REAL
+                )
+            ''')
+            columns = {row['name'] for row in conn.execute('PRAGMA table_info(background_jobs)')}
+            for column, sqltype in (('owner', 'TEXT'), ('heartbeat_at', 'REAL')):
+                if column not in columns:
+                    conn.execute(f'ALTER TABLE background_jobs ADD COLUMN {column} {sqltype}')
+            # At most one queued/running job per dedupe key, even across processes
+            conn.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_background_jobs_active
+                ON background_jobs(dedupe_key) WHERE status IN ('queued', 'running')
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_background_jobs_status ON background_jobs(status, created_at)')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def register(self, kind, handler):
+        self._handlers[kind] = handler
+
+    @staticmethod
+    def dedupe_key(kind, params):
+        return f"{kind}:{json.dumps(params, sort_keys=True)}"
+
+    def submit(self, kind, params):
+        """Queue a job; returns (job_id, created) where created is False for a duplicate"""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        key = self.dedupe_key(kind, params)
+        job_id = uuid.uuid4().hex
+        conn = self._connect()
+        try:
+            try:
+                conn.execute('''
+                    INSERT INTO background_jobs (id, kind, params, dedupe_key, status, message, created_at)
+                    VALUES (?, ?, ?, ?, 'queued', 'Queued', ?)
+                ''', (job_id, kind, json.dumps(params), key, time.time()))
+                conn.commit()
+                created = True
+            except sqlite3.IntegrityError:
+                row = conn.execute('''
+                    SELECT id FROM background_jobs
+                    WHERE dedupe_key = ? AND status IN ('queued', 'running')
+                ''', (key,)).fetchone()
+                if row is None:
+                    # The duplicate finished in between; try again
+                    return self.submit(kind, params)
+                job_id, created = row['id'], False
+        finally:
+            conn.close()
+
+        self._ensure_workers()
+        self._wakeup.set()
+        return job_id, created
+
+    def get(self, job_id):
+        """Job status as a dict, or None"""
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT * FROM background_jobs WHERE id = ?', (job_id,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        job = dict(row)
+        job.pop('dedupe_key')
+        job.pop('owner', None)
+        job['params'] = json.loads(job['params'] or '{}')
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def find_active(self, kind, params):
+        """Id of the queued/running job for these params, if any"""
+        conn = self._connect()
+        try:
+            row = conn.execute('''
+                SELECT id FROM background_jobs
+                WHERE dedupe_key = ? AND status IN ('queued', 'running')
+            ''', (self.dedupe_key(kind, params),)).fetchone()
+        finally:
+            conn.close()
+        return row['id'] if row else None
+
+    # Workers
+
+    def start(self):
+        """Requeue jobs orphaned by a stopped process and start the workers (idempotent)"""
+        self._ensure_workers()
+
+    def _ensure_workers(self):
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            if self._threads:
+                return
+            self._requeue_stale()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            thread = threading.Thread(target=self._heartbeat, name="job-heartbeat", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _requeue_stale(self):
+        """Put back running jobs whose worker died (e.g. the process was restarted)"""
+        cutoff = time.time() - self.stale_after
+        conn = self._connect()
+        try:
+            rows = conn.execute('''
+                SELECT id, owner, COALESCE(heartbeat_at, started_at, 0) AS seen_at
+                FROM background_jobs WHERE status = 'running'
+            ''').fetchall()
+            stale = [row['id'] for row in rows
+                     if row['owner'] != self.owner
+                     and (not row['owner'] or not _process_alive(row['owner']) or row['seen_at'] < cutoff)]
+            if stale:
+                conn.executemany('''
+                    UPDATE OR IGNORE background_jobs
+                    SET status = 'queued', message = 'Requeued', owner = NULL, heartbeat_at = NULL
+                    WHERE id = ? AND status = 'running'
+                ''', [(job_id,) for job_id in stale])
+                # A duplicate is already queued for these: close them instead
+                conn.executemany('''
+                    UPDATE background_jobs SET status = 'failed', message = 'Failed', error = 'Worker stopped', finished_at = ?
+                    WHERE id = ? AND status = 'running'
+                ''', [(time.time(), job_id) for job_id in stale])
+                conn.commit()
+                print(f"Requeued {len(stale)} background job(s) left running by a stopped worker")
+        finally:
+            conn.close()
+
+    def _heartbeat(self):
+        while True:
+            try:
+                self._beat()
+                # Jobs of processes that stopped since we started
+                self._requeue_stale()
+            except sqlite3.Error as e:
+                print(f"Job queue heartbeat error: {str(e)}")
+            time.sleep(self.heartbeat_interval)
+
+    def _beat(self):
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE background_jobs SET heartbeat_at = ? WHERE owner = ? AND status = 'running'",
+                         (time.time(), self.owner))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _claim(self):
+        conn = self._connect()
+        try:
+            row = conn.execute('''
+                UPDATE background_jobs
+                SET status = 'running', started_at = ?, heartbeat_at = ?, owner = ?, message = 'Started'
+                WHERE id = (
+                    SELECT id FROM background_jobs WHERE status = 'queued'
+                    ORDER BY created_at LIMIT 1
+                ) AND status = 'queued'
+                RETURNING *
+            ''', (time.time(), time.time(), self.owner)).fetchone()
+            conn.commit()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def _update(self, job_id, **fields):
+        columns = ', '.join(f"{name} = ?" for name in fields)
+        conn = self._connect()
+        try:
+            conn.execute(f'UPDATE background_jobs SET {columns} WHERE id = ?', list(fields.values()) + [job_id])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _run(self, job):
+        handler = self._handlers.get(job['kind'])
+
+        def progress(fraction, message=None):
+            self._update(job['id'], progress=round(float(fraction), 3), message=message)
+
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for job kind {job['kind']}")
+            result = handler(json.loads(job['params'] or '{}'), progress)
+            self._update(job['id'], status='done', progress=1.0, message='Done',
+                         result=json.dumps(result), finished_at=time.time())
+        except Exception as e:
+            print(f"Background job {job['id']} ({job['kind']}) failed: {str(e)}")
+            self._update(job['id'], status='failed', message='Failed', error=str(e), finished_at=time.time())
+
+    def _worker(self):
+        while True:
+            try:
+                job = self._claim()
+            except sqlite3.Error as e:
+                print(f"Job queue error: {str(e)}")
+                job = None
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self._run(job)
@@ -0,0 +1,145 @@
+import threading
+from collections import OrderedDict
+
+
+class ListingPager:
+    """Keyset pagination, cached counts and dropdown facets for one users.db table.
+
+    Triggers keep a per-table data version in ``table_versions``; counts,
+    facets and page anchors are cached in memory against that version,
+    so they are recomputed only after the table changes.
+
+    Pages are still addressed by number. The sort key of the last row of
+    every page served is remembered (per filter), and a later page seeks
+    past the nearest remembered key with ``(sort key) > (?, ...)`` on the
+    index instead of counting through OFFSET rows from the start. A key
+    holding a NULL is not remembered (the row-value comparison would be
+    NULL and match nothing); such pages fall back to OFFSET from the
+    nearest NULL-free key.
+    """
+
+    def __init__(self, table, order_by, facets=(), max_filters=256):
+        self.table = table
+        # ``id`` breaks ties so the sort key is unique
+        self.order_by = tuple(order_by) + ('id',)
+        self.facet_columns = tuple(facets)
+        self.max_filters = max_filters
+        self._lock = threading.Lock()
+        self._installed = False
+        self._version = None
+        self._counts = OrderedDict()
+        self._anchors = OrderedDict()
+        self._facets = None
+
+    def _install(self, conn):
+        """Create the version row, its triggers and the sort index (once per process)"""
+        if self._installed:
+            return
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS table_versions (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        conn.execute('INSERT OR IGNORE INTO table_versions (name, version) VALUES (?, 0)', (self.table,))
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {self.table}_version_{event.lower()}
+                AFTER {event} ON {self.table}
+                BEGIN
+                    UPDATE table_versions SET version = version + 1 WHERE name = '{self.table}';
+                END
+            ''')
+        sort_columns = list(self.order_by[:-1])
+        if not self._has_index(conn, sort_columns):
+            conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{self.table}_{"_".join(sort_columns)} '
+                         f'ON {self.table} ({", ".join(sort_columns)})')
+        conn.commit()
+        self._installed = True
+
+    def _has_index(self, conn, columns):
+        for index in conn.execute(f'PRAGMA index_list({self.table})').fetchall():
+            indexed = [row[2] for row in conn.execute(f'PRAGMA index_info({index[1]})')]
+            if indexed[:len(columns)] == columns:
+                return True
+        return False
+
+    def version(self, conn):
+        self._install(conn)
+        version = conn.execute('SELECT version FROM table_versions WHERE name = ?', (self.table,)).fetchone()[0]
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._counts.clear()
+                self._anchors.clear()
+                self._facets = None
+        return version
+
+    def _remember(self, cache, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_filters:
+            cache.popitem(last=False)
+
+    def count(self, conn, where=None, params=()):
+        """COUNT(*) of the rows matching ``where``, cached until the table changes"""
+        self.version(conn)
+        key = (where, tuple(params))
+        with self._lock:
+            if key in self._counts:
+                self._counts.move_to_end(key)
+                return self._counts[key]
+        sql = f'SELECT COUNT(*) FROM {self.table}'
+        if where:
+            sql += f' WHERE {where}'
+        total = conn.execute(sql, params).fetchone()[0]
+        with self._lock:
+            self._remember(self._counts, key, total)
+        return total
+
+    def facets(self, conn):
+        """Sorted distinct non-NULL values of every facet column"""
+        self.version(conn)
+        with self._lock:
+            if self._facets is not None:
+                return self._facets
+        facets = {}
+        for column in self.facet_columns:
+            facets[column] = [row[0] for row in conn.execute(
+                f'SELECT DISTINCT {column} FROM {self.table} WHERE {column} IS NOT NULL ORDER BY {column}')]
+        with self._lock:
+            self._facets = facets
+        return facets
+
+    def page(self, conn, columns, page, per_page, where=None, params=()):
+        """Rows of one page as dicts of ``columns`` (a list, or '*')"""
+        self.version(conn)
+        filter_key = (where, tuple(params), per_page)
+        with self._lock:
+            anchors = self._anchors.get(filter_key, {})
+            start = max((number for number in anchors if number < page), default=0)
+            after = anchors.get(start)
+
+        order_sql = ', '.join(self.order_by)
+        select = columns if columns == '*' else ', '.join(columns)
+        conditions = [f'({where})'] if where else []
+        args = list(params)
+        if after is not None:
+            conditions.append(f'({order_sql}) > ({", ".join("?" * len(after))})')
+            args.extend(after)
+        sql = f'SELECT {select}, {order_sql} FROM {self.table}'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += f' ORDER BY {order_sql} LIMIT ? OFFSET ?'
+        cursor = conn.execute(sql, args + [per_page, (page - 1 - start) * per_page])
+        key_width = len(self.order_by)
+        names = [description[0] for description in cursor.description][:-key_width]
+        rows = cursor.fetchall()
+
+        anchor = tuple(rows[-1][-key_width:]) if rows else None
+        if anchor is not None and None not in anchor:
+            with self._lock:
+                anchors = self._anchors.get(filter_key, {})
+                anchors[page] = anchor
+                self._remember(self._anchors, filter_key, anchors)
+        return [dict(zip(names, row[:-key_width])) for row in rows]
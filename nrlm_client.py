@@ -0,0 +1,187 @@
+import threading
+import time
+
+
+class NRLMPoolTimeout(TimeoutError):
+    """Raised when no NRLM session frees up within the pool's wait timeout"""
+
+
+class _Flight:
+    """A single upstream call that concurrent identical requests wait on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class NRLMClientPool:
+    """Pool of warmed NRLM scraper sessions with a TTL cache of hierarchy lists.
+
+    A scraper is warmed once (landing page fetched, token extracted) and
+    then reused across requests, keeping its keep-alive connection. Lists
+    are cached per (level, parent codes) and concurrent requests for the
+    same list share one upstream call. An empty list may come from a
+    half-expired session, so it is only cached for ``empty_ttl``.
+    """
+
+    def __init__(self, scraper_factory, size=4, ttl=6 * 3600, session_max_age=20 * 60, wait_timeout=60,
+                 empty_ttl=60):
+        self.scraper_factory = scraper_factory
+        self.size = size
+        self.ttl = ttl
+        self.empty_ttl = empty_ttl
+        self.session_max_age = session_max_age
+        self.wait_timeout = wait_timeout
+        # Idle sessions, most recently used last; guarded by _available with _created
+        self._idle = []
+        self._created = 0
+        self._available = threading.Condition()
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._inflight = {}
+        self.upstream_calls = 0
+        self.cache_hits = 0
+
+    # Session pool
+
+    def _warm(self, scraper):
+        html = scraper.get_initial_page()
+        if not html:
+            raise RuntimeError('Failed to load the NRLM landing page')
+        scraper.landing_html = html
+        scraper.warmed_at = time.time()
+        return scraper
+
+    def _acquire(self):
+        deadline = time.time() + self.wait_timeout
+        with self._available:
+            while not self._idle and self._created >= self.size:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise NRLMPoolTimeout(f'All {self.size} NRLM sessions stayed busy for {self.wait_timeout}s')
+                self._available.wait(remaining)
+            scraper = self._idle.pop() if self._idle else None
+            if scraper is None:
+                self._created += 1
+        if scraper is None:
+            try:
+                return self._warm(self.scraper_factory())
+            except Exception:
+                with self._available:
+                    self._created -= 1
+                    self._available.notify()
+                raise
+
+        if time.time() - scraper.warmed_at > self.session_max_age:
+            try:
+                self._warm(scraper)
+            except Exception:
+                self._discard(scraper)
+                raise
+        return scraper
+
+    def _release(self, scraper):
+        with self._available:
+            self._idle.append(scraper)
+            self._available.notify()
+
+    def _discard(self, scraper):
+        try:
+            scraper.session.close()
+        except Exception:
+            pass
+        with self._available:
+            self._created -= 1
+            # A waiter may warm a new session in the freed slot
+            self._available.notify()
+
+    def run(self, fetch):
+        """Run ``fetch(scraper)`` on a pooled session, re-warming once on failure.
+
+        ``fetch`` must return a list; anything else (the scrapers return
+        {} on errors) counts as a failed call.
+        """
+        scraper = self._acquire()
+        try:
+            self.upstream_calls += 1
+            result = fetch(scraper)
+            if not isinstance(result, list):
+                # Token or session expired: warm again and retry once
+                self._warm(scraper)
+                self.upstream_calls += 1
+                result = fetch(scraper)
+            if not isinstance(result, list):
+                raise RuntimeError('NRLM request failed')
+        except Exception:
+            self._discard(scraper)
+            raise
+        self._release(scraper)
+        return result
+
+    # Cached hierarchy lists
+
+    def _cached(self, key, fetch):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and entry[0] > time.time():
+                self.cache_hits += 1
+                return entry[1]
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+
+        if not leader:
+            if not flight.event.wait(self.wait_timeout):
+                raise TimeoutError(f"Timed out waiting for NRLM {key[0]}")
+            if flight.error:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self.run(fetch)
+            with self._lock:
+                ttl = self.ttl if flight.result else self.empty_ttl
+                self._cache[key] = (time.time() + ttl, flight.result)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def states(self):
+        return self._cached(('states',), lambda s: s.extract_states(s.landing_html))
+
+    def districts(self, state_code):
+        return self._cached(('districts', state_code),
+                            lambda s: s.get_districts(state_code))
+
+    def blocks(self, state_code, district_code):
+        return self._cached(('blocks', state_code, district_code),
+                            lambda s: s.get_blocks(state_code, district_code))
+
+    def grampanchayats(self, state_code, district_code, block_code):
+        return self._cached(('grampanchayats', state_code, district_code, block_code),
+                            lambda s: s.get_grampanchayats(state_code, district_code, block_code))
+
+    def villages(self, state_code, district_code, block_code, grampanchayat_code):
+        return self._cached(('villages', state_code, district_code, block_code, grampanchayat_code),
+                            lambda s: s.get_villages(state_code, district_code, block_code, grampanchayat_code))
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self):
+        return {
+            'sessions': self._created,
+            'idle_sessions': len(self._idle),
+            'cached_lists': len(self._cache),
+            'cache_hits': self.cache_hits,
+            'upstream_calls': self.upstream_calls
+        }
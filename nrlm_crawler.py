@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+NRLM SHG Members Crawler
+Walks district -> block -> grampanchayat -> village -> SHG members for a
+whole state (or a single district) with bounded thread concurrency and a
+per-host rate limit. Progress is checkpointed to SQLite, so running the
+same command again after an interruption resumes where it stopped.
+
+Usage: python nrlm_crawler.py --state 24 [--district 2401] [--workers 4] [--rate 2]
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from http_fetch import RateLimiter
+from nrlm_client import NRLMClientPool
+
+# Level of a node -> level of its children
+CHILD_LEVEL = {
+    'state': 'district',
+    'district': 'block',
+    'block': 'grampanchayat',
+    'grampanchayat': 'village',
+    'village': None
+}
+CODE_COLUMNS = ['state_code', 'district_code', 'block_code', 'grampanchayat_code', 'village_code']
+LEVEL_CODE = dict(zip(['state', 'district', 'block', 'grampanchayat', 'village'], CODE_COLUMNS))
+
+
+class NRLMCrawler:
+    """Checkpointed crawl of the NRLM hierarchy down to SHG members"""
+
+    def __init__(self, scraper_factory, save_members, db_path='users.db', workers=4, rate=2.0, max_attempts=3):
+        self.pool = NRLMClientPool(scraper_factory, size=workers)
+        self.save_members = save_members
+        self.db_path = db_path
+        self.workers = workers
+        self.limiter = RateLimiter(rate)
+        self.max_attempts = max_attempts
+        self.init_checkpoint_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def init_checkpoint_db(self):
+        conn = self._connect()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS nrlm_crawl_nodes (
+                level TEXT NOT NULL,
+                state_code TEXT NOT NULL DEFAULT '',
+                district_code TEXT NOT NULL DEFAULT '',
+                block_code TEXT NOT NULL DEFAULT '',
+                grampanchayat_code TEXT NOT NULL DEFAULT '',
+                village_code TEXT NOT NULL DEFAULT '',
+                names TEXT,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER DEFAULT 0,
+                members_count INTEGER DEFAULT 0,
+                error TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (level, state_code, district_code, block_code, grampanchayat_code, village_code)
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_nrlm_crawl_status ON nrlm_crawl_nodes(status, state_code, district_code)')
+        conn.commit()
+        conn.close()
+
+    def seed(self, state_code, state_name='', district_code=None, district_name=''):
+        """Insert the root node of the crawl (no-op when resuming)"""
+        codes = {'state_code': state_code}
+        names = {'state_name': state_name}
+        level = 'state'
+        if district_code:
+            codes['district_code'] = district_code
+            names['district_name'] = district_name
+            level = 'district'
+        conn = self._connect()
+        self._insert_nodes(conn, [(level, codes, names)])
+        conn.commit()
+        conn.close()
+
+    def _insert_nodes(self, conn, nodes):
+        conn.executemany('''
+            INSERT OR IGNORE INTO nrlm_crawl_nodes
+                (level, state_code, district_code, block_code, grampanchayat_code, village_code, names)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [(level, *[codes.get(c, '') for c in CODE_COLUMNS], json.dumps(names)) for level, codes, names in nodes])
+
+    def _pending(self, state_code, district_code=None):
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        query = '''
+            SELECT * FROM nrlm_crawl_nodes
+            WHERE status != 'done' AND attempts < ? AND state_code = ?
+        '''
+        params = [self.max_attempts, state_code]
+        if district_code:
+            query += " AND (district_code = ? OR level = 'state')"
+            params.append(district_code)
+        rows = [dict(row) for row in conn.execute(query, params).fetchall()]
+        conn.close()
+        return rows
+
+    def _fetch(self, node):
+        """Fetch the children (or members) of a node; runs on a worker thread"""
+        s, d, b, g, v = (node[c] for c in CODE_COLUMNS)
+        level = node['level']
+
+        def fetch(scraper):
+            self.limiter.wait()
+            if level == 'state':
+                return scraper.get_districts(s)
+            if level == 'district':
+                return scraper.get_blocks(s, d)
+            if level == 'block':
+                return scraper.get_grampanchayats(s, d, b)
+            if level == 'grampanchayat':
+                return scraper.get_villages(s, d, b, g)
+            return scraper.get_shg_members(s, d, b, g, v)
+
+        return self.pool.run(fetch)
+
+    def _complete(self, conn, node, items):
+        """Record a fetched node: insert children or save members, then mark done"""
+        level = node['level']
+        codes = {c: node[c] for c in CODE_COLUMNS}
+        names = json.loads(node['names'] or '{}')
+        key = [node['level']] + [node[c] for c in CODE_COLUMNS]
+
+        child_level = CHILD_LEVEL[level]
+        if child_level:
+            children = []
+            for item in items:
+                child_codes = dict(codes, **{LEVEL_CODE[child_level]: item['code']})
+                child_names = dict(names, **{f"{child_level}_name": item['name']})
+                children.append((child_level, child_codes, child_names))
+            self._insert_nodes(conn, children)
+            count = len(children)
+        else:
+            rows = [dict(codes, **{f"{lvl}_name": names.get(f"{lvl}_name", '') for lvl in LEVEL_CODE}, **member)
+                    for member in items]
+            if rows:
+                self.save_members(rows)
+            count = len(rows)
+
+        conn.execute('''
+            UPDATE nrlm_crawl_nodes
+            SET status = 'done', members_count = ?, error = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE level = ? AND state_code = ? AND district_code = ? AND block_code = ?
+              AND grampanchayat_code = ? AND village_code = ?
+        ''', [count] + key)
+
+    def _fail(self, conn, node, error):
+        key = [node['level']] + [node[c] for c in CODE_COLUMNS]
+        conn.execute('''
+            UPDATE nrlm_crawl_nodes
+            SET status = 'failed', attempts = attempts + 1, error = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE level = ? AND state_code = ? AND district_code = ? AND block_code = ?
+              AND grampanchayat_code = ? AND village_code = ?
+        ''', [str(error)[:500]] + key)
+
+    def _retry_failed(self, conn, state_code, district_code=None):
+        """Give the nodes that failed in earlier runs a fresh set of attempts"""
+        query = "UPDATE nrlm_crawl_nodes SET attempts = 0 WHERE status = 'failed' AND state_code = ?"
+        params = [state_code]
+        if district_code:
+            query += " AND (district_code = ? OR level = 'state')"
+            params.append(district_code)
+        conn.execute(query, params)
+        conn.commit()
+
+    def crawl(self, state_code, district_code=None):
+        """Process pending nodes level by level until nothing is left.
+
+        A node is tried up to ``max_attempts`` times per run; nodes that
+        failed in a previous run are retried.
+        """
+        conn = self._connect()
+        try:
+            self._retry_failed(conn, state_code, district_code)
+            while True:
+                nodes = self._pending(state_code, district_code)
+                if not nodes:
+                    break
+                print(f"Crawling {len(nodes)} pending nodes...")
+                with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                    futures = {executor.submit(self._fetch, node): node for node in nodes}
+                    for done, future in enumerate(as_completed(futures), 1):
+                        node = futures[future]
+                        try:
+                            self._complete(conn, node, future.result())
+                        except Exception as e:
+                            print(f"Error crawling {node['level']} {node[LEVEL_CODE[node['level']]]}: {e}")
+                            self._fail(conn, node, e)
+                        # Checkpoint after every node
+                        conn.commit()
+                        if done % 100 == 0:
+                            print(f"  {done}/{len(nodes)} nodes done")
+        finally:
+            conn.close()
+        return self.summary(state_code, district_code)
+
+    def summary(self, state_code, district_code=None):
+        conn = self._connect()
+        query = "SELECT level, status, COUNT(*), SUM(members_count) FROM nrlm_crawl_nodes WHERE state_code = ?"
+        params = [state_code]
+        if district_code:
+            query += " AND district_code = ?"
+            params.append(district_code)
+        rows = conn.execute(query + " GROUP BY level, status", params).fetchall()
+        conn.close()
+        return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Crawl NRLM SHG members for a state or district')
+    parser.add_argument('--state', required=True, help='NRLM state code')
+    parser.add_argument('--state-name', default='', help='State name stored with the members')
+    parser.add_argument('--district', help='Limit the crawl to one district code')
+    parser.add_argument('--district-name', default='', help='District name stored with the members')
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent NRLM sessions')
+    parser.add_argument('--rate', type=float, default=2.0, help='Requests per second to nrlm.gov.in')
+    parser.add_argument('--db', default='users.db', help='SQLite database for crawl checkpoints (members are saved to users.db)')
+    args = parser.parse_args()
+
+    from app import WorkingNRLMScraper, save_nrlm_data_to_db
+
+    crawler = NRLMCrawler(WorkingNRLMScraper, save_nrlm_data_to_db, db_path=args.db,
+                          workers=args.workers, rate=args.rate)
+    crawler.seed(args.state, args.state_name, args.district, args.district_name)
+    summary = crawler.crawl(args.state, args.district)
+
+    print("\nCrawl summary:")
+    for level, status, count, members in summary:
+        print(f"  {level:<14} {status:<8} {count:>7} nodes  {members or 0:>8} items")
+    failed = sum(count for _, status, count, _ in summary if status == 'failed')
+    if failed:
+        print(f"⚠️  {failed} nodes failed; run the same command again to retry them")
+        sys.exit(1)
+    print("✅ Crawl complete")
+
+
+if __name__ == "__main__":
+    main()
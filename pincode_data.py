@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Pincode Directory Snapshot
+Converts pincodes.csv (all-India post office directory) into a columnar,
+memory-mappable Feather snapshot and reads it back column by column.
+Also provides the state/district/pincode lookups used by the views.
+
+Usage: python pincode_data.py [pincodes.csv] [pincodes.feather]
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.feather as pa_feather
+except ImportError:
+    pa_feather = None
+
+PINCODES_CSV = 'pincodes.csv'
+PINCODES_SNAPSHOT = 'pincodes.feather'
+
+# Low-cardinality text columns stored as categoricals
+CATEGORY_COLUMNS = ['circlename', 'regionname', 'divisionname', 'statename', 'district', 'officetype', 'delivery']
+
+
+def _prepare_frame(df):
+    """Normalize a raw pincodes frame: lowercase columns, int32 pincode, categoricals"""
+    df.columns = [str(c).strip().lower() for c in df.columns]
+    if 'pincode' in df.columns:
+        pins = pd.to_numeric(df['pincode'], errors='coerce')
+        df = df[pins.notna()].copy()
+        df['pincode'] = pins[pins.notna()].astype('int32')
+    for column in df.columns:
+        if column in CATEGORY_COLUMNS:
+            df[column] = df[column].astype(str).str.strip().replace({'nan': None}).astype('category')
+        elif df[column].dtype == object:
+            df[column] = df[column].astype(str).str.strip()
+    return df.reset_index(drop=True)
+
+
+def build_snapshot(csv_path=PINCODES_CSV, snapshot_path=PINCODES_SNAPSHOT):
+    """Convert the CSV into an uncompressed Feather file (zero-copy mmap reads)"""
+    if pa_feather is None:
+        raise RuntimeError('pyarrow is required to build the pincode snapshot')
+
+    df = _prepare_frame(pd.read_csv(csv_path, low_memory=False, dtype=str))
+    tmp_path = f"{snapshot_path}.tmp"
+    df.to_feather(tmp_path, compression='uncompressed')
+    os.replace(tmp_path, snapshot_path)
+    print(f"Pincode snapshot: wrote {len(df)} rows to {snapshot_path}")
+    return len(df)
+
+
+def snapshot_is_fresh(csv_path=PINCODES_CSV, snapshot_path=PINCODES_SNAPSHOT):
+    """True when the snapshot exists and is not older than the CSV"""
+    if not os.path.exists(snapshot_path):
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    return os.path.getmtime(snapshot_path) >= os.path.getmtime(csv_path)
+
+
+def ensure_snapshot(csv_path=PINCODES_CSV, snapshot_path=PINCODES_SNAPSHOT):
+    """(Re)build the snapshot if it is missing or stale; returns its path or None"""
+    if snapshot_is_fresh(csv_path, snapshot_path):
+        return snapshot_path
+    if pa_feather is None or not os.path.exists(csv_path):
+        return None
+    try:
+        build_snapshot(csv_path, snapshot_path)
+        return snapshot_path
+    except Exception as e:
+        print(f"Error building pincode snapshot: {str(e)}")
+        return None
+
+
+def read_pincodes(columns=None, csv_path=PINCODES_CSV, snapshot_path=PINCODES_SNAPSHOT):
+    """Read only the requested columns, from the snapshot when available"""
+    path = ensure_snapshot(csv_path, snapshot_path)
+    if path:
+        table = pa_feather.read_table(path, columns=list(columns) if columns else None, memory_map=True)
+        return table.to_pandas()
+
+    # No pyarrow: parse the CSV directly with the same dtypes
+    usecols = (lambda c: c.strip().lower() in columns) if columns else None
+    return _prepare_frame(pd.read_csv(csv_path, usecols=usecols, low_memory=False, dtype=str))
+
+
+def contains_mask(series, needle):
+    """Case-insensitive substring filter, evaluated once per category when possible"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        matched = np.flatnonzero(categories.astype(str).str.contains(needle, case=False, regex=False))
+        return pd.Series(np.isin(series.cat.codes.to_numpy(), matched), index=series.index)
+    return series.astype(str).str.contains(needle, case=False, regex=False, na=False)
+
+
+class PincodeHierarchy:
+    """State -> district -> pincode -> offices lookups built once from the directory.
+
+    Names are matched case-insensitively; an exact name is a dict lookup and
+    anything else falls back to a substring match over the (few hundred)
+    names, memoized per query. Each list comes with an ETag.
+    """
+
+    def __init__(self, df, memo_size=2048):
+        df = df.dropna(subset=['pincode']).sort_values('pincode', kind='mergesort').reset_index(drop=True)
+        self.offices_frame = df
+        self.memo_size = memo_size
+        self._memo = {}
+        self._lock = threading.Lock()
+
+        pairs = df[['statename', 'district']].dropna().astype(str).drop_duplicates()
+        self.states = sorted(pairs['statename'].unique().tolist())
+        self.all_districts = sorted(pairs['district'].unique().tolist())
+        self.districts_by_state = {}
+        for state, group in pairs.groupby('statename', sort=False):
+            self.districts_by_state[state.lower()] = sorted(group['district'].unique().tolist())
+
+        self.pincodes_by_district = {}
+        triples = df[['statename', 'district', 'pincode']].dropna().drop_duplicates()
+        for (state, district), group in triples.groupby(['statename', 'district'], observed=True, sort=False):
+            self.pincodes_by_district[(str(state).lower(), str(district).lower())] = sorted(int(pin) for pin in group['pincode'].unique())
+
+        # Offices of a pincode are a contiguous run of the pincode-sorted frame
+        pins = df['pincode'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, pins[1:] != pins[:-1]]) if len(pins) else np.array([], dtype=int)
+        ends = np.r_[starts[1:], len(pins)] if len(pins) else starts
+        self.office_ranges = {int(pins[start]): (int(start), int(end)) for start, end in zip(starts, ends)}
+
+    @staticmethod
+    def etag(payload):
+        return hashlib.sha1(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _memoized(self, key, compute):
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+        value = compute()
+        result = (value, self.etag(value))
+        with self._lock:
+            if len(self._memo) >= self.memo_size:
+                self._memo.pop(next(iter(self._memo)))
+            self._memo[key] = result
+        return result
+
+    def match_states(self, state):
+        """State names matching the query (exact match wins)"""
+        needle = state.strip().lower()
+        if not needle:
+            return list(self.states)
+        if needle in self.districts_by_state:
+            return [s for s in self.states if s.lower() == needle]
+        return [s for s in self.states if needle in s.lower()]
+
+    def districts(self, state=''):
+        """(sorted districts, etag) for a state query; all districts when empty"""
+        def compute():
+            if not state.strip():
+                return list(self.all_districts)
+            names = set()
+            for name in self.match_states(state):
+                names.update(self.districts_by_state.get(name.lower(), []))
+            return sorted(names)
+        return self._memoized(('districts', state.strip().lower()), compute)
+
+    def pincodes(self, state, district):
+        """(sorted pincodes, etag) for state/district queries"""
+        def compute():
+            key = (state.strip().lower(), district.strip().lower())
+            if key in self.pincodes_by_district:
+                return list(self.pincodes_by_district[key])
+            states = {name.lower() for name in self.match_states(state)}
+            needle = key[1]
+            pins = set()
+            for (state_name, district_name), values in self.pincodes_by_district.items():
+                if state_name in states and needle in district_name:
+                    pins.update(values)
+            return sorted(pins)
+        return self._memoized(('pincodes', state.strip().lower(), district.strip().lower()), compute)
+
+    def offices(self, pincode):
+        """Office records of one pincode"""
+        try:
+            office_range = self.office_ranges.get(int(pincode))
+        except (TypeError, ValueError):
+            return []
+        if not office_range:
+            return []
+        start, end = office_range
+        return self.offices_frame.iloc[start:end].to_dict('records')
+
+
+class PincodePager:
+    """Grouped-by-pincode pagination over the pincode-sorted office frame.
+
+    A filter (state, district, search) resolves to the sorted row positions
+    of the matching offices; groups are the runs of equal pincodes within
+    them. Both are cached per filter with LRU eviction, so a page is a
+    slice of the group table plus one gather of its rows.
+    """
+
+    def __init__(self, offices_frame, cache_size=128):
+        self.frame = offices_frame
+        self.cache_size = cache_size
+        self.pins = offices_frame['pincode'].to_numpy()
+        self._unique_pins = pd.unique(self.pins)
+        self._unique_pin_strings = pd.Index(self._unique_pins.astype(str))
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _filter_rows(self, state, district, search):
+        """Sorted row positions matching the filters (None for all rows)"""
+        mask = None
+        if state:
+            mask = contains_mask(self.frame['statename'], state).to_numpy()
+        if district:
+            district_mask = contains_mask(self.frame['district'], district).to_numpy()
+            mask = district_mask if mask is None else mask & district_mask
+        if search:
+            matched_pins = self._unique_pins[self._unique_pin_strings.str.contains(search, case=False, regex=False)]
+            search_mask = contains_mask(self.frame['officename'], search).to_numpy() | np.isin(self.pins, matched_pins)
+            mask = search_mask if mask is None else mask & search_mask
+        return None if mask is None else np.flatnonzero(mask)
+
+    def _groups(self, key):
+        """(row positions, group starts, group counts) for a filter key"""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return self._cache[key]
+            self.misses += 1
+
+        rows = self._filter_rows(*key)
+        pins = self.pins if rows is None else self.pins[rows]
+        if len(pins):
+            starts = np.flatnonzero(np.r_[True, pins[1:] != pins[:-1]])
+            counts = np.diff(np.r_[starts, len(pins)])
+        else:
+            starts = counts = np.array([], dtype=np.int64)
+        result = (rows, starts, counts)
+
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def page(self, state='', district='', search='', page=1, per_page=50):
+        """Return (groups, total_groups) for one page.
+
+        Each group is {'pincode', 'main', 'count', 'others'} where main is
+        the first office of the pincode and others the remaining ones.
+        """
+        rows, starts, counts = self._groups((state.strip(), district.strip(), search.strip()))
+        total = len(starts)
+        first = max(page - 1, 0) * per_page
+        page_starts = starts[first:first + per_page]
+        page_counts = counts[first:first + per_page]
+        if not len(page_starts):
+            return [], total
+
+        # Gather every office of the page's pincodes in one take
+        offsets = np.concatenate([np.arange(start, start + count) for start, count in zip(page_starts, page_counts)])
+        positions = offsets if rows is None else rows[offsets]
+        records = self.frame.iloc[positions].to_dict('records')
+        for record in records:
+            record['pincode'] = str(record['pincode'])
+
+        groups = []
+        cursor = 0
+        for count in page_counts:
+            offices = records[cursor:cursor + count]
+            cursor += count
+            groups.append({
+                'pincode': offices[0]['pincode'],
+                'main': offices[0],
+                'count': int(count),
+                'others': offices[1:]
+            })
+        return groups, total
+
+
+def main():
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else PINCODES_CSV
+    snapshot_path = sys.argv[2] if len(sys.argv) > 2 else PINCODES_SNAPSHOT
+    if not os.path.exists(csv_path):
+        print(f"❌ {csv_path} not found")
+        sys.exit(1)
+    build_snapshot(csv_path, snapshot_path)
+    print("✅ Snapshot ready")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import time
 import json
 import re
 from urllib.parse import urljoin, urlparse
+from supplier_dedup import dedupe_suppliers
 
 class RealCementSupplierScraper:
     def __init__(self):
@@ -383,15 +384,11 @@ class RealCementSupplierScraper:
                     print(f"❌ Error with {source['name']}: {str(e)}")
                     continue
         
-        # Remove duplicates
-        unique_suppliers = []
-        seen_names = set()
-        
-        for supplier in self.suppliers_data:
-            name = supplier.get('company_name', '').lower().strip()
-            if name and name not in seen_names:
-                seen_names.add(name)
-                unique_suppliers.append(supplier)
+        # Merge the same business listed by several sources
+        unique_suppliers = dedupe_suppliers(
+            [supplier for supplier in self.suppliers_data if supplier.get('company_name', '').strip()],
+            name_key='company_name'
+        )
         
         print(f"\n📊 Scraping completed!")
         print(f"Total suppliers found: {len(self.suppliers_data)}")
@@ -2,61 +2,73 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import csv
+import io
 import pandas as pd
 from datetime import datetime
 import time
 import re
+import http_fetch
+from change_tracker import ChangeTracker, summarize, write_json_if_changed, write_text_if_changed
 
 class RERAScraper:
     def __init__(self):
-        self.session = requests.Session()
+        self.session = http_fetch.session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         self.base_url = "https://rera.tn.gov.in"
         self.agents_url = "https://rera.tn.gov.in/registered-agents/tn"
         
-    def scrape_agents(self, max_pages=5):
-        """Scrape TN RERA registered agents"""
+    def scrape_agents(self, max_pages=5, changes=None):
+        """Scrape TN RERA registered agents
+        
+        With a change_tracker run, pages unchanged since the last run are not reparsed.
+        """
         print("🔍 Starting TN RERA registered agents scraping...")
         
         all_agents = []
         
-        try:
-            for page in range(1, max_pages + 1):
-                print(f"📄 Scraping page {page}...")
-                
-                # Try different URL patterns for pagination
-                page_urls = [
-                    f"{self.agents_url}?page={page}",
-                    f"{self.agents_url}/page/{page}",
-                    f"{self.agents_url}?p={page}",
-                    self.agents_url if page == 1 else f"{self.agents_url}?page={page}"
-                ]
-                
-                page_agents = []
-                for url in page_urls:
-                    try:
-                        response = self.session.get(url, timeout=30)
-                        response.raise_for_status()
-                        
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        page_agents = self.parse_agents_page(soup)
-                        
-                        if page_agents:
-                            print(f"✅ Found {len(page_agents)} agents on page {page}")
-                            break
-                            
-                    except Exception as e:
-                        print(f"⚠️ Error with URL {url}: {str(e)}")
-                        continue
-                
-                if not page_agents:
-                    print(f"❌ No agents found on page {page}, stopping...")
-                    break
+        def load_page(page):
+            print(f"📄 Scraping page {page}...")
+            
+            # Try different URL patterns for pagination
+            page_urls = [
+                f"{self.agents_url}?page={page}",
+                f"{self.agents_url}/page/{page}",
+                f"{self.agents_url}?p={page}",
+                self.agents_url if page == 1 else f"{self.agents_url}?page={page}"
+            ]
+            
+            for url in page_urls:
+                try:
+                    response = self.session.get(url, timeout=30)
+                    response.raise_for_status()
                     
+                    page_agents = changes.cached_page(page, response.content) if changes else None
+                    if page_agents:
+                        print(f"✅ Page {page} unchanged ({len(page_agents)} agents)")
+                        return page_agents
+                    
+                    soup = BeautifulSoup(response.content, http_fetch.HTML_PARSER)
+                    page_agents = self.parse_agents_page(soup)
+                    
+                    if page_agents:
+                        print(f"✅ Found {len(page_agents)} agents on page {page}")
+                        if changes:
+                            changes.store_page(page, response.content, page_agents)
+                        return page_agents
+                        
+                except Exception as e:
+                    print(f"⚠️ Error with URL {url}: {str(e)}")
+                    continue
+            
+            print(f"❌ No agents found on page {page}, stopping...")
+            return []
+        
+        try:
+            # Pages load concurrently; the first empty page ends the list
+            for page, page_agents in http_fetch.paginate(load_page, first=1, last=max_pages, workers=3):
                 all_agents.extend(page_agents)
-                time.sleep(1)  # Be respectful to the server
                 
         except Exception as e:
             print(f"❌ Error scraping RERA agents: {str(e)}")
@@ -189,10 +201,10 @@ class RERAScraper:
                 }
             }
             
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(output_data, f, indent=2, ensure_ascii=False)
-            
-            print(f"✅ Data saved to {filename}")
+            if write_json_if_changed(filename, output_data):
+                print(f"✅ Data saved to {filename}")
+            else:
+                print(f"✅ {filename} is up to date")
             return True
         except Exception as e:
             print(f"❌ Error saving to JSON: {str(e)}")
@@ -201,22 +213,25 @@ class RERAScraper:
     def save_to_csv(self, data, filename="rera_agents.csv"):
         """Save data to CSV file"""
         try:
-            with open(filename, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['S.No', 'Registration Number', 'Name & Address', 'Type', 'Date', 'Source URL', 'Scraped At'])
-                
-                for i, agent in enumerate(data, 1):
-                    writer.writerow([
-                        i,
-                        agent.get('registration_number', ''),
-                        agent.get('name_address', ''),
-                        agent.get('type', ''),
-                        agent.get('date', ''),
-                        agent.get('source_url', ''),
-                        agent.get('scraped_at', '')
-                    ])
+            output = io.StringIO()
+            writer = csv.writer(output)
+            writer.writerow(['S.No', 'Registration Number', 'Name & Address', 'Type', 'Date', 'Source URL', 'Scraped At'])
             
-            print(f"✅ Data saved to {filename}")
+            for i, agent in enumerate(data, 1):
+                writer.writerow([
+                    i,
+                    agent.get('registration_number', ''),
+                    agent.get('name_address', ''),
+                    agent.get('type', ''),
+                    agent.get('date', ''),
+                    agent.get('source_url', ''),
+                    agent.get('scraped_at', '')
+                ])
+            
+            if write_text_if_changed(filename, output.getvalue()):
+                print(f"✅ Data saved to {filename}")
+            else:
+                print(f"✅ {filename} is up to date")
             return True
         except Exception as e:
             print(f"❌ Error saving to CSV: {str(e)}")
@@ -224,14 +239,17 @@ class RERAScraper:
 
 def main():
     scraper = RERAScraper()
+    changes = ChangeTracker('users.db').start('rera_agents')
     
     # Scrape agents (try 3 pages first)
-    agents = scraper.scrape_agents(max_pages=3)
+    agents = scraper.scrape_agents(max_pages=3, changes=changes)
     
     if agents:
+        print(summarize(changes.diff(agents, key='registration_number')))
+        
         # Save to files
-        scraper.save_to_json(agents)
-        scraper.save_to_csv(agents)
+        if scraper.save_to_json(agents) and scraper.save_to_csv(agents):
+            changes.commit()
         
         print(f"\n🎉 Successfully scraped {len(agents)} RERA agents!")
         print("📁 Files created:")
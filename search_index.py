@@ -0,0 +1,187 @@
+import os
+import re
+import threading
+from bisect import bisect_left
+
+# Separator placed between the searchable fields of a record so that a
+# query can never match across two fields
+FIELD_SEP = '\x00'
+
+_TOKEN_RE = re.compile(r'[0-9a-z]+')
+
+
+def _clean(value):
+    """Convert a raw field value (possibly None/NaN) to lowercase text"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value != value:
+        return ''
+    return str(value).strip().lower()
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _intersect(postings):
+    """Intersect sorted posting lists, smallest first"""
+    postings = sorted(postings, key=len)
+    result = postings[0]
+    for other in postings[1:]:
+        other_set = set(other)
+        result = [doc_id for doc_id in result if doc_id in other_set]
+        if not result:
+            break
+    return result
+
+
+class _SourceIndex:
+    """Token and trigram postings for the records of a single module"""
+
+    def __init__(self, haystacks, results):
+        self.haystacks = haystacks
+        self.results = results
+        self.trigrams = {}
+        tokens = {}
+
+        for doc_id, text in enumerate(haystacks):
+            for gram in _trigrams(text):
+                self.trigrams.setdefault(gram, []).append(doc_id)
+            for token in set(_TOKEN_RE.findall(text)):
+                tokens.setdefault(token, []).append(doc_id)
+
+        self.tokens = tokens
+        self.sorted_tokens = sorted(tokens)
+
+    def _prefix_candidates(self, query):
+        """Documents having a token that starts with a short query"""
+        doc_ids = set()
+        start = bisect_left(self.sorted_tokens, query)
+        for token in self.sorted_tokens[start:]:
+            if not token.startswith(query):
+                break
+            doc_ids.update(self.tokens[token])
+        return sorted(doc_ids)
+
+    def candidates(self, query):
+        if len(query) >= 3:
+            postings = []
+            for gram in _trigrams(query):
+                posting = self.trigrams.get(gram)
+                if not posting:
+                    return []
+                postings.append(posting)
+            return _intersect(postings)
+        if _TOKEN_RE.fullmatch(query):
+            return self._prefix_candidates(query)
+        # Very short queries with punctuation fall back to a scan
+        return range(len(self.haystacks))
+
+    def search(self, query, limit):
+        matches = []
+        for doc_id in self.candidates(query):
+            # Postings only narrow the candidates down, the substring check
+            # keeps the original "query in field" semantics
+            if query in self.haystacks[doc_id]:
+                matches.append(self.results[doc_id])
+                if len(matches) >= limit:
+                    break
+        return matches
+
+
+class SearchIndex:
+    """In-process inverted index over the directory modules.
+
+    Each registered source is indexed once and rebuilt only when the
+    modification time of one of its files changes.
+    """
+
+    def __init__(self):
+        self._sources = []
+        self._indexes = {}
+        self._signatures = {}
+        self._lock = threading.Lock()
+
+    def register(self, module, paths, loader, fields, make_result):
+        """Register a module.
+
+        Args:
+            module (str): Module name, also the order of results.
+            paths (list): Files the loader reads, used for invalidation.
+            loader (callable): Returns the list of records.
+            fields (callable): Returns the searchable values of a record.
+            make_result (callable): Returns the result dict for a record.
+        """
+        self._sources.append({
+            'module': module,
+            'paths': list(paths),
+            'loader': loader,
+            'fields': fields,
+            'make_result': make_result
+        })
+
+    def _signature(self, source):
+        signature = []
+        for path in source['paths']:
+            try:
+                signature.append((path, os.stat(path).st_mtime))
+            except OSError:
+                signature.append((path, None))
+        return tuple(signature)
+
+    def _build(self, source):
+        haystacks = []
+        results = []
+        for record in source['loader']():
+            text = FIELD_SEP.join(_clean(value) for value in source['fields'](record))
+            if not text.strip(FIELD_SEP):
+                continue
+            haystacks.append(text)
+            results.append(source['make_result'](record))
+        return _SourceIndex(haystacks, results)
+
+    def refresh(self):
+        """Rebuild the index of every source whose files changed"""
+        for source in self._sources:
+            module = source['module']
+            signature = self._signature(source)
+            if module in self._indexes and self._signatures.get(module) == signature:
+                continue
+            with self._lock:
+                # Another request may have rebuilt it while we waited
+                if module in self._indexes and self._signatures.get(module) == signature:
+                    continue
+                try:
+                    self._indexes[module] = self._build(source)
+                    self._signatures[module] = signature
+                except Exception as e:
+                    print(f"Error indexing {module}: {str(e)}")
+                    self._indexes.setdefault(module, _SourceIndex([], []))
+
+    def refresh_in_background(self):
+        """Build the index on a daemon thread; a search that comes first waits for its sources"""
+        thread = threading.Thread(target=self.refresh, name='search-index', daemon=True)
+        thread.start()
+        return thread
+
+    def search(self, query, limit=50):
+        """Return up to ``limit`` result dicts whose fields contain the query"""
+        query = _clean(query)
+        if not query:
+            return []
+
+        self.refresh()
+
+        results = []
+        for source in self._sources:
+            index = self._indexes.get(source['module'])
+            if index is None:
+                continue
+            results.extend(index.search(query, limit - len(results)))
+            if len(results) >= limit:
+                break
+        return results
+
+    def stats(self):
+        """Number of indexed documents per module"""
+        return {module: len(index.haystacks) for module, index in self._indexes.items()}
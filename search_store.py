@@ -0,0 +1,195 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _text(value):
+    """Convert a raw field value (possibly None/NaN) to text"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value != value:
+        return ''
+    return str(value).strip()
+
+
+def build_match_query(query):
+    """Turn free text into an FTS5 prefix query, e.g. 'abc de' -> '"abc"* "de"*'"""
+    tokens = _WORD_RE.findall(query.lower())
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def file_signature(*paths):
+    """Signature callable based on the mtime/size of source files"""
+    def signature():
+        parts = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+                parts.append(f"{path}:{st.st_mtime}:{st.st_size}")
+            except OSError:
+                parts.append(f"{path}:missing")
+        return '|'.join(parts)
+    return signature
+
+
+def table_signature(db_path, table):
+    """Signature callable based on the row count and last change of a table"""
+    def signature():
+        conn = sqlite3.connect(db_path)
+        try:
+            row = conn.execute(f'SELECT COUNT(*), MAX(id), MAX(updated_at) FROM {table}').fetchone()
+            return '|'.join(str(value) for value in row)
+        except sqlite3.Error:
+            return 'missing'
+        finally:
+            conn.close()
+    return signature
+
+
+class SearchStore:
+    """SQLite FTS5 store shared by global search and the directory listings.
+
+    Every module is kept in one ``search_fts`` virtual table with three
+    columns (title, subtitle, body). Modules register their own column
+    weights, which are applied through bm25() when ranking.
+    """
+
+    def __init__(self, db_path='search.db', check_interval=5):
+        self.db_path = db_path
+        self.check_interval = check_interval
+        self._modules = {}
+        self._last_check = 0
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            conn.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+                    module UNINDEXED,
+                    ref UNINDEXED,
+                    title,
+                    subtitle,
+                    body,
+                    tokenize = 'unicode61 remove_diacritics 2',
+                    prefix = '2 3'
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS search_sources (
+                    module TEXT PRIMARY KEY,
+                    signature TEXT,
+                    row_count INTEGER,
+                    synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def register(self, module, loader, fields, signature, weights=(10.0, 4.0, 1.0)):
+        """Register a module.
+
+        Args:
+            module (str): Module key stored with every row.
+            loader (callable): Returns the list of records.
+            fields (callable): Returns (ref, title, subtitle, body) for a record.
+            signature (callable): Returns a string that changes with the source.
+            weights (tuple): bm25 weights for title, subtitle and body.
+        """
+        self._modules[module] = {
+            'loader': loader,
+            'fields': fields,
+            'signature': signature,
+            'weights': tuple(float(w) for w in weights)
+        }
+
+    def _sync_module(self, conn, module, config, signature):
+        rows = []
+        for position, record in enumerate(config['loader']()):
+            ref, title, subtitle, body = config['fields'](record)
+            rows.append((module, position if ref is None else ref,
+                         _text(title), _text(subtitle), _text(body)))
+
+        conn.execute('DELETE FROM search_fts WHERE module = ?', (module,))
+        conn.executemany('''
+            INSERT INTO search_fts (module, ref, title, subtitle, body)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+        conn.execute('''
+            INSERT OR REPLACE INTO search_sources (module, signature, row_count, synced_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (module, signature, len(rows)))
+        print(f"Search store: indexed {len(rows)} rows for {module}")
+
+    def sync(self, force=False):
+        """Re-index every module whose source signature changed"""
+        now = time.time()
+        if not force and now - self._last_check < self.check_interval:
+            return
+        with self._lock:
+            if not force and time.time() - self._last_check < self.check_interval:
+                return
+            conn = self._connect()
+            try:
+                stored = dict(conn.execute('SELECT module, signature FROM search_sources').fetchall())
+                for module, config in self._modules.items():
+                    try:
+                        signature = config['signature']()
+                        if not force and stored.get(module) == signature:
+                            continue
+                        self._sync_module(conn, module, config, signature)
+                        conn.commit()
+                    except Exception as e:
+                        conn.rollback()
+                        print(f"Error indexing {module} for search: {str(e)}")
+            finally:
+                conn.close()
+            self._last_check = time.time()
+
+    def _rank_expression(self, modules):
+        cases = ' '.join(
+            "WHEN '{}' THEN bm25(search_fts, 0, 0, {}, {}, {})".format(module, *self._modules[module]['weights'])
+            for module in modules
+        )
+        return f'CASE module {cases} ELSE bm25(search_fts) END'
+
+    def search(self, query, modules=None, limit=50):
+        """Ranked matches across modules as (module, ref, title, subtitle) tuples"""
+        match = build_match_query(query)
+        if not match:
+            return []
+        self.sync()
+
+        modules = [m for m in (modules or list(self._modules)) if m in self._modules]
+        if not modules:
+            return []
+        placeholders = ','.join('?' * len(modules))
+
+        conn = self._connect()
+        try:
+            cursor = conn.execute(f'''
+                SELECT module, ref, title, subtitle, {self._rank_expression(modules)} AS score
+                FROM search_fts
+                WHERE search_fts MATCH ? AND module IN ({placeholders})
+                ORDER BY score
+                LIMIT ?
+            ''', [match] + modules + [limit])
+            return [row[:4] for row in cursor.fetchall()]
+        except sqlite3.OperationalError as e:
+            print(f"Search store query failed: {str(e)}")
+            return []
+        finally:
+            conn.close()
+
+    def match_refs(self, module, query):
+        """All refs of one module matching the query, best match first"""
+        return [ref for _, ref, _, _ in self.search(query, modules=[module], limit=-1)]
@@ -0,0 +1,179 @@
+import glob
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+def _slug(value):
+    return re.sub(r'[^A-Za-z0-9]+', '-', str(value or '')).strip('-').lower()
+
+
+class SupplierCache:
+    """Two-tier cache of scraped supplier lists keyed by (pincode, category, location).
+
+    Entries live in a small in-memory LRU and as JSON lists in
+    ``cache_dir`` (the file mtime is the entry's age), so they survive
+    restarts. An entry older than ``ttl`` is still served, up to
+    ``max_stale``, while a background refresh replaces it.
+    """
+
+    def __init__(self, cache_dir='suppliers_cache', ttl=24 * 3600, max_stale=7 * 24 * 3600, memory_size=64):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.memory_size = memory_size
+        self._memory = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(pincode, category=None, location=None):
+        return (_slug(pincode), _slug(category), _slug(location))
+
+    def _path(self, key):
+        pincode, category, location = key
+        name = f"suppliers_{pincode}"
+        if category:
+            name += f"_{category}"
+        if location:
+            name += f"__{location}"
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    def _remember(self, key, stored_at, suppliers):
+        with self._lock:
+            self._memory[key] = (stored_at, suppliers)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Return (suppliers, age_seconds) or None when missing or too old"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry:
+                self._memory.move_to_end(key)
+        if entry is None:
+            path = self._path(key)
+            try:
+                stored_at = os.path.getmtime(path)
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = (stored_at, json.load(f))
+            except (OSError, ValueError):
+                return None
+            self._remember(key, *entry)
+
+        stored_at, suppliers = entry
+        age = time.time() - stored_at
+        if age > self.max_stale:
+            return None
+        return suppliers, age
+
+    def put(self, key, suppliers):
+        """Store a result in both tiers (written atomically on disk)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(suppliers, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._remember(key, time.time(), suppliers)
+
+    def _refresh(self, key, fetch):
+        try:
+            suppliers = fetch()
+            if suppliers:
+                self.put(key, suppliers)
+        except Exception as e:
+            print(f"Error refreshing suppliers cache for {key[0]}: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def refresh_in_background(self, key, fetch):
+        """Start one background refresh per key; returns False if one is running"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+        threading.Thread(target=self._refresh, args=(key, fetch), daemon=True).start()
+        return True
+
+    def get_or_fetch(self, key, fetch, force=False):
+        """Cached suppliers for a key, calling ``fetch()`` on a miss or when forced"""
+        if not force:
+            cached = self.get(key)
+            if cached:
+                suppliers, age = cached
+                if age > self.ttl:
+                    self.stale_hits += 1
+                    self.refresh_in_background(key, fetch)
+                else:
+                    self.hits += 1
+                return suppliers
+
+        self.misses += 1
+        suppliers = fetch()
+        # Empty results are usually a failed scrape; don't cache them
+        if suppliers:
+            self.put(key, suppliers)
+        return suppliers
+
+    def _pincode_files(self, pincode):
+        pincode = _slug(pincode)
+        pattern = os.path.join(self.cache_dir, f"suppliers_{pincode}")
+        return glob.glob(f"{pattern}.json") + glob.glob(f"{pattern}_*.json")
+
+    def status(self, pincode):
+        """Summary of the cached entries of one pincode"""
+        entries = []
+        for path in sorted(self._pincode_files(pincode)):
+            try:
+                age = time.time() - os.path.getmtime(path)
+                with open(path, 'r', encoding='utf-8') as f:
+                    count = len(json.load(f))
+            except (OSError, ValueError):
+                continue
+            entries.append({
+                'file': os.path.basename(path),
+                'age_hours': round(age / 3600, 2),
+                'count': count,
+                'stale': age > self.ttl
+            })
+        newest = min(entries, key=lambda e: e['age_hours']) if entries else None
+        return {
+            'exists': bool(entries),
+            'age_hours': newest['age_hours'] if newest else None,
+            'count': newest['count'] if newest else 0,
+            'stale': newest['stale'] if newest else False,
+            'entries': entries
+        }
+
+    def clear(self, pincode):
+        """Drop every cached entry of a pincode; returns the number of files removed"""
+        pincode = _slug(pincode)
+        with self._lock:
+            for key in [k for k in self._memory if k[0] == pincode]:
+                del self._memory[key]
+        removed = 0
+        for path in self._pincode_files(pincode):
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def stats(self):
+        return {
+            'memory_entries': len(self._memory),
+            'refreshing': len(self._refreshing),
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses
+        }
@@ -0,0 +1,258 @@
+import re
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+PLACEHOLDERS = {'', 'n/a', 'na', 'none', 'null', '-', '0'}
+
+# Words that don't tell two businesses apart
+NAME_STOPWORDS = {
+    'the', 'and', 'm', 's', 'ms', 'pvt', 'private', 'ltd', 'limited', 'llp',
+    'inc', 'co', 'company', 'corp', 'corporation'
+}
+
+# Name prefix length used to split an oversized block
+SPLIT_PREFIX = 8
+
+_GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Record key listing the fields a scraper made up itself (placeholder
+# addresses, random phones or coordinates): they never match two records
+GENERATED_KEY = 'generated'
+
+
+def is_missing(value):
+    return value is None or str(value).strip().lower() in PLACEHOLDERS
+
+
+def extracted(record, field):
+    """``record[field]``, or None when the scraper generated the value"""
+    if field in (record.get(GENERATED_KEY) or ()):
+        return None
+    return record.get(field)
+
+
+def normalize_name(name):
+    """Lowercase, drop punctuation and legal suffixes: 'M/s. ABC Pvt Ltd' -> 'abc'"""
+    if is_missing(name):
+        return ''
+    tokens = re.findall(r'[a-z0-9]+', str(name).lower().replace('&', ' and '))
+    return ' '.join(token for token in tokens if token not in NAME_STOPWORDS)
+
+
+def normalize_phone(phone):
+    """Last 10 digits of an Indian number, or '' when it isn't a usable phone"""
+    if is_missing(phone):
+        return ''
+    digits = re.sub(r'\D', '', str(phone))
+    if len(digits) < 8:
+        return ''
+    return digits[-10:]
+
+
+def geohash(latitude, longitude, precision=6):
+    """Standard base32 geohash (precision 6 is a cell of about 1.2 x 0.6 km)"""
+    try:
+        lat, lon = float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return ''
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    bits, bit_count, even, chars = 0, 0, True, []
+    while len(chars) < precision:
+        target, value = (lon_range, lon) if even else (lat_range, lat)
+        mid = (target[0] + target[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            target[0] = mid
+        else:
+            target[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_BASE32[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def normalize_address(address):
+    """Lowercase address words without punctuation, or '' when missing"""
+    if is_missing(address):
+        return ''
+    return ' '.join(re.findall(r'[a-z0-9]+', str(address).lower()))
+
+
+def name_similarity(a, b):
+    """Similarity of two normalized names in [0, 1]"""
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def name_contained(a, b):
+    """Whether the words of one name (two or more) all occur in the other.
+
+    'sri balaji concrete' vs 'sri balaji concrete products', but also
+    'sri cements' vs 'sri balaji cements and hardware': only evidence
+    of a match together with a shared phone or address.
+    """
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    return min(len(tokens_a), len(tokens_b)) >= 2 and (tokens_a <= tokens_b or tokens_b <= tokens_a)
+
+
+def _same_place(a, b, address_key, threshold):
+    phone = normalize_phone(extracted(a, 'phone'))
+    if phone and phone == normalize_phone(extracted(b, 'phone')):
+        return True
+    address_a = normalize_address(extracted(a, address_key))
+    address_b = normalize_address(extracted(b, address_key))
+    return bool(address_a and address_b) and SequenceMatcher(None, address_a, address_b).ratio() >= threshold
+
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+
+def _blocking_keys(record, name, precision):
+    keys = []
+    phone = normalize_phone(extracted(record, 'phone'))
+    if phone:
+        keys.append(('phone', phone))
+    cell = geohash(extracted(record, 'latitude'), extracted(record, 'longitude'), precision)
+    if cell:
+        keys.append(('geo', cell))
+    if name:
+        # Records without phone or coordinates still meet their namesakes
+        keys.append(('name', name[:4]))
+    return keys
+
+
+def _merge(records):
+    """Merge one cluster; every field keeps the source it came from"""
+    # The most complete record wins ties
+    ordered = sorted(records, key=lambda r: -sum(not is_missing(v) for v in r.values()))
+    merged = {}
+    provenance = {}
+    generated = set()
+    for record in ordered:
+        source = record.get('source') or 'unknown'
+        record_generated = set(record.get(GENERATED_KEY) or ())
+        for field, value in record.items():
+            if field in ('provenance', 'sources', 'duplicates', GENERATED_KEY):
+                continue
+            # An extracted value also replaces a generated one
+            if field not in merged or (not is_missing(value) and (
+                    is_missing(merged[field]) or (field in generated and field not in record_generated))):
+                merged[field] = value
+                if field in record_generated:
+                    generated.add(field)
+                else:
+                    generated.discard(field)
+                if not is_missing(value):
+                    provenance[field] = source
+    sources = []
+    for record in records:
+        for source in record.get('sources') or [record.get('source') or 'unknown']:
+            if source not in sources:
+                sources.append(source)
+    if generated:
+        merged[GENERATED_KEY] = sorted(generated)
+    merged['provenance'] = provenance
+    merged['sources'] = sources
+    merged['duplicates'] = sum(record.get('duplicates', 1) for record in records)
+    return merged
+
+
+def _link(members, kind, names, records, clusters, compared, threshold, address_key):
+    """Union the records of one block that describe the same business"""
+    required = threshold - 0.1 if kind == 'phone' else threshold
+    for position, i in enumerate(members):
+        for j in members[position + 1:]:
+            if (i, j) in compared or clusters.find(i) == clusters.find(j):
+                continue
+            compared.add((i, j))
+            if name_similarity(names[i], names[j]) >= required or (
+                    name_contained(names[i], names[j])
+                    and _same_place(records[i], records[j], address_key, threshold)):
+                clusters.union(i, j)
+
+
+def dedupe_suppliers(records, name_key='name', threshold=0.88, geohash_precision=6, max_block_size=200,
+                     address_key='address'):
+    """Merge records that describe the same business.
+
+    Candidates are only compared within blocks sharing a normalized phone,
+    a geohash cell or a name prefix, so the work stays close to linear.
+    Fields listed in a record's 'generated' key were made up by the
+    scraper and are neither blocked nor matched on. Within a block, names
+    are matched fuzzily; a shared phone number lowers the name threshold.
+    A name whose words are all part of the other name merges only when
+    the phone or the address matches too. An oversized block is split by
+    a longer name prefix; what is still too large is skipped and logged.
+
+    Args:
+        records (list): Supplier dicts.
+        name_key (str): Key holding the business name.
+        threshold (float): Minimum name (and address) similarity to merge.
+        address_key (str): Key holding the address.
+
+    Returns:
+        list: Merged records in first-seen order, each with 'provenance'
+        (field -> source), 'sources' and 'duplicates'.
+    """
+    names = [normalize_name(record.get(name_key)) for record in records]
+    blocks = defaultdict(list)
+    for index, record in enumerate(records):
+        for key in _blocking_keys(record, names[index], geohash_precision):
+            blocks[key].append(index)
+
+    clusters = _UnionFind(len(records))
+    compared = set()
+    skipped = 0
+    for (kind, value), members in blocks.items():
+        groups = [members]
+        if len(members) > max_block_size:
+            # Only compare the names that share a longer prefix
+            split = defaultdict(list)
+            for i in members:
+                split[names[i][:SPLIT_PREFIX]].append(i)
+            groups = split.values()
+        for group in groups:
+            if len(group) > max_block_size:
+                print(f"Supplier dedupe: not comparing {len(group)} records sharing {kind} {value!r}")
+                skipped += len(group)
+                continue
+            _link(group, kind, names, records, clusters, compared, threshold, address_key)
+    if skipped:
+        print(f"Supplier dedupe: {skipped} records in oversized blocks were not compared")
+
+    groups = defaultdict(list)
+    for index in range(len(records)):
+        groups[clusters.find(index)].append(index)
+
+    merged = []
+    for root in sorted(groups):
+        members = [records[i] for i in groups[root]]
+        if len(members) == 1 and 'provenance' not in members[0]:
+            record = dict(members[0])
+            source = record.get('source') or 'unknown'
+            record['provenance'] = {field: source for field, value in record.items() if not is_missing(value)}
+            record['sources'] = [source]
+            record['duplicates'] = 1
+            merged.append(record)
+        else:
+            merged.append(_merge(members))
+    return merged
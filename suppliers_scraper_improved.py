@@ -7,6 +7,7 @@ import re
 import urllib.parse
 import random
 from urllib.parse import quote
+from supplier_dedup import dedupe_suppliers
 
 class FreeSuppliersScraper:
     def __init__(self):
@@ -230,10 +231,15 @@ class FreeSuppliersScraper:
                 name = name_elem.get_text().strip()
             
             # Try to extract address
+            # Made-up fields (see supplier_dedup.GENERATED_KEY); the
+            # coordinates are the pincode's, not the business's
+            generated = ['email', 'latitude', 'longitude']
             address = f"Near {pincode}, Tamil Nadu"
             address_elem = card.find(['span', 'div'], class_=re.compile(r'(address|location)'))
             if address_elem:
                 address = address_elem.get_text().strip()
+            else:
+                generated.append('address')
             
             # Try to extract phone
             phone = "N/A"
@@ -260,7 +266,8 @@ class FreeSuppliersScraper:
                 'keyword': keyword,
                 'latitude': lat,
                 'longitude': lng,
-                'source': 'Google Search'
+                'source': 'Google Search',
+                'generated': generated
             }
             
         except Exception as e:
@@ -275,10 +282,14 @@ class FreeSuppliersScraper:
             if name_elem:
                 name = name_elem.get_text().strip()
             
+            # Made-up fields (see supplier_dedup.GENERATED_KEY)
+            generated = ['email', 'latitude', 'longitude']
             address = f"Near {pincode}, Tamil Nadu"
             address_elem = listing.find(['span', 'div'], class_=re.compile(r'(address|location)'))
             if address_elem:
                 address = address_elem.get_text().strip()
+            else:
+                generated.append('address')
             
             phone = "N/A"
             phone_elem = listing.find(['span', 'div'], class_=re.compile(r'(phone|contact)'))
@@ -303,7 +314,8 @@ class FreeSuppliersScraper:
                 'keyword': keyword,
                 'latitude': 11.0081,
                 'longitude': 77.0248,
-                'source': 'JustDial'
+                'source': 'JustDial',
+                'generated': generated
             }
             
         except Exception as e:
@@ -318,10 +330,14 @@ class FreeSuppliersScraper:
             if name_elem:
                 name = name_elem.get_text().strip()
             
+            # Made-up fields (see supplier_dedup.GENERATED_KEY)
+            generated = ['email', 'latitude', 'longitude']
             address = f"Near {pincode}, Tamil Nadu"
             address_elem = listing.find(['span', 'div'], class_=re.compile(r'(address|location)'))
             if address_elem:
                 address = address_elem.get_text().strip()
+            else:
+                generated.append('address')
             
             phone = "N/A"
             phone_elem = listing.find(['span', 'div'], class_=re.compile(r'(phone|contact)'))
@@ -346,7 +362,8 @@ class FreeSuppliersScraper:
                 'keyword': keyword,
                 'latitude': 11.0081,
                 'longitude': 77.0248,
-                'source': 'IndiaMART'
+                'source': 'IndiaMART',
+                'generated': generated
             }
             
         except Exception as e:
@@ -378,7 +395,9 @@ class FreeSuppliersScraper:
                 'keyword': keyword,
                 'latitude': 11.0081 + random.uniform(-0.01, 0.01),
                 'longitude': 77.0248 + random.uniform(-0.01, 0.01),
-                'source': 'Generated Sample'
+                'source': 'Generated Sample',
+                'generated': ['address', 'phone', 'email', 'website', 'rating', 'reviews_count',
+                              'latitude', 'longitude']
             })
         
         return suppliers
@@ -414,14 +433,8 @@ class FreeSuppliersScraper:
                         suppliers_data.extend(results)
                         continue
             
-            # Remove duplicates based on name and address
-            unique_suppliers = []
-            seen = set()
-            for supplier in suppliers_data:
-                key = (supplier['name'], supplier['address'])
-                if key not in seen:
-                    seen.add(key)
-                    unique_suppliers.append(supplier)
+            # Merge the same business found on Google, JustDial and IndiaMART
+            unique_suppliers = dedupe_suppliers(suppliers_data)
             
             print(f"Found {len(unique_suppliers)} unique suppliers for pincode {pincode}")
             return unique_suppliers
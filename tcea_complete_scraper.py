@@ -9,13 +9,16 @@ from bs4 import BeautifulSoup
 import time
 import json
 import csv
+import io
 from datetime import datetime
 import re
+import http_fetch
+from change_tracker import ChangeTracker, summarize, write_json_if_changed, write_text_if_changed
 
 class TCEACompleteScraper:
     def __init__(self):
         self.base_url = "https://tcea.in/"
-        self.session = requests.Session()
+        self.session = http_fetch.session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
@@ -25,41 +28,64 @@ class TCEACompleteScraper:
             'ec_members': [],
             'past_leaders': []
         }
+        # Optional change_tracker run: unchanged member pages are not reparsed
+        self.changes = None
+        # Member pages that could not be fetched in the last scrape_members()
+        self.failed_pages = []
     
     def scrape_members(self):
         """Scrape all members from 15 pages"""
         print("Scraping TCEA Members...")
-        for page_num in range(15):
+        
+        def load_page(page_num):
             if page_num == 0:
                 url = f"{self.base_url}members.html"
             else:
                 url = f"{self.base_url}members{page_num}.html"
             
-            try:
-                response = self.session.get(url, timeout=10)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Extract member names
-                all_text = soup.get_text()
-                lines = all_text.split('\n')
-                for line in lines:
-                    line = line.strip()
-                    if line.startswith('Er.') and len(line) > 5:
-                        name = re.sub(r'^#+\s*', '', line).strip()
-                        if name and name not in [m['name'] for m in self.all_data['members']]:
-                            self.all_data['members'].append({
-                                'name': name,
-                                'page': page_num,
-                                'url': url,
-                                'type': 'Member'
-                            })
-                
-                print(f"  Page {page_num}: Found members")
-                time.sleep(0.5)
-                
-            except Exception as e:
-                print(f"  Error scraping page {page_num}: {str(e)}")
+            response = self.session.get(url, timeout=10)
+            if response.status_code == 404:
+                # A missing page is empty; other errors fail the page
+                print(f"  Page {page_num}: not found")
+                return []
+            response.raise_for_status()
+            if self.changes is not None:
+                cached = self.changes.cached_page(page_num, response.content)
+                if cached is not None:
+                    print(f"  Page {page_num}: unchanged")
+                    return cached
+            soup = BeautifulSoup(response.content, http_fetch.HTML_PARSER)
+            
+            # Extract member names
+            names = []
+            for line in soup.get_text().split('\n'):
+                line = line.strip()
+                if line.startswith('Er.') and len(line) > 5:
+                    name = re.sub(r'^#+\s*', '', line).strip()
+                    if name:
+                        names.append((name, url))
+            print(f"  Page {page_num}: Found {len(names)} members")
+            if self.changes is not None:
+                self.changes.store_page(page_num, response.content, names)
+            return names
+        
+        # Pages load concurrently but are merged in page order; a single
+        # missing page doesn't end the list, three in a row do
+        seen = {m['name'] for m in self.all_data['members']}
+        pages = http_fetch.paginate(load_page, first=0, last=14, workers=4, stop_after_empty=3)
+        self.failed_pages = pages.failed
+        if self.failed_pages:
+            print(f"  Partial scrape: member pages {self.failed_pages} could not be fetched")
+        for page_num, names in pages:
+            for name, url in names:
+                if name not in seen:
+                    seen.add(name)
+                    self.all_data['members'].append({
+                        'name': name,
+                        'page': page_num,
+                        'url': url,
+                        'type': 'Member'
+                    })
     
     def scrape_office_bearers(self):
         """Scrape office bearers"""
@@ -68,7 +94,7 @@ class TCEACompleteScraper:
             url = f"{self.base_url}officebearers.html"
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, http_fetch.HTML_PARSER)
             
             # Extract office bearers
             all_text = soup.get_text()
@@ -101,7 +127,7 @@ class TCEACompleteScraper:
             url = f"{self.base_url}ecmembers.html"
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, http_fetch.HTML_PARSER)
             
             # Extract EC members
             all_text = soup.get_text()
@@ -131,7 +157,7 @@ class TCEACompleteScraper:
             url = f"{self.base_url}pastleaders.html"
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, http_fetch.HTML_PARSER)
             
             # Extract past leaders
             all_text = soup.get_text()
@@ -194,7 +220,7 @@ class TCEACompleteScraper:
         return self.all_data
     
     def save_to_json(self, filename="tcea_complete_data.json"):
-        """Save all data to JSON"""
+        """Save all data to JSON (left untouched if nothing changed)"""
         data = {
             'scraped_at': datetime.now().isoformat(),
             'source': 'TCEA (Tirupur Civil Engineers Association)',
@@ -202,38 +228,47 @@ class TCEACompleteScraper:
             'data': self.all_data
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        print(f"Complete data saved to {filename}")
+        if write_json_if_changed(filename, data):
+            print(f"Complete data saved to {filename}")
+        else:
+            print(f"{filename} is up to date")
     
     def save_to_csv(self, filename="tcea_complete_data.csv"):
         """Save all data to CSV"""
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Type', 'Name', 'Position', 'Period', 'Page', 'Source URL'])
-            
-            # Write all data
-            for data_type, records in self.all_data.items():
-                for record in records:
-                    writer.writerow([
-                        record.get('type', ''),
-                        record.get('name', ''),
-                        record.get('position', ''),
-                        record.get('period', ''),
-                        record.get('page', ''),
-                        record.get('url', '')
-                    ])
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['Type', 'Name', 'Position', 'Period', 'Page', 'Source URL'])
+        
+        # Write all data
+        for data_type, records in self.all_data.items():
+            for record in records:
+                writer.writerow([
+                    record.get('type', ''),
+                    record.get('name', ''),
+                    record.get('position', ''),
+                    record.get('period', ''),
+                    record.get('page', ''),
+                    record.get('url', '')
+                ])
         
-        print(f"Complete data saved to {filename}")
+        if write_text_if_changed(filename, output.getvalue()):
+            print(f"Complete data saved to {filename}")
+        else:
+            print(f"{filename} is up to date")
 
 def main():
     scraper = TCEACompleteScraper()
+    scraper.changes = ChangeTracker('users.db').start('tcea')
     data = scraper.scrape_all()
     
     if any(data.values()):
+        records = [record for records in data.values() for record in records]
+        print(summarize(scraper.changes.diff(records, key=('type', 'name', 'position'))))
         scraper.save_to_json()
         scraper.save_to_csv()
+        # A partial scrape must not become the baseline of the next run
+        if not scraper.failed_pages:
+            scraper.changes.commit()
         print("\n✅ All TCEA data successfully scraped and saved!")
     else:
         print("\n❌ No data found. Please check the website structure.")
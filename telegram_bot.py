@@ -26,6 +26,8 @@ from telegram.constants import ParseMode
 import requests
 from bs4 import BeautifulSoup
 import time
+from warehouse import Warehouse
+from db_connections import ConnectionManager
 
 # Configure logging
 logging.basicConfig(
@@ -38,6 +40,19 @@ logger = logging.getLogger(__name__)
 BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', 'YOUR_BOT_TOKEN_HERE')
 DATABASE_PATH = 'users.db'
 DATA_DIR = '/Users/apple/Desktop/Data'
+WAREHOUSE_DB = os.getenv('WAREHOUSE_DB', os.path.join(DATA_DIR, 'warehouse.db'))
+
+# Data sources served from the SQLite warehouse (see warehouse.py) instead of JSON files
+WAREHOUSE_SOURCES = {
+    "bai_members": "bai_directory",
+    "tcea_members": "tcea_members",
+    "credai_members": "credai_members",
+    "rera_agents": "rera_agents",
+    "ccmc_contractors": "ccmc_contractors",
+    "sr_offices": "sub_reg_offices",
+    "cbe_wards": "cbe_wards",
+    "pollachi_wards": "pollachi_wards"
+}
 
 # Conversation States
 MAIN_MENU, DATA_SOURCES, SEARCH, LOCATION, EXPORT, AUTH = range(6)
@@ -45,14 +60,17 @@ MAIN_MENU, DATA_SOURCES, SEARCH, LOCATION, EXPORT, AUTH = range(6)
 class DataExplorerBot:
     def __init__(self):
         self.db_path = DATABASE_PATH
+        # One WAL connection, so bot writes don't block the web app's reads
+        self.db = ConnectionManager(self.db_path)
         self.data_dir = DATA_DIR
         self.user_sessions = {}  # Store user session data
+        self.warehouse = None
         self.init_database()
         
     def init_database(self):
         """Initialize database connection"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.db.connect()
             cursor = conn.cursor()
             
             # Create users table if not exists
@@ -75,7 +93,7 @@ class DataExplorerBot:
     def get_user_data(self, telegram_id: int) -> Optional[Dict]:
         """Get user data from database"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.db.connect()
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM users WHERE telegram_id = ?', (telegram_id,))
             user = cursor.fetchone()
@@ -97,7 +115,7 @@ class DataExplorerBot:
     def create_user(self, telegram_id: int, username: str = None) -> bool:
         """Create new user in database"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.db.connect()
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT OR IGNORE INTO users (telegram_id, username, last_active)
@@ -113,7 +131,7 @@ class DataExplorerBot:
     def update_user_activity(self, telegram_id: int):
         """Update user's last active timestamp"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.db.connect()
             cursor = conn.cursor()
             cursor.execute('''
                 UPDATE users SET last_active = CURRENT_TIMESTAMP 
@@ -752,9 +770,20 @@ Need more help? Contact the administrator.
                 parse_mode=ParseMode.MARKDOWN
             )
     
+    def get_warehouse(self) -> Warehouse:
+        """Warehouse over the data directory, opened on first use"""
+        if self.warehouse is None:
+            self.warehouse = Warehouse(WAREHOUSE_DB, data_dir=self.data_dir)
+        return self.warehouse
+    
     async def load_data_source(self, data_source: str) -> Optional[List[Dict]]:
-        """Load data from JSON files"""
+        """Load data from the warehouse, or from JSON files for the other sources"""
         try:
+            if data_source in WAREHOUSE_SOURCES:
+                records = self.get_warehouse().rows(WAREHOUSE_SOURCES[data_source])
+                if records:
+                    return records
+            
             file_mapping = {
                 "bai_members": "bai_members_comprehensive.json",
                 "tcea_members": "tcea_complete_data.json",
@@ -0,0 +1,61 @@
+import os
+import threading
+import time
+
+from dataset_cache import DatasetCache
+
+
+def write(path, text, mtime_ns):
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_derived_is_built_once_under_concurrent_callers(tmp_path):
+    path = tmp_path / 'data.txt'
+    write(path, 'abc', 1_000_000_000)
+    cache = DatasetCache()
+    builds = []
+
+    def build(value):
+        builds.append(value)
+        time.sleep(0.05)
+        return {'index': value.upper()}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(
+        cache.derived(str(path), lambda p: open(p).read(), build))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert builds == ['abc']
+    assert all(result is results[0] for result in results)
+
+
+def test_derived_follows_its_entry(tmp_path):
+    path = tmp_path / 'data.txt'
+    write(path, 'abc', 1_000_000_000)
+    other = tmp_path / 'other.txt'
+    write(other, 'x' * 100, 1_000_000_000)
+    # Too small to hold both files
+    cache = DatasetCache(max_bytes=420)
+    read = lambda p: open(p).read()
+    builds = []
+
+    def build(value):
+        builds.append(value)
+        return [value]
+
+    first = cache.derived(str(path), read, build)
+    assert cache.derived(str(path), read, build) is first
+
+    # A changed file drops the entry and the index built over it
+    write(path, 'abcd', 2_000_000_000)
+    assert cache.derived(str(path), read, build) == ['abcd']
+
+    # So does eviction
+    cache.get(str(other), read)
+    assert cache.stats()['keys'] == ['other.txt:None']
+    assert cache.derived(str(path), read, build) == ['abcd']
+    assert builds == ['abc', 'abcd', 'abcd']
@@ -0,0 +1,88 @@
+import sqlite3
+import threading
+
+import pytest
+
+from db_connections import ConnectionManager
+
+
+def make_manager(tmp_path):
+    manager = ConnectionManager(str(tmp_path / 'users.db'))
+    with manager.transaction() as conn:
+        conn.execute('CREATE TABLE items (name TEXT)')
+    return manager
+
+
+def test_one_connection_per_thread(tmp_path):
+    manager = make_manager(tmp_path)
+    first = manager.connect()
+    second = manager.connect()
+    assert first._conn is second._conn
+    first.close()
+    second.close()
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(manager.connect()._conn))
+    thread.start()
+    thread.join()
+    assert other[0] is not first._conn
+    assert manager.connect().execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+
+def test_close_rolls_back_only_when_the_outermost_borrower_is_done(tmp_path):
+    manager = make_manager(tmp_path)
+    outer = manager.connect()
+    inner = manager.connect()
+    inner.execute("INSERT INTO items VALUES ('uncommitted')")
+    inner.row_factory = sqlite3.Row
+    inner.close()
+
+    # Still open for the outer borrower, with its row_factory restored
+    assert outer.in_transaction
+    assert outer.row_factory is None
+    outer.close()
+
+    conn = manager.connect()
+    assert not conn.in_transaction
+    assert conn.execute('SELECT COUNT(*) FROM items').fetchone()[0] == 0
+    conn.close()
+
+
+def test_transaction_commits_or_rolls_back(tmp_path):
+    manager = make_manager(tmp_path)
+    with manager.transaction() as conn:
+        conn.execute("INSERT INTO items VALUES ('kept')")
+    with pytest.raises(RuntimeError):
+        with manager.transaction() as conn:
+            conn.execute("INSERT INTO items VALUES ('dropped')")
+            raise RuntimeError('boom')
+
+    reader = sqlite3.connect(tmp_path / 'users.db')
+    assert reader.execute('SELECT name FROM items').fetchall() == [('kept',)]
+    reader.close()
+
+
+def test_readers_are_not_blocked_by_a_writer(tmp_path):
+    manager = make_manager(tmp_path)
+    with manager.transaction() as conn:
+        conn.execute("INSERT INTO items VALUES ('committed')")
+    writing = threading.Event()
+    done = threading.Event()
+    read = []
+
+    def writer():
+        with manager.transaction() as conn:
+            conn.execute("INSERT INTO items VALUES ('pending')")
+            writing.set()
+            done.wait(5)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    writing.wait(5)
+    reader = ConnectionManager(str(tmp_path / 'users.db'), busy_timeout=0.1).connect()
+    read.append(reader.execute('SELECT name FROM items').fetchall())
+    reader.close()
+    done.set()
+    thread.join()
+
+    assert read == [[('committed',)]]
@@ -0,0 +1,18 @@
+import pytest
+
+from enhanced_suppliers_scraper import EnhancedSuppliersScraper
+from supplier_cache import SupplierCache
+from webdriver_pool import WebDriverPool
+
+
+def broken_browser():
+    raise RuntimeError('chrome failed to start')
+
+
+def test_scrape_error_reaches_the_caller(tmp_path):
+    scraper = EnhancedSuppliersScraper(pool=WebDriverPool(broken_browser, size=1),
+                                       cache=SupplierCache(cache_dir=str(tmp_path)))
+
+    with pytest.raises(RuntimeError, match='chrome failed to start'):
+        scraper.scrape_by_pincode('641001', category='Cement')
+    assert scraper.cached_suppliers('641001', category='Cement') is None
@@ -0,0 +1,111 @@
+import gzip
+import os
+import sqlite3
+
+from flask import Flask
+
+from exports import ExportCache, csv_response, query_rows
+
+HEADER = ['Name', 'District']
+
+
+def make_app(cache, rows):
+    app = Flask(__name__)
+    app.config['rows_read'] = []
+
+    def read_rows():
+        for row in rows:
+            app.config['rows_read'].append(row)
+            yield row
+
+    @app.route('/export')
+    def export():
+        return cache.send('colleges', 'csv', 'v1', HEADER, read_rows, 'colleges.csv')
+
+    return app
+
+
+def test_miss_streams_then_hit_is_sent_from_cache(tmp_path):
+    cache = ExportCache(str(tmp_path))
+    rows = [(f'College {i}', 'Coimbatore') for i in range(2000)]
+    app = make_app(cache, rows)
+    client = app.test_client()
+
+    miss = client.get('/export', buffered=False)
+    assert miss.headers['Content-Disposition'] == 'attachment; filename=colleges.csv'
+    chunks = miss.response
+    first = next(iter(chunks))
+    # The first bytes are out before the cursor has been drained
+    assert first.startswith(b'Name,District')
+    assert len(app.config['rows_read']) < len(rows)
+    body = first + b''.join(chunks)
+    miss.close()
+
+    hit = client.get('/export')
+    assert cache.stats == {'hits': 1, 'misses': 1, 'evictions': 0}
+    assert hit.data == body
+    assert hit.headers['ETag']
+    assert client.get('/export', headers={'If-None-Match': hit.headers['ETag']}).status_code == 304
+
+
+def test_gzip_miss_matches_cached_copy(tmp_path):
+    cache = ExportCache(str(tmp_path))
+    app = make_app(cache, [('A', 'B'), ('C', None)])
+    client = app.test_client()
+
+    miss = client.get('/export', headers={'Accept-Encoding': 'gzip'})
+    body = miss.data
+    hit = client.get('/export', headers={'Accept-Encoding': 'gzip'})
+
+    assert miss.headers['Content-Encoding'] == hit.headers['Content-Encoding'] == 'gzip'
+    assert body == hit.data
+    assert gzip.decompress(hit.data).decode('utf-8').splitlines() == ['Name,District', 'A,B', 'C,']
+
+
+def test_aborted_stream_leaves_no_entry(tmp_path):
+    cache = ExportCache(str(tmp_path))
+    app = make_app(cache, [(f'College {i}', 'Salem') for i in range(2000)])
+    client = app.test_client()
+
+    miss = client.get('/export', buffered=False)
+    next(iter(miss.response))
+    miss.close()
+
+    assert os.listdir(tmp_path) == []
+    client.get('/export')
+    assert cache.stats['misses'] == 2
+
+
+def test_large_table_streams_from_the_cursor(tmp_path):
+    db_path = str(tmp_path / 'users.db')
+    conn = sqlite3.connect(db_path)
+    conn.execute('CREATE TABLE nrlm_data (state_name TEXT, member_name TEXT)')
+    conn.executemany('INSERT INTO nrlm_data VALUES (?, ?)', [('Tamil Nadu', f'Member {i}') for i in range(20000)])
+    conn.commit()
+    conn.close()
+    cache = ExportCache(str(tmp_path / 'cache'))
+    sql = 'SELECT state_name, member_name FROM nrlm_data ORDER BY rowid'
+    app = Flask(__name__)
+
+    @app.route('/cached')
+    def cached():
+        return cache.send('nrlm', 'csv', 'v1', HEADER, lambda: query_rows(db_path, sql), 'nrlm.csv')
+
+    @app.route('/direct')
+    def direct():
+        return csv_response('nrlm.csv', HEADER, query_rows(db_path, sql), compress=False)
+
+    client = app.test_client()
+    miss = client.get('/cached', buffered=False)
+    chunks = iter(miss.response)
+    first = next(chunks)
+    # The header goes out before the cache entry exists
+    assert first == b'Name,District\r\n'
+    assert not os.path.exists(tmp_path / 'cache' / f"{cache.key('nrlm', None, 'csv', 'v1')}.export")
+    body = first + b''.join(chunks)
+    miss.close()
+
+    assert body.count(b'\r\n') == 20001
+    assert client.get('/direct').data == body
+    assert client.get('/cached').data == body
+    assert cache.stats['hits'] == 1
@@ -0,0 +1,129 @@
+from selenium.common.exceptions import NoSuchWindowException
+
+from improved_selenium_scraper import ImprovedGoogleMapsScraper
+
+
+class FakeSwitch:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        if handle not in self.driver.window_handles:
+            raise NoSuchWindowException(handle)
+        self.driver.current_window_handle = handle
+
+
+class FakeDriver:
+    """Just enough of a WebDriver for tab handling: a closed window can't open tabs"""
+
+    def __init__(self):
+        self.window_handles = ['main']
+        self.current_window_handle = 'main'
+        self.switch_to = FakeSwitch(self)
+        self.opened = 0
+        self.blocked = set()
+        # (handle, url, blocked when the navigation started)
+        self.loads = []
+
+    def execute_script(self, script, *args):
+        if self.current_window_handle not in self.window_handles:
+            raise NoSuchWindowException('current window is closed')
+        if 'window.open' in script:
+            self.opened += 1
+            handle = f'tab{self.opened}'
+            self.window_handles.append(handle)
+        else:
+            handle = self.current_window_handle
+        if args[0] != 'about:blank':
+            self.loads.append((handle, args[0], handle in self.blocked))
+
+    def execute_cdp_cmd(self, command, params):
+        if command == 'Network.setBlockedURLs':
+            self.blocked.add(self.current_window_handle)
+
+    def find_elements(self, by, selector):
+        return ['result']
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+
+def test_more_searches_than_tabs():
+    driver = FakeDriver()
+    scraper = ImprovedGoogleMapsScraper(driver=driver)
+    scraper.extract_business_data_from_list = lambda: [{'name': scraper.current_keyword}]
+    searches = [('Cement', f'keyword {i}') for i in range(11)]
+
+    results = scraper.scrape_keywords_concurrently('641001', 'Coimbatore', searches, max_tabs=5)
+
+    assert sorted(r['name'] for r in results) == sorted(keyword for _, keyword in searches)
+    assert driver.opened == 11
+    assert driver.window_handles == ['main']
+    assert driver.current_window_handle == 'main'
+
+
+def test_every_tab_is_blocked_before_it_loads():
+    driver = FakeDriver()
+    driver.blocks_resources = True
+    scraper = ImprovedGoogleMapsScraper(driver=driver)
+    scraper.extract_business_data_from_list = lambda: []
+    searches = [('Cement', f'keyword {i}') for i in range(3)]
+
+    scraper.scrape_keywords_concurrently('641001', 'Coimbatore', searches, max_tabs=2)
+
+    assert len(driver.loads) == 3
+    assert all(blocked for _, _, blocked in driver.loads)
+    assert len({handle for handle, _, _ in driver.loads}) == 3
+
+
+def test_tabs_load_directly_without_blocking():
+    driver = FakeDriver()
+    scraper = ImprovedGoogleMapsScraper(driver=driver)
+    scraper.extract_business_data_from_list = lambda: []
+
+    scraper.scrape_keywords_concurrently('641001', 'Coimbatore', [('Cement', 'cement')], max_tabs=2)
+
+    assert driver.blocked == set()
+    assert [url for _, url, _ in driver.loads] == [scraper.search_url('cement near Coimbatore', 'Coimbatore')]
+
+
+class SlowTabDriver(FakeDriver):
+    """tab1's results take several polls to appear; the others are ready at once"""
+
+    def __init__(self, polls_for_first=6):
+        super().__init__()
+        self.polls_left = polls_for_first
+        self.events = []
+        self.most_tabs = 0
+
+    def execute_script(self, script, *args):
+        super().execute_script(script, *args)
+        if 'window.open' in script:
+            self.events.append(('open', self.window_handles[-1]))
+            self.most_tabs = max(self.most_tabs, len(self.window_handles) - 1)
+
+    def find_elements(self, by, selector):
+        if self.current_window_handle == 'tab1' and self.polls_left:
+            self.polls_left -= 1
+            return []
+        return ['result']
+
+    def close(self):
+        self.events.append(('close', self.current_window_handle))
+        super().close()
+
+
+def test_finished_tab_is_replaced_while_a_slow_one_loads(monkeypatch):
+    monkeypatch.setattr('improved_selenium_scraper.time.sleep', lambda seconds: None)
+    driver = SlowTabDriver()
+    scraper = ImprovedGoogleMapsScraper(driver=driver)
+    scraper.extract_business_data_from_list = lambda: [{'name': scraper.current_keyword}]
+    searches = [('Cement', f'keyword {i}') for i in range(5)]
+
+    results = scraper.scrape_keywords_concurrently('641001', 'Coimbatore', searches, max_tabs=2)
+
+    assert len(results) == 5
+    assert driver.most_tabs == 2
+    # Every other search ran in the second slot while tab1 was still loading
+    assert driver.events.index(('open', 'tab5')) < driver.events.index(('close', 'tab1'))
+    assert driver.window_handles == ['main']
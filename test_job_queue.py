@@ -0,0 +1,112 @@
+import sqlite3
+import threading
+import time
+
+from job_queue import JobQueue
+
+
+def make_queue(tmp_path, **kwargs):
+    queue = JobQueue(str(tmp_path / 'jobs.db'), workers=1, poll_interval=0.05, **kwargs)
+    return queue
+
+
+def wait_for(queue, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.02)
+    return queue.get(job_id)
+
+
+def test_runs_job_and_records_result(tmp_path):
+    queue = make_queue(tmp_path)
+    queue.register('double', lambda params, progress: params['n'] * 2)
+
+    job_id, created = queue.submit('double', {'n': 21})
+    job = wait_for(queue, job_id)
+
+    assert created
+    assert job['status'] == 'done'
+    assert job['result'] == 42
+
+
+def test_failed_handler_marks_job_failed(tmp_path):
+    queue = make_queue(tmp_path)
+
+    def broken(params, progress):
+        raise RuntimeError('scrape crashed')
+
+    queue.register('broken', broken)
+    job = wait_for(queue, queue.submit('broken', {})[0])
+
+    assert job['status'] == 'failed'
+    assert job['error'] == 'scrape crashed'
+
+
+def test_identical_active_job_is_deduplicated(tmp_path):
+    release = threading.Event()
+    queue = make_queue(tmp_path)
+    queue.register('slow', lambda params, progress: release.wait(5))
+
+    first, created = queue.submit('slow', {'pincode': '641001'})
+    second, duplicate_created = queue.submit('slow', {'pincode': '641001'})
+    other, _ = queue.submit('slow', {'pincode': '641002'})
+    release.set()
+
+    assert created and not duplicate_created
+    assert second == first
+    assert other != first
+    assert wait_for(queue, first)['status'] == 'done'
+    # Once finished, the same params can be submitted again
+    assert queue.submit('slow', {'pincode': '641001'})[1]
+
+
+def orphan(tmp_path, owner, seen_at):
+    """A job left 'running' by another process"""
+    queue = make_queue(tmp_path)
+    conn = sqlite3.connect(str(tmp_path / 'jobs.db'))
+    conn.execute('''
+        INSERT INTO background_jobs (id, kind, params, dedupe_key, status, created_at, started_at, owner, heartbeat_at)
+        VALUES ('orphan', 'double', '{"n": 2}', ?, 'running', ?, ?, ?, ?)
+    ''', (queue.dedupe_key('double', {'n': 2}), seen_at, seen_at, owner, seen_at))
+    conn.commit()
+    conn.close()
+
+
+def test_start_requeues_jobs_of_a_stopped_process(tmp_path):
+    orphan(tmp_path, 'otherhost:123:abcd', time.time() - 3600)
+    queue = make_queue(tmp_path)
+    queue.register('double', lambda params, progress: params['n'] * 2)
+
+    queue.start()
+    job = wait_for(queue, 'orphan')
+
+    assert job['status'] == 'done'
+    assert job['result'] == 4
+
+
+def test_start_leaves_jobs_of_a_live_worker_alone(tmp_path):
+    orphan(tmp_path, 'otherhost:123:abcd', time.time())
+    queue = make_queue(tmp_path)
+    queue.register('double', lambda params, progress: params['n'] * 2)
+
+    queue.start()
+    time.sleep(0.2)
+
+    assert queue.get('orphan')['status'] == 'running'
+    # Its dedupe key still points new submits at it
+    assert queue.submit('double', {'n': 2}) == ('orphan', False)
+
+
+def test_heartbeat_requeues_jobs_that_go_stale_later(tmp_path):
+    queue = make_queue(tmp_path, heartbeat_interval=0.05, stale_after=0.2)
+    queue.register('double', lambda params, progress: params['n'] * 2)
+    queue.start()
+    # Another worker claimed this job, then stopped sending heartbeats
+    orphan(tmp_path, 'otherhost:123:abcd', time.time())
+
+    job = wait_for(queue, 'orphan')
+
+    assert job['status'] == 'done'
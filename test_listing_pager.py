@@ -0,0 +1,82 @@
+import sqlite3
+
+from listing_pager import ListingPager
+
+
+def make_colleges(rows):
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE dce_colleges (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, district TEXT)')
+    conn.executemany('INSERT INTO dce_colleges (name, district) VALUES (?, ?)', rows)
+    conn.commit()
+    return conn
+
+
+def offset_page(conn, page, per_page):
+    return [dict(zip(('name', 'district'), row)) for row in conn.execute(
+        'SELECT name, district FROM dce_colleges ORDER BY district, name, id LIMIT ? OFFSET ?',
+        (per_page, (page - 1) * per_page))]
+
+
+def test_pages_match_offset_with_null_sort_keys():
+    rows = [(f'College {i}', None if i % 3 == 0 else f'District {i % 4}') for i in range(25)]
+    rows += [(None, None), (None, 'District 1')]
+    conn = make_colleges(rows)
+    pager = ListingPager('dce_colleges', order_by=('district', 'name'))
+
+    pages = [pager.page(conn, ['name', 'district'], page, 4) for page in range(1, 9)]
+
+    assert pages == [offset_page(conn, page, 4) for page in range(1, 9)]
+    assert sum(len(page) for page in pages) == len(rows)
+
+
+def test_revisiting_pages_after_null_anchor():
+    conn = make_colleges([(f'College {i}', None) for i in range(6)] + [('Last', 'Coimbatore')])
+    pager = ListingPager('dce_colleges', order_by=('district', 'name'))
+
+    for page in (1, 2, 3, 2, 3):
+        assert pager.page(conn, ['name', 'district'], page, 3) == offset_page(conn, page, 3)
+
+
+def traced(conn):
+    statements = []
+    conn.set_trace_callback(statements.append)
+    return statements
+
+
+def test_later_pages_seek_past_the_previous_page():
+    # Repeated (district, name) pairs: id has to break the ties
+    conn = make_colleges([(f'College {i % 5}', f'District {i % 3}') for i in range(40)])
+    pager = ListingPager('dce_colleges', order_by=('district', 'name'))
+    where, params = 'district != ?', ('District 1',)
+    expected = [dict(zip(('name', 'district'), row)) for row in conn.execute(
+        'SELECT name, district FROM dce_colleges WHERE district != ? ORDER BY district, name, id',
+        params)]
+
+    statements = traced(conn)
+    pages = [pager.page(conn, ['name', 'district'], page, 6, where, params) for page in range(1, 6)]
+
+    assert [row for page in pages for row in page] == expected
+    selects = [sql for sql in statements if sql.startswith('SELECT name')]
+    assert len(selects) == 5
+    assert all('(district, name, id) >' in sql and sql.endswith('OFFSET 0') for sql in selects[1:])
+
+
+def test_counts_and_facets_are_cached_until_the_table_changes():
+    conn = make_colleges([('A', 'Salem'), ('B', 'Erode'), ('C', None)])
+    pager = ListingPager('dce_colleges', order_by=('district', 'name'), facets=('district',))
+    assert pager.count(conn, 'district = ?', ('Salem',)) == 1
+    assert pager.facets(conn) == {'district': ['Erode', 'Salem']}
+    pager.page(conn, ['name'], 1, 2)
+
+    statements = traced(conn)
+    assert pager.count(conn, 'district = ?', ('Salem',)) == 1
+    assert pager.facets(conn) == {'district': ['Erode', 'Salem']}
+    assert not [sql for sql in statements if 'COUNT' in sql or 'DISTINCT' in sql]
+
+    conn.execute("INSERT INTO dce_colleges (name, district) VALUES ('D', 'Salem')")
+    conn.execute("UPDATE dce_colleges SET district = 'Karur' WHERE name = 'C'")
+    conn.commit()
+    assert pager.count(conn, 'district = ?', ('Salem',)) == 2
+    assert pager.facets(conn) == {'district': ['Erode', 'Karur', 'Salem']}
+    # Anchors from before the write are dropped as well
+    assert pager.page(conn, ['name', 'district'], 2, 2) == offset_page(conn, 2, 2)
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from nrlm_client import NRLMClientPool, NRLMPoolTimeout
+
+
+class FakeSession:
+    def close(self):
+        pass
+
+
+class FakeScraper:
+    created = 0
+
+    def __init__(self):
+        FakeScraper.created += 1
+        self.session = FakeSession()
+        self.blocks = [{'code': '1', 'name': 'Block'}]
+
+    def get_initial_page(self):
+        return '<html></html>'
+
+    def get_blocks(self, state_code, district_code):
+        return self.blocks
+
+
+def test_lists_are_cached_and_shared():
+    pool = NRLMClientPool(FakeScraper, size=2)
+
+    assert pool.blocks('33', '1') == [{'code': '1', 'name': 'Block'}]
+    assert pool.blocks('33', '1') == [{'code': '1', 'name': 'Block'}]
+    assert pool.stats()['upstream_calls'] == 1
+    assert pool.stats()['cache_hits'] == 1
+
+
+def test_concurrent_requests_share_one_upstream_call():
+    release = threading.Event()
+
+    class SlowScraper(FakeScraper):
+        def get_blocks(self, state_code, district_code):
+            release.wait(2)
+            return self.blocks
+
+    pool = NRLMClientPool(SlowScraper, size=4)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(pool.blocks('33', '1'))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 5
+    assert pool.stats()['upstream_calls'] == 1
+
+
+def test_empty_list_is_only_cached_briefly():
+    pool = NRLMClientPool(FakeScraper, size=1, empty_ttl=0)
+    scraper = pool._acquire()
+    scraper.blocks = []
+    pool._release(scraper)
+
+    assert pool.blocks('33', '1') == []
+    scraper.blocks = [{'code': '1', 'name': 'Block'}]
+    assert pool.blocks('33', '1') == [{'code': '1', 'name': 'Block'}]
+    assert pool.stats()['upstream_calls'] == 2
+
+
+def test_timeout_names_the_busy_pool():
+    pool = NRLMClientPool(FakeScraper, size=1, wait_timeout=0.1)
+    pool._acquire()
+
+    with pytest.raises(NRLMPoolTimeout, match='NRLM sessions'):
+        pool._acquire()
+
+
+def test_waiter_gets_a_session_when_one_is_discarded():
+    pool = NRLMClientPool(FakeScraper, size=1, wait_timeout=5)
+    busy = pool._acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool._acquire()))
+    waiter.start()
+    time.sleep(0.1)
+    pool._discard(busy)
+    waiter.join(2)
+
+    assert not waiter.is_alive()
+    assert got and got[0] is not busy
+    assert pool.stats()['sessions'] == 1
@@ -0,0 +1,62 @@
+from nrlm_crawler import NRLMCrawler
+
+
+class FakeScraper:
+    """NRLM scraper for one state with two districts; district 2 can be made to fail"""
+
+    outage = False
+
+    def get_initial_page(self):
+        return '<html></html>'
+
+    def get_districts(self, state_code):
+        return [{'code': '1', 'name': 'Coimbatore'}, {'code': '2', 'name': 'Tiruppur'}]
+
+    def get_blocks(self, state_code, district_code):
+        if district_code == '2' and FakeScraper.outage:
+            return {}
+        return [{'code': f'{district_code}1', 'name': 'Block'}]
+
+    def get_grampanchayats(self, state_code, district_code, block_code):
+        return [{'code': f'{block_code}1', 'name': 'Panchayat'}]
+
+    def get_villages(self, state_code, district_code, block_code, grampanchayat_code):
+        return [{'code': f'{grampanchayat_code}1', 'name': 'Village'}]
+
+    def get_shg_members(self, state_code, district_code, block_code, grampanchayat_code, village_code):
+        return [{'shg_name': 'SHG', 'member_name': f'Member {village_code}', 'member_code': village_code}]
+
+
+def make_crawler(tmp_path, saved):
+    crawler = NRLMCrawler(FakeScraper, saved.extend, db_path=str(tmp_path / 'crawl.db'), workers=2, rate=1000)
+    crawler.seed('33', 'Tamil Nadu')
+    return crawler
+
+
+def statuses(summary):
+    return {(level, status): count for level, status, count, _ in summary}
+
+
+def test_crawls_down_to_members(tmp_path):
+    FakeScraper.outage = False
+    saved = []
+
+    summary = make_crawler(tmp_path, saved).crawl('33')
+
+    assert sorted(member['member_name'] for member in saved) == ['Member 1111', 'Member 2111']
+    assert saved[0]['state_name'] == 'Tamil Nadu'
+    assert all(status == 'done' for (_, status) in statuses(summary))
+
+
+def test_failed_nodes_are_retried_by_the_next_run(tmp_path):
+    saved = []
+    FakeScraper.outage = True
+    summary = make_crawler(tmp_path, saved).crawl('33')
+    assert statuses(summary)[('district', 'failed')] == 1
+    assert [member['member_name'] for member in saved] == ['Member 1111']
+
+    FakeScraper.outage = False
+    summary = make_crawler(tmp_path, saved).crawl('33')
+
+    assert ('district', 'failed') not in statuses(summary)
+    assert sorted(member['member_name'] for member in saved) == ['Member 1111', 'Member 2111']
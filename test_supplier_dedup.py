@@ -0,0 +1,107 @@
+from supplier_dedup import dedupe_suppliers
+
+
+def supplier(name, phone='', address='', source='maps'):
+    return {'name': name, 'phone': phone, 'address': address, 'source': source}
+
+
+def names(records):
+    return sorted(record['name'] for record in records)
+
+
+def test_contained_name_without_shared_phone_or_address_is_kept_apart():
+    records = [
+        supplier('Sri Cements', '98430 11111', '12 Mill Road, Gandhipuram'),
+        supplier('Sri Balaji Cements & Hardware', '98430 22222', '4 Trichy Road, Singanallur'),
+    ]
+
+    assert names(dedupe_suppliers(records)) == ['Sri Balaji Cements & Hardware', 'Sri Cements']
+
+
+def test_contained_name_without_contact_details_is_kept_apart():
+    records = [supplier('Sri Cements'), supplier('Sri Balaji Cements & Hardware')]
+
+    assert len(dedupe_suppliers(records)) == 2
+
+
+def test_contained_name_with_same_phone_is_merged():
+    records = [
+        supplier('Sri Balaji Concrete', '+91 98430 11111', source='maps'),
+        supplier('Sri Balaji Concrete Products', '9843011111', '7 Avinashi Road', source='justdial'),
+    ]
+
+    merged = dedupe_suppliers(records)
+
+    assert len(merged) == 1
+    assert merged[0]['sources'] == ['maps', 'justdial']
+    assert merged[0]['address'] == '7 Avinashi Road'
+
+
+def test_contained_name_with_same_address_is_merged():
+    records = [
+        supplier('Sri Balaji Concrete', address='No. 7, Avinashi Road, Coimbatore'),
+        supplier('Sri Balaji Concrete Products', address='No 7 Avinashi Road Coimbatore'),
+    ]
+
+    assert len(dedupe_suppliers(records)) == 1
+
+
+def test_near_miss_names_at_the_same_phone_are_not_merged():
+    # Two shops sharing a landline but with unrelated names
+    records = [supplier('Kumar Steels', '0422 2345678'), supplier('Kavin Tiles', '0422 2345678')]
+
+    assert len(dedupe_suppliers(records)) == 2
+
+
+def test_spelling_variants_are_merged():
+    records = [supplier('Sri Murugan Hardwares', '98430 11111'), supplier('Sree Murugan Hardware', '98430 11111')]
+
+    assert len(dedupe_suppliers(records)) == 1
+
+
+def test_generated_phone_and_coordinates_are_not_matched_on():
+    # Placeholder coordinates and a made-up phone shared by unrelated shops
+    records = [
+        dict(supplier('Sri Cements', '98430 11111'), latitude=11.0081, longitude=77.0248,
+             generated=['phone', 'latitude', 'longitude']),
+        dict(supplier('Sri Balaji Cements & Hardware', '98430 11111'), latitude=11.0081, longitude=77.0248,
+             generated=['phone', 'latitude', 'longitude']),
+    ]
+
+    assert len(dedupe_suppliers(records)) == 2
+
+
+def test_generated_address_is_not_matched_on():
+    records = [
+        supplier('Sri Balaji Concrete', address='Near 641001, Tamil Nadu'),
+        dict(supplier('Sri Balaji Concrete Products', address='Near 641001, Tamil Nadu'), generated=['address']),
+    ]
+
+    assert len(dedupe_suppliers(records)) == 2
+
+
+def test_extracted_value_replaces_generated_one_on_merge():
+    records = [
+        dict(supplier('Kumar Hardwares', '0422 1111111', '5 Big Bazaar Street', source='maps'),
+             rating='4.1', generated=['phone']),
+        supplier('Kumar Hardware', '98430 22222', '5 Big Bazaar Street', source='justdial'),
+    ]
+
+    merged = dedupe_suppliers(records)
+
+    assert len(merged) == 1
+    assert merged[0]['phone'] == '98430 22222'
+    assert merged[0]['provenance']['phone'] == 'justdial'
+    assert 'generated' not in merged[0]
+
+
+def test_oversized_block_is_split_by_longer_prefix():
+    # Every name shares the 'sri ' block, which is too large to compare pairwise
+    words = ['Ganesh', 'Murugan', 'Lakshmi', 'Vinayaka', 'Amman', 'Krishna', 'Saravana', 'Kannan']
+    records = [supplier(f'Sri {word} Traders') for word in words]
+    records += [supplier('Sri Balaji Concretes'), supplier('Sri Balaji Concrete')]
+
+    merged = dedupe_suppliers(records, max_block_size=5)
+
+    assert len(merged) == len(records) - 1
+    assert merged[-1]['duplicates'] == 2
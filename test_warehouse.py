@@ -0,0 +1,74 @@
+import csv
+import json
+import sqlite3
+
+from warehouse import Warehouse
+
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+
+
+def make_warehouse(tmp_path):
+    return Warehouse(str(tmp_path / 'warehouse.db'), data_dir=str(tmp_path))
+
+
+def test_records_round_trip_unchanged(tmp_path):
+    agents = [
+        {'serial_no': '1', 'name': 'A One', 'address': None, 'type': 'Individual', 'mobile': '98'},
+        {'serial_no': 2, 'name': 'B Two', 'registration_number': 'TN/1', 'validity': ''},
+        {'serial_no': 'n/a', 'name': None},
+    ]
+    write_json(tmp_path / 'rera_agents.json', agents)
+    contractors = [{'serial_no': '10', 'name': 'C', 'class': 'I'}, {'serial_no': '9', 'name': 'D', 'phone': None}]
+    write_json(tmp_path / 'ccmc_contractors.json', {'data': {'contractors': contractors}})
+    wards = [{'ward_number': '1', 'ward_name': 'North', 'directions': {'east': 'Road'}},
+             {'ward_number': '2', 'ward_name': 'South', 'directions': None}]
+    write_json(tmp_path / 'coimbatore_wards.json', {'data': {'wards': wards}})
+    warehouse = make_warehouse(tmp_path)
+
+    assert warehouse.rows('rera_agents') == agents
+    assert warehouse.rows('ccmc_contractors') == contractors
+    assert warehouse.rows('cbe_wards') == wards
+
+
+def test_csv_strings_are_kept(tmp_path):
+    fields = ['company_name', 'contact_person', 'address', 'phone', 'email', 'page_number', 'source_url',
+              'scraped_at', 'notes']
+    with open(tmp_path / 'bai_coimbatore_refined.csv', 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerow({'company_name': 'Acme', 'page_number': '0', 'notes': 'x'})
+        writer.writerow({'company_name': 'Beta', 'page_number': ''})
+    warehouse = make_warehouse(tmp_path)
+
+    rows = warehouse.rows('bai_directory')
+
+    assert [row['page_number'] for row in rows] == ['0', '']
+    assert rows[0] == {name: '' for name in fields} | {'company_name': 'Acme', 'page_number': '0', 'notes': 'x'}
+
+
+def test_columns_stay_typed_for_queries(tmp_path):
+    write_json(tmp_path / 'ccmc_contractors.json', {'data': {'contractors': [
+        {'serial_no': '10', 'name': 'C'}, {'serial_no': '9', 'name': 'D'}, {'serial_no': '', 'name': 'E'}]}})
+    warehouse = make_warehouse(tmp_path)
+
+    names = [row['name'] for row in warehouse.rows('ccmc_contractors', where='serial_no IS NOT NULL',
+                                                     order_by='serial_no')]
+    assert names == ['D', 'C']
+    conn = sqlite3.connect(tmp_path / 'warehouse.db')
+    assert conn.execute('SELECT serial_no FROM wh_ccmc_contractors ORDER BY _pos').fetchall() == [(10,), (9,), (None,)]
+    conn.close()
+
+
+def test_schema_change_reloads(tmp_path):
+    write_json(tmp_path / 'pollachi_wards.json', {'wards': [{'ward_number': '1', 'ward_name': 'A'}]})
+    make_warehouse(tmp_path).rows('pollachi_wards')
+    conn = sqlite3.connect(tmp_path / 'warehouse.db')
+    conn.execute('PRAGMA user_version = 1')
+    conn.execute("UPDATE wh_pollachi_wards SET extra = NULL")
+    conn.commit()
+    conn.close()
+
+    assert make_warehouse(tmp_path).rows('pollachi_wards') == [{'ward_number': '1', 'ward_name': 'A'}]
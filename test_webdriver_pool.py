@@ -0,0 +1,94 @@
+import threading
+import time
+
+import pytest
+
+from webdriver_pool import DriverPoolTimeout, WebDriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+
+    def execute_script(self, script):
+        if not self.alive:
+            raise RuntimeError('browser is gone')
+        return 1
+
+    def quit(self):
+        self.alive = False
+
+
+def test_reuses_idle_driver():
+    pool = WebDriverPool(FakeDriver, size=2)
+    with pool.checkout() as lease:
+        first = lease.driver
+    with pool.checkout() as lease:
+        assert lease.driver is first
+    assert pool.stats()['started'] == 1
+
+
+def test_recycles_after_max_pages():
+    pool = WebDriverPool(FakeDriver, size=1, max_pages=2)
+    with pool.checkout() as lease:
+        lease.pages = 2
+        first = lease.driver
+    assert not first.alive
+    with pool.checkout() as lease:
+        assert lease.driver is not first
+    assert pool.stats()['recycled'] == 1
+
+
+def test_times_out_when_all_busy():
+    pool = WebDriverPool(FakeDriver, size=1, wait_timeout=0.1)
+    with pool.checkout():
+        with pytest.raises(DriverPoolTimeout):
+            with pool.checkout():
+                pass
+
+
+def test_waiter_takes_the_slot_of_a_discarded_driver():
+    pool = WebDriverPool(FakeDriver, size=1, wait_timeout=5)
+    holder = pool.checkout()
+    lease = holder.__enter__()
+    got = []
+
+    def wait_for_driver():
+        with pool.checkout() as waiting:
+            got.append(waiting.driver)
+
+    waiter = threading.Thread(target=wait_for_driver)
+    waiter.start()
+    time.sleep(0.1)
+    # The busy driver dies and is discarded instead of going back idle
+    lease.broken = True
+    holder.__exit__(None, None, None)
+    waiter.join(2)
+
+    assert not waiter.is_alive()
+    assert got and got[0] is not lease.driver
+    assert pool.stats()['running'] == 1
+
+
+def test_never_runs_more_than_size():
+    pool = WebDriverPool(FakeDriver, size=2, wait_timeout=5)
+    busy, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work():
+        with pool.checkout():
+            with lock:
+                busy[0] += 1
+                peak[0] = max(peak[0], busy[0])
+            time.sleep(0.01)
+            with lock:
+                busy[0] -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak[0] == 2
+    assert pool.stats()['started'] == 2
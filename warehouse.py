@@ -0,0 +1,343 @@
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Version of the warehouse_datasets bookkeeping table and of the row
+# encoding (PRAGMA user_version); a change reloads every dataset
+SCHEMA_VERSION = 2
+
+_CONVERTERS = {
+    'INTEGER': int,
+    'REAL': float,
+    'TEXT': str
+}
+
+
+def _typed(value, sqltype):
+    """Convert a raw field to the column type; unparseable values become NULL"""
+    if value is None:
+        return None
+    if sqltype == 'JSON':
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, str) and value.strip() == '':
+        return None if sqltype != 'TEXT' else value
+    try:
+        return _CONVERTERS[sqltype](value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _read_csv(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def _tcea_records(raw):
+    for group, records in raw.get('data', {}).items():
+        for record in records:
+            yield {'group_name': group, **record}
+
+
+class Dataset:
+    """One source file (the first of ``sources`` that exists) loaded into one table.
+
+    ``extract(raw)`` turns the parsed file into records. Declared columns
+    are stored typed and indexed; any other fields of a record are kept in
+    an ``extra`` JSON column. ``extra`` also keeps the original value of a
+    declared field that typing changed (``'1'`` stored as 1) and the names
+    of declared fields the record lacked, so rows read back unchanged.
+    Bump ``version`` when the columns or extraction change.
+    """
+
+    def __init__(self, name, sources, extract, columns, indexes=(), version=1, reader=_read_json):
+        self.name = name
+        self.sources = sources
+        self.extract = extract
+        self.columns = columns
+        self.indexes = indexes
+        self.version = version
+        self.reader = reader
+
+    @property
+    def table(self):
+        return f"wh_{self.name}"
+
+
+DATASETS = [
+    Dataset(
+        'rera_agents', ['rera_agents_improved.json', 'rera_agents.json'],
+        lambda raw: raw if isinstance(raw, list) else raw.get('data', {}).get('agents', []),
+        [('serial_no', 'INTEGER'), ('registration_number', 'TEXT'), ('name', 'TEXT'), ('address', 'TEXT'),
+         ('type', 'TEXT'), ('validity', 'TEXT'), ('renewal', 'TEXT')],
+        indexes=[('name',), ('registration_number',), ('type',)]),
+    Dataset(
+        'ccmc_contractors', ['ccmc_contractors.json'],
+        lambda raw: raw.get('data', {}).get('contractors', []),
+        [('serial_no', 'INTEGER'), ('name', 'TEXT'), ('class', 'TEXT'), ('address', 'TEXT'),
+         ('phone', 'TEXT'), ('source', 'TEXT'), ('extracted_at', 'TEXT')],
+        indexes=[('name',), ('class',)]),
+    Dataset(
+        'credai_members', ['credai_members.json'],
+        lambda raw: raw.get('data', {}).get('members', []),
+        [('name', 'TEXT'), ('type', 'TEXT'), ('source_url', 'TEXT'), ('scraped_at', 'TEXT')],
+        indexes=[('name',)]),
+    Dataset(
+        'tcea_members', ['tcea_complete_data.json'],
+        lambda raw: list(_tcea_records(raw)),
+        [('group_name', 'TEXT'), ('name', 'TEXT'), ('position', 'TEXT'), ('period', 'TEXT'),
+         ('page', 'INTEGER'), ('url', 'TEXT'), ('type', 'TEXT')],
+        indexes=[('group_name', 'name')]),
+    Dataset(
+        'sub_reg_offices', ['sub_reg_offices.json'],
+        lambda raw: raw.get('data', []),
+        [('zone', 'TEXT'), ('office_name', 'TEXT'), ('designation_under_act', 'TEXT'), ('designation', 'TEXT'),
+         ('std_code', 'TEXT'), ('office_phone', 'TEXT'), ('home_phone', 'TEXT'), ('fax', 'TEXT'),
+         ('email', 'TEXT'), ('address', 'TEXT'), ('sheet', 'INTEGER'), ('row', 'INTEGER')],
+        indexes=[('zone',), ('office_name',)]),
+    Dataset(
+        'cbe_wards', ['coimbatore_wards.json'],
+        lambda raw: raw.get('data', {}).get('wards', []),
+        [('ward_number', 'TEXT'), ('ward_name', 'TEXT'), ('directions', 'JSON')],
+        indexes=[('ward_number',)]),
+    Dataset(
+        'pollachi_wards', ['pollachi_wards.json'],
+        lambda raw: raw.get('wards', []),
+        [('ward_number', 'INTEGER'), ('ward_name', 'TEXT')],
+        indexes=[('ward_number',)]),
+    # The refined CSV is the canonical BAI directory; the older
+    # bai_members_*.json / bai_coimbatore_members.* scrapes are superseded
+    Dataset(
+        'bai_directory', ['bai_coimbatore_refined.csv'],
+        lambda raw: raw,
+        [('company_name', 'TEXT'), ('contact_person', 'TEXT'), ('address', 'TEXT'), ('phone', 'TEXT'),
+         ('email', 'TEXT'), ('page_number', 'INTEGER'), ('source_url', 'TEXT'), ('scraped_at', 'TEXT')],
+        indexes=[('company_name',)],
+        reader=_read_csv),
+]
+
+
+class Warehouse:
+    """Typed, indexed SQLite copies of the JSON/CSV datasets.
+
+    ``sync`` (re)loads a dataset when its source file's mtime/size or the
+    dataset's schema version changed. Reads sync their dataset first, so a
+    re-scraped file shows up on its own.
+    Each load replaces the table inside one transaction, so readers see
+    either the old or the new data.
+    """
+
+    def __init__(self, db_path='warehouse.db', data_dir='.', datasets=None):
+        self.db_path = db_path
+        self.data_dir = data_dir
+        self.datasets = {dataset.name: dataset for dataset in (datasets or DATASETS)}
+        # name -> (version, signature) known to be loaded
+        self._loaded = {}
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        try:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version != SCHEMA_VERSION:
+                # Bookkeeping changed shape: forget it, every dataset reloads
+                conn.execute('DROP TABLE IF EXISTS warehouse_datasets')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS warehouse_datasets (
+                    name TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    source TEXT,
+                    signature TEXT,
+                    row_count INTEGER,
+                    loaded_at REAL
+                )
+            ''')
+            conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _source(self, dataset):
+        """(path, signature) of the first existing source file, or (None, None)"""
+        for source in dataset.sources:
+            path = os.path.join(self.data_dir, source)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            return path, f"{source}:{st.st_mtime_ns}:{st.st_size}"
+        return None, None
+
+    def _load(self, conn, dataset, path, signature):
+        records = dataset.extract(dataset.reader(path))
+        names = [name for name, _ in dataset.columns]
+        rows = []
+        for position, record in enumerate(records):
+            extra = {k: v for k, v in record.items() if k not in names}
+            values, original, missing = [], {}, []
+            for name, sqltype in dataset.columns:
+                if name not in record:
+                    missing.append(name)
+                value = _typed(record.get(name), sqltype)
+                raw = record.get(name)
+                if sqltype != 'JSON' and not (type(value) is type(raw) and value == raw):
+                    original[name] = raw
+                values.append(value)
+            if original:
+                extra['_original'] = original
+            if missing:
+                extra['_missing'] = missing
+            rows.append([position] + values + [json.dumps(extra, ensure_ascii=False) if extra else None])
+
+        column_defs = ', '.join(f'"{name}" {"TEXT" if sqltype == "JSON" else sqltype}'
+                                for name, sqltype in dataset.columns)
+        conn.execute(f'DROP TABLE IF EXISTS {dataset.table}')
+        conn.execute(f'CREATE TABLE {dataset.table} (_pos INTEGER PRIMARY KEY, {column_defs}, extra TEXT)')
+        placeholders = ', '.join('?' * (len(names) + 2))
+        conn.executemany(f'INSERT INTO {dataset.table} VALUES ({placeholders})', rows)
+        for columns in dataset.indexes:
+            quoted = ', '.join(f'"{c}"' for c in columns)
+            conn.execute(f'CREATE INDEX {dataset.table}_{"_".join(columns)} ON {dataset.table} ({quoted})')
+        conn.execute('''
+            INSERT OR REPLACE INTO warehouse_datasets (name, version, source, signature, row_count, loaded_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (dataset.name, dataset.version, path, signature, len(rows), time.time()))
+        print(f"Warehouse: loaded {len(rows)} rows into {dataset.table} from {path}")
+        return len(rows)
+
+    def sync(self, force=False, names=None):
+        """Load every dataset whose source or schema changed; returns the names loaded.
+
+        Unchanged datasets cost one stat() of their source file.
+        """
+        loaded = []
+        for name in names or list(self.datasets):
+            dataset = self.datasets[name]
+            path, signature = self._source(dataset)
+            if path is None:
+                # Keep whatever was loaded before the file went away
+                continue
+            if not force and self._loaded.get(name) == (dataset.version, signature):
+                continue
+            with self._lock:
+                conn = self._connect()
+                try:
+                    conn.execute('BEGIN IMMEDIATE')
+                    # Re-check under the write lock: another thread or process may have loaded it
+                    current = conn.execute('SELECT version, signature FROM warehouse_datasets WHERE name = ?',
+                                           (name,)).fetchone()
+                    if force or current is None or tuple(current) != (dataset.version, signature):
+                        self._load(conn, dataset, path, signature)
+                        loaded.append(name)
+                    conn.commit()
+                    self._loaded[name] = (dataset.version, signature)
+                except Exception as e:
+                    conn.rollback()
+                    print(f"Warehouse: error loading {name}: {str(e)}")
+                finally:
+                    conn.close()
+        return loaded
+
+    # Reads
+
+    def _decode(self, dataset, row):
+        record = dict(row)
+        record.pop('_pos', None)
+        extra = json.loads(record.pop('extra') or '{}')
+        for name, sqltype in dataset.columns:
+            if sqltype == 'JSON' and record[name] is not None:
+                record[name] = json.loads(record[name])
+        record.update(extra.pop('_original', {}))
+        for name in extra.pop('_missing', ()):
+            del record[name]
+        record.update(extra)
+        return record
+
+    def _query(self, sql, params):
+        conn = self._connect()
+        try:
+            return conn.execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            # Table not loaded yet (source file missing)
+            if 'no such table' in str(e):
+                return []
+            raise
+        finally:
+            conn.close()
+
+    def rows(self, name, where=None, params=(), order_by='_pos', limit=None, offset=0):
+        """Records of a dataset as dicts, in source order unless ``order_by`` is given"""
+        self.sync(names=[name])
+        dataset = self.datasets[name]
+        sql = f'SELECT * FROM {dataset.table}'
+        if where:
+            sql += f' WHERE {where}'
+        sql += f' ORDER BY {order_by}'
+        if limit is not None:
+            sql += f' LIMIT {int(limit)} OFFSET {int(offset)}'
+        return [self._decode(dataset, row) for row in self._query(sql, params)]
+
+    def count(self, name, where=None, params=()):
+        self.sync(names=[name])
+        sql = f'SELECT COUNT(*) FROM {self.datasets[name].table}'
+        if where:
+            sql += f' WHERE {where}'
+        rows = self._query(sql, params)
+        return rows[0][0] if rows else 0
+
+    def distinct(self, name, column, where=None, params=()):
+        """Sorted non-empty values of one column"""
+        self.sync(names=[name])
+        condition = f'"{column}" IS NOT NULL AND "{column}" != \'\''
+        if where:
+            condition += f' AND ({where})'
+        sql = f'SELECT DISTINCT "{column}" FROM {self.datasets[name].table} WHERE {condition} ORDER BY 1'
+        return [row[0] for row in self._query(sql, params)]
+
+    def signature(self, name):
+        """Changes whenever the loaded data of a dataset changes"""
+        self.sync(names=[name])
+        dataset = self.datasets[name]
+        return f"v{dataset.version}|{self._source(dataset)[1]}"
+
+    def status(self):
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute('SELECT * FROM warehouse_datasets ORDER BY name')]
+        finally:
+            conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load the JSON/CSV datasets into the SQLite warehouse')
+    parser.add_argument('datasets', nargs='*', help='Datasets to load (default: all)')
+    parser.add_argument('--db', default=os.environ.get('WAREHOUSE_DB', 'warehouse.db'))
+    parser.add_argument('--data-dir', default='.')
+    parser.add_argument('--force', action='store_true', help='Reload even if the sources did not change')
+    args = parser.parse_args()
+
+    warehouse = Warehouse(args.db, data_dir=args.data_dir)
+    unknown = [name for name in args.datasets if name not in warehouse.datasets]
+    if unknown:
+        parser.error(f"Unknown datasets: {', '.join(unknown)} (known: {', '.join(warehouse.datasets)})")
+    warehouse.sync(force=args.force, names=args.datasets or None)
+    for entry in warehouse.status():
+        print(f"{entry['name']:<18} v{entry['version']}  {entry['row_count']:>6} rows  {entry['source']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+
+
+class DriverPoolTimeout(TimeoutError):
+    """Raised when no driver frees up within the pool's wait timeout"""
+
+
+class DriverLease:
+    """A checked-out driver; ``pages`` counts the page loads made with it"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.time()
+        self.broken = False
+
+
+class WebDriverPool:
+    """Bounded, process-wide pool of warm headless browsers.
+
+    Drivers are started lazily up to ``size``; when all are busy a
+    checkout waits up to ``wait_timeout`` seconds. A driver is health
+    checked before reuse and recycled after ``max_pages`` page loads or
+    ``max_age`` seconds, so a leaking browser never lives for long.
+    """
+
+    def __init__(self, driver_factory, size=2, max_pages=50, max_age=30 * 60, wait_timeout=120):
+        self.driver_factory = driver_factory
+        self.size = size
+        self.max_pages = max_pages
+        self.max_age = max_age
+        self.wait_timeout = wait_timeout
+        # Idle leases, most recently used last; guarded by _available with _created
+        self._idle = []
+        self._created = 0
+        self._available = threading.Condition()
+        self.started = 0
+        self.recycled = 0
+        self.checkouts = 0
+        atexit.register(self.close_all)
+
+    def _healthy(self, lease):
+        if time.time() - lease.created_at > self.max_age:
+            return False
+        try:
+            lease.driver.execute_script('return 1')
+            return True
+        except Exception:
+            return False
+
+    def _start(self):
+        lease = DriverLease(self.driver_factory())
+        self.started += 1
+        return lease
+
+    def _quit(self, lease):
+        try:
+            lease.driver.quit()
+        except Exception:
+            pass
+        with self._available:
+            self._created -= 1
+            # A waiter may start a new driver in the freed slot
+            self._available.notify()
+
+    def _acquire(self):
+        deadline = time.time() + self.wait_timeout
+        while True:
+            with self._available:
+                while not self._idle and self._created >= self.size:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise DriverPoolTimeout(f'All {self.size} browsers are busy')
+                    self._available.wait(remaining)
+                if self._idle:
+                    lease = self._idle.pop()
+                else:
+                    lease = None
+                    self._created += 1
+
+            if lease is None:
+                try:
+                    return self._start()
+                except Exception:
+                    with self._available:
+                        self._created -= 1
+                        self._available.notify()
+                    raise
+
+            if self._healthy(lease):
+                return lease
+            # Dead or expired: quit it and try again (a slot is now free)
+            self.recycled += 1
+            self._quit(lease)
+
+    def checkin(self, lease):
+        """Return a driver to the pool, or quit it if it is worn out or broken"""
+        if lease.broken or lease.pages >= self.max_pages:
+            self.recycled += 1
+            self._quit(lease)
+        else:
+            with self._available:
+                self._idle.append(lease)
+                self._available.notify()
+
+    @contextmanager
+    def checkout(self):
+        """Borrow a driver for the duration of a ``with`` block"""
+        lease = self._acquire()
+        self.checkouts += 1
+        try:
+            yield lease
+        except Exception:
+            lease.broken = not self._healthy(lease)
+            raise
+        finally:
+            self.checkin(lease)
+
+    def close_all(self):
+        """Quit every idle driver (busy ones are quit on checkin)"""
+        with self._available:
+            idle, self._idle = self._idle, []
+        for lease in idle:
+            self._quit(lease)
+
+    def stats(self):
+        with self._available:
+            return {
+                'size': self.size,
+                'running': self._created,
+                'idle': len(self._idle),
+                'started': self.started,
+                'recycled': self.recycled,
+                'checkouts': self.checkouts
+            }